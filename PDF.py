@@ -1,4 +1,5 @@
 import sys
+import logging
 from PyQt6.QtWidgets import (
     QApplication,
     QMainWindow,
@@ -15,11 +16,17 @@ from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QPixmap
 from component.toolsForPDF import apply_stylesheet, cleanup_temp_folder
 from component.file_picker import get_files
+from component.render_pool import get_render_pool
+from component.temp_reaper import get_reaper
+from component.tracing import span
 from modules.MergePDF import MergePreviewWindow
 from modules.DeletePages import DeletePagesWindow
 from modules.SplitPDF import SplitPDFWindow
+from modules.CompressPDF import CompressPDFWindow
 from assets.config import *
 
+logger = logging.getLogger(__name__)
+
 
 class ToolCard(QFrame):
     def __init__(self, name, description, icon_path, tool_type, main_window):
@@ -73,6 +80,7 @@ class ToolCard(QFrame):
             "merge": self.main_window.launch_merge_tool,
             "delete": self.main_window.launch_delete_tool,
             "split": self.main_window.launch_split_tool,
+            "compress": self.main_window.launch_compress_tool,
         }
         if self.tool_type in tool_map:
             tool_map[self.tool_type]()
@@ -135,8 +143,8 @@ class DashboardWidget(QWidget):
             (
                 "Compress PDF",
                 "Reduce the file size of your PDF without losing quality.",
-                "悼",
-                None,
+                r"assets\ico\filesize.png",
+                "compress",
             ),
         ]
         for name, desc, icon, tool_type in tools:
@@ -179,7 +187,9 @@ class MainWindow(QMainWindow):
         cleanup_temp_folder(MERGE_TEMP_FOLDER)
         cleanup_temp_folder(DELETE_TEMP_FOLDER)
         cleanup_temp_folder(SPLIT_TEMP_FOLDER)
+        cleanup_temp_folder(COMPRESS_TEMP_FOLDER)
         cleanup_temp_folder(FILE_PICKER_DEFAULT_FOLDER)
+        get_reaper().sweep()
 
         self.stack = QStackedWidget()
         self.setCentralWidget(self.stack)
@@ -195,6 +205,9 @@ class MainWindow(QMainWindow):
     def launch_split_tool(self) -> None:
         self._launch_tool_generic("split", MAX_SPLIT_FILES, SPLIT_TEMP_FOLDER)
 
+    def launch_compress_tool(self) -> None:
+        self._launch_tool_generic("compress", MAX_COMPRESS_FILES, COMPRESS_TEMP_FOLDER)
+
     def _launch_tool_generic(
         self, tool_type: str, max_files: int, temp_folder: str
     ) -> None:
@@ -206,17 +219,19 @@ class MainWindow(QMainWindow):
         QApplication.processEvents()
         tool_map = {
             "merge": lambda: MergePreviewWindow(files, temp_folder, max_files),
-            "delete": lambda: DeletePagesWindow(files[0], temp_folder),
+            "delete": lambda: DeletePagesWindow(files, temp_folder),
             "split": lambda: SplitPDFWindow(files[0], temp_folder),
+            "compress": lambda: CompressPDFWindow(files[0], temp_folder),
         }
         try:
             if tool_type in tool_map:
-                tool = tool_map[tool_type]()
+                with span("ingest.open_tool", tool=tool_type, files=len(files)):
+                    tool = tool_map[tool_type]()
                 tool.back_to_dashboard.connect(self.return_to_dashboard)
                 self.stack.addWidget(tool)
                 self.stack.setCurrentWidget(tool)
         except Exception as e:
-            print(f"Error launching tool {tool_type}: {e}")
+            logger.error(f"Error launching tool {tool_type}: {e}")
             cleanup_temp_folder(temp_folder)
         finally:
             QApplication.restoreOverrideCursor()
@@ -229,14 +244,25 @@ class MainWindow(QMainWindow):
             current_widget.deleteLater()
 
     def closeEvent(self, event):
+        get_render_pool().shutdown()
         cleanup_temp_folder(MERGE_TEMP_FOLDER)
         cleanup_temp_folder(DELETE_TEMP_FOLDER)
         cleanup_temp_folder(SPLIT_TEMP_FOLDER)
+        cleanup_temp_folder(COMPRESS_TEMP_FOLDER)
         cleanup_temp_folder(FILE_PICKER_DEFAULT_FOLDER)
+        get_reaper().wait(CLEANUP_SHUTDOWN_WAIT_SEC)
         super().closeEvent(event)
 
 
 def main():
+    if "--watch" in sys.argv[1:]:
+        from component.hot_folder import main as watch_main
+
+        sys.exit(watch_main(sys.argv[1:]))
+    if "--serve" in sys.argv[1:]:
+        from component.job_service import main as serve_main
+
+        sys.exit(serve_main(sys.argv[1:]))
     app = QApplication.instance()
     if not app:
         app = QApplication(sys.argv)
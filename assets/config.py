@@ -1,12 +1,15 @@
 MAX_MERGE_FILES = 20
-MAX_DELETE_FILES = 1
+MAX_DELETE_FILES = 50
 MAX_SPLIT_FILES = 1
+MAX_COMPRESS_FILES = 1
 MERGE_TEMP_FOLDER = "merge_temp_files"
 DELETE_TEMP_FOLDER = "page_editor_temp"
 SPLIT_TEMP_FOLDER = "split_temp"
+COMPRESS_TEMP_FOLDER = "compress_temp"
 FILE_PICKER_DEFAULT_FOLDER = "temp_uploads"
 MERGED_OUTPUT_NAME = "merged_result.pdf"
 EDITED_OUTPUT_PREFIX = "edited_"
+COMPRESSED_OUTPUT_PREFIX = "compressed_"
 MAIN_WINDOW_TITLE = "PDF Master Suite"
 MAIN_WINDOW_START_WIDTH = 1200
 MAIN_WINDOW_START_HEIGHT = 800
@@ -15,6 +18,7 @@ MAIN_WINDOW_MIN_HEIGHT = 700
 STYLESHEET = "assets/styles.qss"
 MERGE_HEADER_TITLE = "Merge PDF Documents"
 SPLIT_HEADER_TITLE = "Split PDF"
+COMPRESS_HEADER_TITLE = "Compress PDF"
 TOOL_CARD_WIDTH = 350
 TOOL_CARD_HEIGHT = 250
 SIDEBAR_WIDTH = 400
@@ -45,10 +49,85 @@ SPLIT_SIZE_MAX_MB = 1024
 SPLIT_SIZE_SAFETY_MARGIN = 0.95
 MAX_SPLIT_OUTPUT_FILES = 500
 
+COMPRESS_DEFAULT_DPI = 150
+COMPRESS_MIN_DPI = 36
+COMPRESS_MAX_DPI = 600
+COMPRESS_DEFAULT_QUALITY = 75
+COMPRESS_MIN_IMAGE_BYTES = 10 * 1024
+
 INPUT_VALIDATION_DELAY_MS = 1000
+PREVIEW_DEBOUNCE_MS = 150
+
+OUTPUT_PROFILES = {"fast": "Fast", "compact": "Compact"}
+OUTPUT_PROFILE_DEFAULT = "fast"
+DELETE_INCREMENTAL_SAVE_DEFAULT = False
+OUTPUT_WRITE_BUFFER_BYTES = 1024 * 1024
+OUTPUT_SPACE_MARGIN = 1.2
+OUTPUT_SPACE_RESERVE_BYTES = 16 * 1024 * 1024
+OUTPUT_TEMP_SUFFIX = ".part"
+MERGE_HASH_CHUNK_BYTES = 1024 * 1024
+LINEARIZE_DEFAULT = False
+LINEARIZATION_HEADER_BYTES = 4096
+JOB_JOURNAL_SUFFIX = ".journal"
+RESUMED_STRATEGY = "resumed"
+SPLIT_RESUME_HINT = "Finished parts were kept; run the same split again to resume."
+
+WATCH_DEFAULT_WORKERS = 2
+WATCH_SETTLE_SEC = 2.0
+WATCH_READY_MAX_CHECKS = 30
+WATCH_POLL_INTERVAL_SEC = 1.0
+WATCH_RESCAN_SEC = 30.0
+WATCH_BATCH_QUIET_SEC = 10.0
+WATCH_OUTPUT_FOLDER = "output"
+WATCH_ERROR_FOLDER = "failed"
+WATCH_ARCHIVE_FOLDER = "processed"
+WATCH_SOURCE = "watch"
+
+SERVICE_DEFAULT_HOST = "127.0.0.1"
+SERVICE_DEFAULT_PORT = 8765
+SERVICE_DEFAULT_WORKERS = 2
+SERVICE_WORK_FOLDER = "pdf_tools_service"
+SERVICE_MAX_UPLOAD_BYTES = 512 * 1024 * 1024
+SERVICE_MAX_FILES_PER_JOB = 50
+SERVICE_MAX_PAGES_PER_JOB = 20000
+SERVICE_MAX_PENDING_JOBS = 64
+SERVICE_JOB_RETENTION_SEC = 3600
+SERVICE_STREAM_CHUNK_BYTES = 1024 * 1024
+SERVICE_SOURCE = "service"
+
+QUEUE_ENV_VAR = "PDF_TOOLS_QUEUE_DB"
+QUEUE_DEFAULT_FOLDER = ".pdf_tools"
+QUEUE_DEFAULT_FILE = "jobs.sqlite3"
+QUEUE_BUSY_TIMEOUT_SEC = 10.0
+QUEUE_CPU_SLOTS = 2
+QUEUE_IO_SLOTS = 2
+QUEUE_LEASE_SEC = 30.0
+QUEUE_MAX_ATTEMPTS = 3
+QUEUE_POLL_SEC = 0.2
+QUEUE_LIST_LIMIT = 200
+QUEUE_PRIORITY_BACKGROUND = -10
+QUEUE_PRIORITY_NORMAL = 0
+QUEUE_PRIORITY_INTERACTIVE = 100
+GUI_SOURCE = "gui"
+
+ANALYSIS_RENDER_DPI = 50
+ANALYSIS_MIN_RENDER_PX = 64
+ANALYSIS_MARGIN_RATIO = 0.05
+ANALYSIS_INK_CONTRAST = 48
+ANALYSIS_BLANK_INK_RATIO = 0.001
+ANALYSIS_HASH_SIZE = 32
+ANALYSIS_HASH_LOW_FREQ = 16
+ANALYSIS_DUPLICATE_DISTANCE = 16
+ANALYSIS_DUPLICATE_INK_DELTA = 0.25
+ANALYSIS_CHUNK_PAGES = 16
+ANALYSIS_COMPARE_BLOCK = 64
+ANALYSIS_CACHE_FOLDER = "page_analysis"
+ANALYSIS_CACHE_VERSION = 1
 
 CLEANUP_RETRY_ATTEMPTS = 3
 CLEANUP_RETRY_DELAY_SEC = 0.3
+CLEANUP_TRASH_MARKER = ".reaping-"
+CLEANUP_SHUTDOWN_WAIT_SEC = 2.0
 
 FILENAME_TRUNCATE_LIMIT = 20
 
@@ -56,6 +135,30 @@ GRID_MIN_COLUMNS = 1
 GRID_CARD_SPACING = 20
 GRID_CONTAINER_PADDING = 40
 GRID_MIN_FALLBACK_WIDTH = 1000
+GRID_VIRTUAL_OVERSCAN_PX = 440
+GRID_GROUP_HEADER_HEIGHT = 36
 
 THUMBNAIL_DEFAULT_WIDTH = 150
 THUMBNAIL_DEFAULT_HEIGHT = 145
+
+TRACE_ENV_VAR = "PDF_TOOLS_TRACE"
+TRACE_DEFAULT_FILE = "pdf_tools_trace.json"
+PROFILE_ENV_VAR = "PDF_TOOLS_PROFILE"
+PROFILE_DEFAULT_FOLDER = "profiles"
+PROFILE_CATEGORIES = ("save", "split", "merge", "compress", "analyze", "job")
+
+MEMORY_ENV_VAR = "PDF_TOOLS_MEMORY"
+MEMORY_SAMPLE_INTERVAL_SEC = 0.05
+MEMORY_TOP_SITES = 5
+THUMBNAIL_CACHE_SIZE = 512
+DOCUMENT_CACHE_SIZE = 16
+THUMBNAIL_ROTATE_MAX_UPSCALE = 1.15
+THUMBNAIL_DRAFT_SCALE = 0.5
+THUMBNAIL_REFINE_IDLE_MS = 120
+THUMBNAIL_RENDER_WORKERS = 2
+WORKER_START_METHOD = "spawn"
+THUMBNAIL_PREFETCH_IN_FLIGHT = 4
+THUMBNAIL_PREFETCH_QUEUE_SIZE = 60
+THUMBNAIL_PREFETCH_SCREENS = 3
+THUMBNAIL_PREFETCH_LOOKAHEAD_SEC = 1.0
+THUMBNAIL_SCROLL_VELOCITY_SMOOTHING = 0.4
@@ -0,0 +1,170 @@
+import os
+import zlib
+import random
+from typing import Dict, List
+import fitz
+from pypdf import PdfWriter
+from pypdf.generic import (
+    DecodedStreamObject,
+    DictionaryObject,
+    NameObject,
+    NumberObject,
+    StreamObject,
+)
+
+CORPUS_SCALES = {
+    "small": {
+        "text_pages": 50,
+        "image_pages": 6,
+        "image_size": 800,
+        "huge_pages": 1000,
+        "small_files": 40,
+        "shared_pages": 20,
+    },
+    "full": {
+        "text_pages": 500,
+        "image_pages": 40,
+        "image_size": 2400,
+        "huge_pages": 10000,
+        "small_files": 300,
+        "shared_pages": 200,
+    },
+}
+
+ENCRYPTED_PASSWORD = "benchmark"
+
+
+def _text_page(doc: fitz.Document, number: int, rng: random.Random) -> fitz.Page:
+    page = doc.new_page()
+    page.insert_text((72, 72), f"Synthetic page {number}", fontsize=24)
+    words = [
+        "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(6))
+        for _ in range(300)
+    ]
+    page.insert_textbox(fitz.Rect(72, 110, 540, 760), " ".join(words), fontsize=10)
+    return page
+
+
+def make_text_pdf(path: str, pages: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    doc = fitz.open()
+    for i in range(pages):
+        _text_page(doc, i + 1, rng)
+    doc.save(path, garbage=3, deflate=True)
+    doc.close()
+    return path
+
+
+def make_image_pdf(path: str, pages: int, image_size: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    doc = fitz.open()
+    for i in range(pages):
+        page = doc.new_page()
+        samples = rng.randbytes(image_size * image_size)
+        pix = fitz.Pixmap(fitz.csGRAY, image_size, image_size, samples, False)
+        page.insert_image(fitz.Rect(36, 36, 576, 756), pixmap=pix)
+        page.insert_text((72, 780), f"Scan {i + 1}", fontsize=10)
+    doc.save(path, deflate=True)
+    doc.close()
+    return path
+
+
+def make_shared_resource_pdf(
+    path: str, pages: int, image_size: int, seed: int = 0
+) -> str:
+    rng = random.Random(seed)
+    writer = PdfWriter()
+    xobjects = DictionaryObject()
+    for i in range(pages):
+        image = StreamObject()
+        image._data = zlib.compress(rng.randbytes(image_size * image_size))
+        image.update(
+            {
+                NameObject("/Type"): NameObject("/XObject"),
+                NameObject("/Subtype"): NameObject("/Image"),
+                NameObject("/Width"): NumberObject(image_size),
+                NameObject("/Height"): NumberObject(image_size),
+                NameObject("/ColorSpace"): NameObject("/DeviceGray"),
+                NameObject("/BitsPerComponent"): NumberObject(8),
+                NameObject("/Filter"): NameObject("/FlateDecode"),
+            }
+        )
+        xobjects[NameObject(f"/Im{i}")] = writer._add_object(image)
+    resources = writer._add_object(DictionaryObject({NameObject("/XObject"): xobjects}))
+    for i in range(pages):
+        page = writer.add_blank_page(612, 792)
+        content = DecodedStreamObject()
+        content.set_data(f"q 500 0 0 500 56 146 cm /Im{i} Do Q".encode())
+        page[NameObject("/Contents")] = writer._add_object(content)
+        page[NameObject("/Resources")] = resources
+    with open(path, "wb") as f:
+        writer.write(f)
+    return path
+
+
+def make_many_small_pdfs(folder: str, count: int, seed: int = 0) -> List[str]:
+    os.makedirs(folder, exist_ok=True)
+    return [
+        make_text_pdf(os.path.join(folder, f"small_{i:04d}.pdf"), 1, seed + i)
+        for i in range(count)
+    ]
+
+
+def make_encrypted_pdf(path: str, pages: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    doc = fitz.open()
+    for i in range(pages):
+        _text_page(doc, i + 1, rng)
+    doc.save(
+        path,
+        encryption=fitz.PDF_ENCRYPT_RC4_128,
+        user_pw=ENCRYPTED_PASSWORD,
+        owner_pw=ENCRYPTED_PASSWORD,
+    )
+    doc.close()
+    return path
+
+
+def build_corpus(folder: str, scale: str = "small", seed: int = 0) -> Dict:
+    sizes = CORPUS_SCALES[scale]
+    folder = os.path.join(folder, scale)
+    os.makedirs(folder, exist_ok=True)
+
+    def cached(name, factory):
+        path = os.path.join(folder, name)
+        if not os.path.exists(path):
+            factory(path)
+        return path
+
+    small_folder = os.path.join(folder, "many_small")
+    small_files = sorted(
+        os.path.join(small_folder, f)
+        for f in (os.listdir(small_folder) if os.path.isdir(small_folder) else [])
+    )
+    if len(small_files) != sizes["small_files"]:
+        small_files = make_many_small_pdfs(small_folder, sizes["small_files"], seed)
+    return {
+        "text_only": cached(
+            "text_only.pdf", lambda p: make_text_pdf(p, sizes["text_pages"], seed)
+        ),
+        "image_heavy": cached(
+            "image_heavy.pdf",
+            lambda p: make_image_pdf(
+                p, sizes["image_pages"], sizes["image_size"], seed
+            ),
+        ),
+        "huge_page_count": cached(
+            "huge_page_count.pdf",
+            lambda p: make_text_pdf(p, sizes["huge_pages"], seed),
+        ),
+        "shared_resources": cached(
+            "shared_resources.pdf",
+            lambda p: make_shared_resource_pdf(
+                p, sizes["shared_pages"], sizes["image_size"] // 4, seed
+            ),
+        ),
+        "encrypted": cached(
+            "encrypted.pdf", lambda p: make_encrypted_pdf(p, sizes["text_pages"], seed)
+        ),
+        "many_small": small_files,
+    }
@@ -0,0 +1,207 @@
+import argparse
+import itertools
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from benchmarks.corpus import CORPUS_SCALES, build_corpus
+from benchmarks.run_benchmarks import percentile
+from component.job_queue import JobQueue
+from component.job_service import JobServer, JobService
+
+
+def multipart_body(fields: Dict[str, str], files: List[str]) -> Tuple[bytes, str]:
+    boundary = uuid.uuid4().hex
+    parts = []
+    for name, value in fields.items():
+        parts.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n'
+            f"{value}\r\n".encode("utf-8")
+        )
+    for path in files:
+        with open(path, "rb") as f:
+            data = f.read()
+        parts.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="file"; '
+            f'filename="{os.path.basename(path)}"\r\n'
+            "Content-Type: application/pdf\r\n\r\n".encode("utf-8") + data + b"\r\n"
+        )
+    parts.append(f"--{boundary}--\r\n".encode("utf-8"))
+    return b"".join(parts), f"multipart/form-data; boundary={boundary}"
+
+
+def _request(url: str, data: Optional[bytes] = None, headers: Dict = None):
+    request = urllib.request.Request(url, data=data, headers=headers or {})
+    with urllib.request.urlopen(request) as response:
+        return response.status, response.read()
+
+
+def job_mix(corpus: Dict, operation: str) -> List[Tuple[str, Dict, List[str]]]:
+    jobs = {
+        "split_pages": ("split_pages", {"pages_per_file": 5}, [corpus["text_only"]]),
+        "merge": ("merge", {}, corpus["many_small"][:5]),
+        "delete_pages": ("delete_pages", {"pages": "1-3"}, [corpus["text_only"]]),
+        "compress": ("compress", {"max_workers": 1}, [corpus["image_heavy"]]),
+    }
+    if operation == "mixed":
+        return list(jobs.values())
+    return [jobs[operation]]
+
+
+def run_client_job(base_url: str, spec: Tuple[str, Dict, List[str]]) -> Dict:
+    operation, options, files = spec
+    body, content_type = multipart_body(
+        {"operation": operation, "options": json.dumps(options)}, files
+    )
+    started = time.perf_counter()
+    rejected = 0
+    while True:
+        try:
+            _, raw = _request(f"{base_url}/jobs", body, {"Content-Type": content_type})
+            break
+        except urllib.error.HTTPError as e:
+            if e.code != 503:
+                return {"operation": operation, "ok": False, "error": e.read().decode()}
+            rejected += 1
+            time.sleep(0.05 * min(rejected, 20))
+    submitted = time.perf_counter()
+    job = json.loads(raw)
+    while job["status"] in ("queued", "running"):
+        time.sleep(0.02)
+        _, raw = _request(f"{base_url}/jobs/{job['id']}")
+        job = json.loads(raw)
+    result = {
+        "operation": operation,
+        "ok": job["status"] == "done",
+        "rejected": rejected,
+        "submit_sec": submitted - started,
+        "queued_sec": job.get("queued_sec"),
+        "run_sec": job.get("run_sec"),
+        "bytes_out": 0,
+    }
+    if result["ok"]:
+        _, data = _request(f"{base_url}/jobs/{job['id']}/result")
+        result["bytes_out"] = len(data)
+    else:
+        result["error"] = job.get("error")
+    result["total_sec"] = time.perf_counter() - started
+    urllib.request.urlopen(
+        urllib.request.Request(f"{base_url}/jobs/{job['id']}", method="DELETE")
+    ).close()
+    return result
+
+
+def summarize(results: List[Dict], wall_sec: float) -> Dict:
+    ok = [r for r in results if r["ok"]]
+    totals = [r["total_sec"] for r in ok]
+    summary = {
+        "jobs": len(results),
+        "failed": len(results) - len(ok),
+        "rejected_submits": sum(r.get("rejected", 0) for r in results),
+        "wall_sec": wall_sec,
+        "jobs_per_sec": len(ok) / wall_sec if wall_sec else 0.0,
+        "mb_out_per_sec": sum(r["bytes_out"] for r in ok) / (1024 * 1024) / wall_sec,
+    }
+    if totals:
+        summary["latency_ms"] = {
+            "mean": statistics.mean(totals) * 1000,
+            "p50": percentile(totals, 50) * 1000,
+            "p90": percentile(totals, 90) * 1000,
+            "p99": percentile(totals, 99) * 1000,
+        }
+        summary["queued_ms_p50"] = percentile([r["queued_sec"] for r in ok], 50) * 1000
+        summary["run_ms_p50"] = percentile([r["run_sec"] for r in ok], 50) * 1000
+    return summary
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="PDF Master Suite service load test")
+    parser.add_argument("--url", help="Target a running service instead")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--clients", type=int, default=4)
+    parser.add_argument("--jobs", type=int, default=20)
+    parser.add_argument(
+        "--operation",
+        choices=["mixed", "split_pages", "merge", "delete_pages", "compress"],
+        default="mixed",
+    )
+    parser.add_argument("--scale", choices=sorted(CORPUS_SCALES), default="small")
+    parser.add_argument(
+        "--corpus-dir",
+        default=os.path.join(tempfile.gettempdir(), "pdf_tools_bench_corpus"),
+    )
+    parser.add_argument("--output", default="load_results.json")
+    args = parser.parse_args(argv)
+
+    logging.getLogger().setLevel(logging.WARNING)
+    corpus = build_corpus(args.corpus_dir, args.scale)
+    server = service = None
+    base_url = args.url
+    if not base_url:
+        work_dir = tempfile.mkdtemp(prefix="pdf_tools_service_")
+        service = JobService(
+            work_dir,
+            args.workers,
+            queue=JobQueue(os.path.join(work_dir, "jobs.sqlite3")),
+        )
+        server = JobServer(("127.0.0.1", 0), service)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = f"http://127.0.0.1:{server.server_port}"
+
+    specs = list(
+        itertools.islice(itertools.cycle(job_mix(corpus, args.operation)), args.jobs)
+    )
+    started = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=args.clients) as clients:
+            results = list(clients.map(lambda s: run_client_job(base_url, s), specs))
+    finally:
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+            service.shutdown()
+    wall_sec = time.perf_counter() - started
+
+    summary = summarize(results, wall_sec)
+    print(
+        f"{summary['jobs']} jobs ({summary['failed']} failed) in {wall_sec:.1f}s: "
+        f"{summary['jobs_per_sec']:.2f} jobs/s, "
+        f"{summary['mb_out_per_sec']:.1f} MB/s out"
+    )
+    if "latency_ms" in summary:
+        latency = summary["latency_ms"]
+        print(
+            f"latency p50 {latency['p50']:.0f} ms  p90 {latency['p90']:.0f} ms  "
+            f"p99 {latency['p99']:.0f} ms  (queued p50 "
+            f"{summary['queued_ms_p50']:.0f} ms, run p50 "
+            f"{summary['run_ms_p50']:.0f} ms)"
+        )
+    report = {
+        "clients": args.clients,
+        "workers": args.workers if not args.url else None,
+        "operation": args.operation,
+        "summary": summary,
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+    return 0 if not summary["failed"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
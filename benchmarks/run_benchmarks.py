@@ -0,0 +1,400 @@
+import argparse
+import json
+import logging
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import fitz
+import pypdf
+from PyQt6.QtWidgets import QApplication
+from benchmarks.corpus import CORPUS_SCALES, ENCRYPTED_PASSWORD, build_corpus
+from component.page_ranges import parse_page_intervals
+from component.memory_stats import MemoryTracker
+from component.pdf_compress import CompressionSettings, compress_pdf
+from component.pdf_output import linearization_available, read_linearization
+from component.pdf_operations import (
+    fixed_ranges,
+    merge_pdfs,
+    split_pdf_by_size,
+    split_pdf_ranges,
+)
+from component.toolsForPDF import (
+    apply_page_edits,
+    attempt_pdf_decryption,
+    get_pdf_page_count,
+    get_pdf_thumbnail,
+    is_valid_pdf,
+    prune_page_input,
+    validate_page_input,
+)
+
+
+class BenchmarkCase(NamedTuple):
+    operation: str
+    corpus: str
+    unit: str
+    run: Callable[[str], int]
+    bytes_in: int = 0
+    metrics: Optional[Callable[[str], Dict]] = None
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def _mb(num_bytes: Optional[int]) -> Optional[float]:
+    return None if num_bytes is None else num_bytes / (1024 * 1024)
+
+
+def _fresh_dir(path: str) -> str:
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path)
+    return path
+
+
+def run_case(case: BenchmarkCase, work_dir: str, repeat: int, warmup: int) -> Dict:
+    out_dir = os.path.join(work_dir, f"{case.operation}-{case.corpus}")
+    for _ in range(warmup):
+        case.run(_fresh_dir(out_dir))
+    latencies = []
+    units = 0
+    for _ in range(repeat):
+        target = _fresh_dir(out_dir)
+        started = time.perf_counter()
+        units = case.run(target)
+        latencies.append(time.perf_counter() - started)
+    target = _fresh_dir(out_dir)
+    with MemoryTracker(f"{case.operation}/{case.corpus}", trace_python=True) as mem:
+        case.run(target)
+    memory = mem.report
+    extra = case.metrics(target) if case.metrics else {}
+    bytes_out = sum(
+        os.path.getsize(os.path.join(root, name))
+        for root, _, names in os.walk(target)
+        for name in names
+    )
+    shutil.rmtree(out_dir, ignore_errors=True)
+    mean = statistics.mean(latencies)
+    return {
+        "operation": case.operation,
+        "corpus": case.corpus,
+        "repeat": repeat,
+        "units": units,
+        "latency_ms": {
+            "min": min(latencies) * 1000,
+            "mean": mean * 1000,
+            "p50": percentile(latencies, 50) * 1000,
+            "p90": percentile(latencies, 90) * 1000,
+            "p99": percentile(latencies, 99) * 1000,
+            "max": max(latencies) * 1000,
+        },
+        "throughput": {
+            "value": units / mean if mean else 0.0,
+            "unit": f"{case.unit}/s",
+        },
+        "bytes_in": case.bytes_in,
+        "bytes_out": bytes_out,
+        "output_ratio": bytes_out / case.bytes_in if case.bytes_in else None,
+        "mb_per_s": (case.bytes_in / (1024 * 1024)) / mean if mean else 0.0,
+        "peak_python_mb": _mb(memory.python_peak),
+        "peak_rss_mb": _mb(memory.rss_peak),
+        "rss_growth_mb": _mb(memory.rss_growth),
+        "top_allocation_sites": memory.top_sites,
+        **extra,
+    }
+
+
+def build_cases(corpus: Dict) -> List[BenchmarkCase]:
+    text = corpus["text_only"]
+    images = corpus["image_heavy"]
+    huge = corpus["huge_page_count"]
+    encrypted = corpus["encrypted"]
+    shared = corpus["shared_resources"]
+    shared_pages = get_pdf_page_count(shared)
+    small = corpus["many_small"]
+    text_pages = get_pdf_page_count(text)
+    huge_pages = get_pdf_page_count(huge)
+    image_pages = get_pdf_page_count(images)
+    all_files = [text, images, huge, encrypted, shared] + small
+    size = os.path.getsize
+
+    def split_size(path, parts):
+        def run(out_dir):
+            limit = size(path) / parts
+            split_pdf_by_size(path, limit, out_dir, "bench", max_output_files=None)
+            return get_pdf_page_count(path)
+
+        return run
+
+    def delete_save(incremental):
+        def run(out_dir):
+            src = huge
+            if incremental:
+                src = shutil.copy(huge, os.path.join(out_dir, "working.pdf"))
+            keep = [i for i in range(huge_pages) if i % 3]
+            apply_page_edits(
+                src,
+                keep,
+                {0: 90},
+                "edited.pdf",
+                incremental=incremental,
+                save_dir=out_dir,
+            )
+            return huge_pages
+
+        return run
+
+    def thumbnails(out_dir):
+        count = min(50, huge_pages)
+        for page in range(count):
+            get_pdf_thumbnail(huge, page)
+        return count
+
+    def first_page_bytes(out_dir):
+        path = os.path.join(out_dir, "m.pdf")
+        params = read_linearization(path)
+        if not params:
+            return {"first_page_bytes": None}
+        return {
+            "first_page_bytes": params["E"],
+            "first_page_ratio": params["E"] / size(path),
+        }
+
+    def page_input(out_dir):
+        text_input = f"1-{huge_pages // 2},{huge_pages // 2 + 2}-{huge_pages},0,x-"
+        validate_page_input(text_input, huge_pages)
+        prune_page_input(text_input, huge_pages)
+        parse_page_intervals(text_input, huge_pages)
+        return 1
+
+    cases = [
+        BenchmarkCase(
+            "merge",
+            "many_small",
+            "files",
+            lambda d: (
+                merge_pdfs([(p, 0) for p in small], os.path.join(d, "m.pdf")),
+                len(small),
+            )[1],
+            sum(size(p) for p in small),
+        ),
+        BenchmarkCase(
+            "merge",
+            "text_and_images",
+            "pages",
+            lambda d: (
+                merge_pdfs([(text, 0), (images, 90)], os.path.join(d, "m.pdf")),
+                text_pages + image_pages,
+            )[1],
+            size(text) + size(images),
+        ),
+        BenchmarkCase(
+            "merge_compact",
+            "text_and_images",
+            "pages",
+            lambda d: (
+                merge_pdfs(
+                    [(text, 0), (images, 0)], os.path.join(d, "m.pdf"), "compact"
+                ),
+                text_pages + image_pages,
+            )[1],
+            size(text) + size(images),
+        ),
+        BenchmarkCase(
+            "split_range",
+            "text_only",
+            "pages",
+            lambda d: (
+                split_pdf_ranges(text, fixed_ranges(text_pages, 10), d, "bench"),
+                text_pages,
+            )[1],
+            size(text),
+        ),
+        BenchmarkCase(
+            "split_pages",
+            "text_only",
+            "pages",
+            lambda d: (
+                split_pdf_ranges(text, fixed_ranges(text_pages, 1), d, "bench"),
+                text_pages,
+            )[1],
+            size(text),
+        ),
+        BenchmarkCase(
+            "split_pages",
+            "shared_resources",
+            "pages",
+            lambda d: (
+                split_pdf_ranges(shared, fixed_ranges(shared_pages, 1), d, "bench"),
+                shared_pages,
+            )[1],
+            size(shared),
+        ),
+        BenchmarkCase(
+            "split_size", "text_only", "pages", split_size(text, 5), size(text)
+        ),
+        BenchmarkCase(
+            "split_size", "image_heavy", "pages", split_size(images, 3), size(images)
+        ),
+        BenchmarkCase(
+            "delete_save", "huge_page_count", "pages", delete_save(False), size(huge)
+        ),
+        BenchmarkCase(
+            "delete_save_incremental",
+            "huge_page_count",
+            "pages",
+            delete_save(True),
+            size(huge),
+        ),
+        BenchmarkCase(
+            "validation",
+            "all",
+            "files",
+            lambda d: sum(1 for p in all_files if is_valid_pdf(p)),
+            sum(size(p) for p in all_files),
+        ),
+        BenchmarkCase(
+            "page_count",
+            "all",
+            "files",
+            lambda d: len([get_pdf_page_count(p) for p in all_files]),
+            sum(size(p) for p in all_files),
+        ),
+        BenchmarkCase(
+            "decrypt",
+            "encrypted",
+            "files",
+            lambda d: int(
+                attempt_pdf_decryption(encrypted, ENCRYPTED_PASSWORD, d) is not None
+            ),
+            size(encrypted),
+        ),
+        BenchmarkCase(
+            "compress",
+            "image_heavy",
+            "pages",
+            lambda d: (
+                compress_pdf(images, os.path.join(d, "c.pdf"), CompressionSettings()),
+                image_pages,
+            )[1],
+            size(images),
+        ),
+        BenchmarkCase("thumbnails", "huge_page_count", "pages", thumbnails),
+        BenchmarkCase("page_input", "huge_page_count", "ops", page_input),
+    ]
+    if linearization_available():
+        cases.append(
+            BenchmarkCase(
+                "merge_linearized",
+                "text_and_images",
+                "pages",
+                lambda d: (
+                    merge_pdfs(
+                        [(text, 0), (images, 0)],
+                        os.path.join(d, "m.pdf"),
+                        linearize=True,
+                    ),
+                    text_pages + image_pages,
+                )[1],
+                size(text) + size(images),
+                first_page_bytes,
+            )
+        )
+    return cases
+
+
+def environment_info(scale: str, repeat: int) -> Dict:
+    info = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "pypdf": pypdf.__version__,
+        "pymupdf": fitz.VersionBind,
+        "scale": scale,
+        "repeat": repeat,
+    }
+    try:
+        import resource
+
+        rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+        info["peak_rss_mb"] = rss_kb / divisor
+    except ImportError:
+        pass
+    return info
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="PDF Master Suite benchmarks")
+    parser.add_argument("--scale", choices=sorted(CORPUS_SCALES), default="small")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument(
+        "--corpus-dir",
+        default=os.path.join(tempfile.gettempdir(), "pdf_tools_bench_corpus"),
+    )
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument(
+        "--only", action="append", help="Run only operations containing this text"
+    )
+    args = parser.parse_args(argv)
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    logging.getLogger().setLevel(logging.WARNING)
+    corpus = build_corpus(args.corpus_dir, args.scale)
+    cases = build_cases(corpus)
+    if args.only:
+        cases = [c for c in cases if any(o in c.operation for o in args.only)]
+
+    work_dir = tempfile.mkdtemp(prefix="pdf_tools_bench_")
+    results = []
+    try:
+        for case in cases:
+            result = run_case(case, work_dir, args.repeat, args.warmup)
+            results.append(result)
+            print(
+                f"{case.operation:<24} {case.corpus:<16} "
+                f"p50 {result['latency_ms']['p50']:9.1f} ms  "
+                f"p90 {result['latency_ms']['p90']:9.1f} ms  "
+                f"{result['throughput']['value']:10.1f} {result['throughput']['unit']}  "
+                f"heap {result['peak_python_mb']:7.1f} MB  "
+                f"RSS +{result['rss_growth_mb'] or 0:6.1f} MB"
+                + (
+                    f"  out/in {result['output_ratio']:.2f}x"
+                    if result["bytes_out"] and result["output_ratio"]
+                    else ""
+                )
+                + (
+                    f"  first page {result['first_page_bytes'] / 1024:.0f} KB"
+                    if result.get("first_page_bytes")
+                    else ""
+                )
+            )
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    report = {
+        "environment": environment_info(args.scale, args.repeat),
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,59 @@
+import os
+import logging
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+import fitz
+from assets.config import *
+
+logger = logging.getLogger(__name__)
+
+_documents: "OrderedDict[str, Tuple[Tuple, fitz.Document]]" = OrderedDict()
+_lock = threading.RLock()
+
+
+def _reset_after_fork() -> None:
+    global _documents, _lock
+    _documents = OrderedDict()
+    _lock = threading.RLock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def _version(path: str) -> Tuple:
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def cached_document(path: str) -> fitz.Document:
+    path = os.path.abspath(path)
+    version = _version(path)
+    with _lock:
+        entry = _documents.get(path)
+        if entry is not None and entry[0] == version:
+            _documents.move_to_end(path)
+            return entry[1]
+        if entry is not None:
+            entry[1].close()
+        doc = fitz.open(path)
+        _documents[path] = (version, doc)
+        while len(_documents) > DOCUMENT_CACHE_SIZE:
+            _, (_, oldest) = _documents.popitem(last=False)
+            oldest.close()
+        return doc
+
+
+def release_documents(folder: Optional[str] = None) -> None:
+    prefix = os.path.join(os.path.abspath(folder), "") if folder else ""
+    with _lock:
+        for path in [p for p in _documents if p.startswith(prefix)]:
+            _documents.pop(path)[1].close()
+
+
+def release_document(path: str) -> None:
+    with _lock:
+        entry = _documents.pop(os.path.abspath(path), None)
+        if entry is not None:
+            entry[1].close()
@@ -2,11 +2,12 @@ import os
 from PyQt6.QtWidgets import QFrame, QVBoxLayout, QLabel, QPushButton
 from PyQt6.QtCore import Qt, QMimeData, pyqtSignal
 from PyQt6.QtGui import QDrag, QPixmap, QIcon
-from component.toolsForPDF import (
-    get_pdf_thumbnail,
-    calculate_rotation,
-    truncate_filename,
+from component.thumbnail_cache import (
+    get_draft_thumbnail,
+    get_rotated_thumbnail,
+    has_base_thumbnail,
 )
+from component.toolsForPDF import calculate_rotation, truncate_filename
 from assets.config import *
 
 
@@ -14,15 +15,23 @@ class FileCard(QFrame):
     delete_requested = pyqtSignal(object)
     rotate_requested = pyqtSignal(object)
 
-    def __init__(self, item_data, index=0, click_to_toggle: bool = False):
+    def __init__(
+        self,
+        item_data,
+        index=0,
+        click_to_toggle: bool = False,
+        progressive: bool = False,
+    ):
         super().__init__()
         self.setFixedSize(FILE_CARD_WIDTH, FILE_CARD_HEIGHT)
         self.item_data = item_data
-        self.file_path = item_data["path"]
-        self.rotation_angle = item_data.get("rotation", 0)
-        self.page_num = item_data.get("page", 0)
-        self.is_encrypted = item_data.get("encrypted", False)
+        self.file_path = item_data.path
+        self.rotation_angle = item_data.rotation
+        self.page_num = item_data.page
+        self.is_encrypted = item_data.encrypted
         self.click_to_toggle = click_to_toggle
+        self.progressive = progressive
+        self.needs_refine = False
         self.setObjectName("FileCard")
         self.setAttribute(Qt.WidgetAttribute.WA_StyledBackground, True)
         self.number_label = QLabel(str(index), self)
@@ -106,7 +115,16 @@ class FileCard(QFrame):
     def generate_thumbnail(self):
         if self.is_encrypted:
             return
-        pixmap = get_pdf_thumbnail(self.file_path, self.page_num, self.rotation_angle)
+        if self.progressive and not has_base_thumbnail(self.file_path, self.page_num):
+            pixmap = get_draft_thumbnail(
+                self.file_path, self.page_num, self.rotation_angle
+            )
+            self.needs_refine = pixmap is not None
+        else:
+            pixmap = get_rotated_thumbnail(
+                self.file_path, self.page_num, self.rotation_angle
+            )
+            self.needs_refine = False
         if pixmap:
             self.image_label.setPixmap(pixmap)
         else:
@@ -121,6 +139,16 @@ class FileCard(QFrame):
                     )
                 )
 
+    def refine_thumbnail(self):
+        if not self.needs_refine:
+            return
+        self.needs_refine = False
+        pixmap = get_rotated_thumbnail(
+            self.file_path, self.page_num, self.rotation_angle
+        )
+        if pixmap:
+            self.image_label.setPixmap(pixmap)
+
     def mousePressEvent(self, event):
         if self.click_to_toggle:
             self.delete_requested.emit(self.item_data)
@@ -164,10 +192,10 @@ class FileCard(QFrame):
 
     def update_content(self, item_data):
         self.item_data = item_data
-        self.file_path = item_data["path"]
-        self.rotation_angle = item_data.get("rotation", 0)
-        self.page_num = item_data.get("page", 0)
-        self.is_encrypted = item_data.get("encrypted", False)
+        self.file_path = item_data.path
+        self.rotation_angle = item_data.rotation
+        self.page_num = item_data.page
+        self.is_encrypted = item_data.encrypted
         file_name = os.path.basename(self.file_path)
         display_name = truncate_filename(file_name)
         self.name_label.setText(display_name)
@@ -198,7 +226,7 @@ class FileCard(QFrame):
         if e.buttons() == Qt.MouseButton.LeftButton:
             drag = QDrag(self)
             mime = QMimeData()
-            mime.setText(self.file_path)
+            mime.setText(str(self.item_data.key))
             drag.setMimeData(mime)
             pixmap = QPixmap(self.size())
             self.set_placeholder(False)
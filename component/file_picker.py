@@ -1,5 +1,6 @@
 import sys
 import os
+import logging
 from typing import List
 from PyQt6.QtWidgets import (
     QApplication,
@@ -15,6 +16,8 @@ from PyQt6.QtCore import Qt
 from component.toolsForPDF import *
 from assets.config import *
 
+logger = logging.getLogger(__name__)
+
 
 class FileSelector(QDialog):
     def __init__(self, max_files: int, target_folder: str = "temp_files"):
@@ -78,6 +81,7 @@ class FileSelector(QDialog):
             if files:
                 self.process_files(files)
 
+    @traced("ingest.files")
     def process_files(self, files: List[str]) -> None:
         if len(files) > self.max_files:
             QMessageBox.warning(
@@ -112,7 +116,7 @@ class FileSelector(QDialog):
             except OSError as e:
                 errors.append(f"{os.path.basename(src_path)}: {str(e)}")
             except Exception as e:
-                print(f"Failed to copy {src_path}: {e}")
+                logger.error(f"Failed to copy {src_path}: {e}")
                 errors.append(f"{os.path.basename(src_path)}: Unexpected error")
         progress.setValue(len(files))
         if errors:
@@ -0,0 +1,374 @@
+import os
+import sys
+import json
+import shutil
+import time
+import argparse
+import logging
+import threading
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from component.output_naming import OutputNamer
+from component.job_queue import JobQueue, JobScheduler, get_job_queue
+from component.pdf_jobs import JOB_OPERATIONS, JobError
+from assets.config import *
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:
+    FileSystemEventHandler = object
+    Observer = None
+
+logger = logging.getLogger(__name__)
+
+
+class WatchFolder(NamedTuple):
+    input_dir: str
+    output_dir: str
+    error_dir: str
+    archive_dir: str
+    operation: str
+    options: Dict
+    batch_size: int = 0
+    batch_quiet_sec: float = WATCH_BATCH_QUIET_SEC
+    priority: int = QUEUE_PRIORITY_NORMAL
+
+
+class WatchSettings(NamedTuple):
+    folders: List[WatchFolder]
+    workers: int = WATCH_DEFAULT_WORKERS
+    settle_sec: float = WATCH_SETTLE_SEC
+    poll_interval_sec: float = WATCH_POLL_INTERVAL_SEC
+    use_polling: bool = False
+
+
+def _resolve(base_dir: str, value: Optional[str], default: str) -> str:
+    return os.path.join(base_dir, value) if value else default
+
+
+def load_watch_settings(path: str) -> WatchSettings:
+    with open(path, "r", encoding="utf-8") as f:
+        raw = json.load(f)
+    base_dir = os.path.dirname(os.path.abspath(path))
+    folders = []
+    for entry in raw.get("folders", []):
+        input_dir = os.path.join(base_dir, entry["input"])
+        operation = entry.get("operation", "")
+        if operation not in JOB_OPERATIONS:
+            raise JobError(
+                f"{entry['input']}: operation must be one of {', '.join(JOB_OPERATIONS)}"
+            )
+        folders.append(
+            WatchFolder(
+                input_dir,
+                _resolve(
+                    base_dir,
+                    entry.get("output"),
+                    os.path.join(input_dir, WATCH_OUTPUT_FOLDER),
+                ),
+                _resolve(
+                    base_dir,
+                    entry.get("error"),
+                    os.path.join(input_dir, WATCH_ERROR_FOLDER),
+                ),
+                _resolve(
+                    base_dir,
+                    entry.get("archive"),
+                    os.path.join(input_dir, WATCH_ARCHIVE_FOLDER),
+                ),
+                operation,
+                entry.get("options", {}),
+                int(entry.get("batch_size", 0)),
+                float(entry.get("batch_quiet_seconds", WATCH_BATCH_QUIET_SEC)),
+                int(entry.get("priority", QUEUE_PRIORITY_NORMAL)),
+            )
+        )
+    if not folders:
+        raise JobError(f"{path} does not configure any folders")
+    return WatchSettings(
+        folders,
+        int(raw.get("workers", WATCH_DEFAULT_WORKERS)),
+        float(raw.get("settle_seconds", WATCH_SETTLE_SEC)),
+        float(raw.get("poll_interval_seconds", WATCH_POLL_INTERVAL_SEC)),
+        bool(raw.get("use_polling", False)),
+    )
+
+
+def move_unique(path: str, folder: str) -> str:
+    namer = OutputNamer(folder)
+    target = namer.claim(os.path.basename(path))
+    try:
+        shutil.move(path, target)
+    finally:
+        namer.release(target)
+    return target
+
+
+def _is_candidate(name: str) -> bool:
+    return (
+        name.lower().endswith(".pdf")
+        and not name.startswith(".")
+        and not name.endswith(OUTPUT_TEMP_SUFFIX)
+    )
+
+
+def _can_open(path: str) -> bool:
+    try:
+        with open(path, "rb"):
+            return True
+    except OSError:
+        return False
+
+
+class _WakeHandler(FileSystemEventHandler):
+    def __init__(self, wake: threading.Event):
+        super().__init__()
+        self._wake = wake
+
+    def on_any_event(self, event) -> None:
+        self._wake.set()
+
+
+class HotFolderWatcher:
+    def __init__(self, settings: WatchSettings, queue: Optional[JobQueue] = None):
+        self.settings = settings
+        self.queue = queue or get_job_queue()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._seen: Dict[str, Tuple[int, int, float]] = {}
+        self._claimed: set = set()
+        self._unready: Dict[str, int] = {}
+        self._rejected: set = set()
+        self._batches: Dict[str, List[str]] = {}
+        self._batch_updated: Dict[str, float] = {}
+        self._running: Dict[int, Tuple[WatchFolder, List[str]]] = {}
+        self._scheduler = JobScheduler(
+            self.queue, settings.workers, on_finished=lambda _: self._wake.set()
+        )
+        self._observer = None
+        for folder in settings.folders:
+            for path in (folder.input_dir, folder.output_dir, folder.error_dir):
+                os.makedirs(path, exist_ok=True)
+
+    def _start_observer(self) -> None:
+        if self.settings.use_polling or Observer is None:
+            logger.info(
+                f"Polling input folders every {self.settings.poll_interval_sec:g}s"
+            )
+            return
+        self._observer = Observer()
+        handler = _WakeHandler(self._wake)
+        for folder in self.settings.folders:
+            self._observer.schedule(handler, folder.input_dir, recursive=False)
+        self._observer.start()
+        logger.info("Watching input folders for file system events")
+
+    def _stable_files(self, folder: WatchFolder, now: float) -> List[str]:
+        ready = []
+        try:
+            entries = list(os.scandir(folder.input_dir))
+        except OSError as e:
+            logger.warning(f"Cannot scan {folder.input_dir}: {e}")
+            return ready
+        present = {entry.path for entry in entries}
+        for path in [p for p in self._seen if os.path.dirname(p) == folder.input_dir]:
+            if path not in present:
+                del self._seen[path]
+                self._unready.pop(path, None)
+        self._rejected = {
+            p
+            for p in self._rejected
+            if p in present or os.path.dirname(p) != folder.input_dir
+        }
+        for entry in entries:
+            path = entry.path
+            if (
+                path in self._claimed
+                or path in self._rejected
+                or not _is_candidate(entry.name)
+            ):
+                continue
+            try:
+                if not entry.is_file():
+                    continue
+                stat = entry.stat()
+            except OSError:
+                continue
+            size, mtime, since = self._seen.get(path, (-1, -1, now))
+            if (size, mtime) != (stat.st_size, stat.st_mtime_ns):
+                self._seen[path] = (stat.st_size, stat.st_mtime_ns, now)
+                self._unready.pop(path, None)
+                continue
+            if now - since < self.settings.settle_sec:
+                continue
+            if stat.st_size and _can_open(path):
+                ready.append(path)
+                continue
+            checks = self._unready.get(path, 0) + 1
+            if checks < WATCH_READY_MAX_CHECKS:
+                self._unready[path] = checks
+                continue
+            self._reject(
+                folder,
+                path,
+                "file is empty" if not stat.st_size else "cannot open file",
+            )
+        return sorted(ready)
+
+    def _reject(self, folder: WatchFolder, path: str, reason: str) -> None:
+        self._seen.pop(path, None)
+        self._unready.pop(path, None)
+        logger.error(f"{os.path.basename(path)} never became ready: {reason}")
+        try:
+            self._move_failed(path, folder.error_dir, f"Not processed: {reason}")
+        except OSError as e:
+            logger.error(f"Could not move {path}: {e}")
+            self._rejected.add(path)
+
+    def _submit(self, folder: WatchFolder, inputs: List[str]) -> None:
+        for path in inputs:
+            self._claimed.add(path)
+            self._seen.pop(path, None)
+            self._unready.pop(path, None)
+        logger.info(
+            f"{folder.operation}: {', '.join(os.path.basename(p) for p in inputs)}"
+        )
+        job_id = self.queue.submit(
+            folder.operation,
+            inputs,
+            folder.output_dir,
+            folder.options,
+            folder.priority,
+            WATCH_SOURCE,
+        )
+        self._running[job_id] = (folder, inputs)
+        self._scheduler.wake()
+
+    def _adopt_pending(self) -> None:
+        for job in self.queue.jobs(source=WATCH_SOURCE, statuses=["queued", "running"]):
+            for folder in self.settings.folders:
+                if (folder.operation, folder.output_dir) == (
+                    job.operation,
+                    job.output_dir,
+                ) and all(os.path.dirname(p) == folder.input_dir for p in job.inputs):
+                    self._running[job.id] = (folder, job.inputs)
+                    self._claimed.update(job.inputs)
+                    break
+        if self._running:
+            logger.info(f"Resuming {len(self._running)} queued hot-folder jobs")
+
+    def _has_capacity(self) -> bool:
+        return len(self._running) < self.settings.workers * 2
+
+    def _dispatch(self, now: float) -> None:
+        for folder in self.settings.folders:
+            ready = self._stable_files(folder, now)
+            if folder.operation != "merge":
+                for path in ready:
+                    if not self._has_capacity():
+                        return
+                    self._submit(folder, [path])
+                continue
+            batch = self._batches.setdefault(folder.input_dir, [])
+            for path in ready:
+                self._claimed.add(path)
+                self._seen.pop(path, None)
+                self._unready.pop(path, None)
+                batch.append(path)
+                self._batch_updated[folder.input_dir] = now
+            full = folder.batch_size and len(batch) >= folder.batch_size
+            quiet = now - self._batch_updated.get(folder.input_dir, now)
+            if batch and (full or quiet >= folder.batch_quiet_sec):
+                if not self._has_capacity():
+                    return
+                size = folder.batch_size or len(batch)
+                self._submit(folder, batch[:size])
+                del batch[:size]
+
+    def _collect(self) -> None:
+        if not self._running:
+            return
+        for job in self.queue.jobs(ids=list(self._running)):
+            if job.status in ("queued", "running"):
+                continue
+            folder, inputs = self._running.pop(job.id)
+            error = None if job.status == "done" else job.error or job.status
+            for path in inputs:
+                self._claimed.discard(path)
+                if not os.path.exists(path):
+                    continue
+                try:
+                    if error is None:
+                        move_unique(path, folder.archive_dir)
+                    else:
+                        self._move_failed(path, folder.error_dir, error)
+                except OSError as e:
+                    logger.error(f"Could not move {path}: {e}")
+            if error is None:
+                logger.info(f"{folder.operation}: wrote {len(job.outputs)} files")
+            else:
+                logger.error(f"{folder.operation} failed: {error}")
+
+    def _move_failed(self, path: str, error_dir: str, error: str) -> None:
+        target = move_unique(path, error_dir)
+        with open(f"{target}.error.txt", "w", encoding="utf-8") as f:
+            f.write(f"{error}\n")
+
+    def is_idle(self) -> bool:
+        return not (self._running or self._seen or any(self._batches.values()))
+
+    def run(self, once: bool = False) -> None:
+        self._adopt_pending()
+        self._scheduler.start()
+        self._start_observer()
+        try:
+            while not self._stop.is_set():
+                self._collect()
+                self._dispatch(time.monotonic())
+                if once and self.is_idle():
+                    break
+                if self._observer is None or not self.is_idle():
+                    timeout = self.settings.poll_interval_sec
+                else:
+                    timeout = WATCH_RESCAN_SEC
+                self._wake.wait(timeout)
+                self._wake.clear()
+        finally:
+            if self._observer is not None:
+                self._observer.stop()
+                self._observer.join()
+            self._scheduler.stop()
+            self._collect()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="PDF Master Suite hot-folder mode")
+    parser.add_argument("--watch", required=True, metavar="CONFIG")
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--poll", action="store_true", help="Force polling")
+    parser.add_argument(
+        "--once", action="store_true", help="Process waiting files, then exit"
+    )
+    parser.add_argument("--queue-db", help="Job queue database (shared by default)")
+    args = parser.parse_args(argv)
+    settings = load_watch_settings(args.watch)
+    if args.workers:
+        settings = settings._replace(workers=args.workers)
+    if args.poll:
+        settings = settings._replace(use_polling=True)
+    watcher = HotFolderWatcher(
+        settings, JobQueue(args.queue_db) if args.queue_db else None
+    )
+    try:
+        watcher.run(once=args.once)
+    except KeyboardInterrupt:
+        watcher.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
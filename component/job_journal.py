@@ -0,0 +1,130 @@
+import os
+import json
+import hashlib
+import logging
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from component.pdf_output import SaveReport, file_sha256
+from assets.config import *
+
+logger = logging.getLogger(__name__)
+
+
+class JournalEntry(NamedTuple):
+    part: int
+    filename: str
+    sha256: str
+    size: int
+    pages: Tuple[int, int]
+
+
+def job_id(job: Dict) -> str:
+    encoded = json.dumps(job, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+class JobJournal:
+    def __init__(self, save_dir: str, name: str, job: Dict):
+        self.save_dir = save_dir
+        self.job_id = job_id(job)
+        self.path = os.path.join(save_dir, f".{name}.{self.job_id}{JOB_JOURNAL_SUFFIX}")
+        self._job = job
+        self._entries: Dict[int, JournalEntry] = {}
+        self._load()
+
+    def _read_entries(self) -> List[JournalEntry]:
+        entries = []
+        with open(self.path, "r", encoding="utf-8") as f:
+            header = json.loads(f.readline() or "{}")
+            if header.get("job_id") != self.job_id:
+                return []
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    entries.append(
+                        JournalEntry(
+                            record["part"],
+                            record["file"],
+                            record["sha256"],
+                            record["size"],
+                            tuple(record["pages"]),
+                        )
+                    )
+                except (ValueError, KeyError, TypeError):
+                    break
+        return entries
+
+    def _verify(self, entry: JournalEntry) -> bool:
+        path = os.path.join(self.save_dir, entry.filename)
+        try:
+            if os.path.getsize(path) != entry.size:
+                return False
+            return file_sha256(path) == entry.sha256
+        except OSError:
+            return False
+
+    def _load(self) -> None:
+        try:
+            entries = self._read_entries()
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable job journal {self.path}: {e}")
+            return
+        for entry in entries:
+            if self._verify(entry):
+                self._entries[entry.part] = entry
+            else:
+                logger.info(f"Part {entry.part} ({entry.filename}) changed; rewriting")
+        if self._entries:
+            logger.info(
+                f"Resuming job {self.job_id}: {len(self._entries)} parts verified"
+            )
+
+    def _append(self, record: Dict) -> None:
+        is_new = not os.path.exists(self.path)
+        with open(self.path, "a", encoding="utf-8") as f:
+            if is_new:
+                f.write(json.dumps({"job_id": self.job_id, "job": self._job}) + "\n")
+            f.write(json.dumps(record) + "\n")
+
+    def completed(self, part: int) -> Optional[SaveReport]:
+        entry = self._entries.get(part)
+        if entry is None:
+            return None
+        return SaveReport(
+            os.path.join(self.save_dir, entry.filename), RESUMED_STRATEGY, entry.size, 0
+        )
+
+    def finished_parts(self) -> int:
+        return len(self._entries)
+
+    def completed_prefix(self) -> List[JournalEntry]:
+        prefix = []
+        while len(prefix) + 1 in self._entries:
+            prefix.append(self._entries[len(prefix) + 1])
+        return prefix
+
+    def record(self, part: int, report: SaveReport, pages: Tuple[int, int]) -> None:
+        entry = JournalEntry(
+            part,
+            os.path.basename(report.path),
+            file_sha256(report.path),
+            os.path.getsize(report.path),
+            pages,
+        )
+        self._entries[part] = entry
+        self._append(
+            {
+                "part": entry.part,
+                "file": entry.filename,
+                "sha256": entry.sha256,
+                "size": entry.size,
+                "pages": list(entry.pages),
+            }
+        )
+
+    def finish(self) -> None:
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
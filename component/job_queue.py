@@ -0,0 +1,489 @@
+import os
+import json
+import time
+import socket
+import sqlite3
+import logging
+import threading
+import multiprocessing
+from contextlib import contextmanager
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Dict, List, NamedTuple, Optional
+from component.pdf_jobs import run_job
+from assets.config import *
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    operation TEXT NOT NULL,
+    inputs TEXT NOT NULL,
+    output_dir TEXT NOT NULL,
+    options TEXT NOT NULL,
+    priority INTEGER NOT NULL DEFAULT 0,
+    resource TEXT NOT NULL,
+    runner TEXT NOT NULL,
+    source TEXT NOT NULL DEFAULT '',
+    status TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    owner TEXT,
+    lease_until REAL,
+    submitted REAL NOT NULL,
+    started REAL,
+    finished REAL,
+    outputs TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_ready ON jobs (status, runner, priority DESC, id);
+"""
+
+
+class QueuedJob(NamedTuple):
+    id: int
+    operation: str
+    inputs: List[str]
+    output_dir: str
+    options: Dict
+    priority: int
+    resource: str
+    runner: str
+    source: str
+    status: str
+    attempts: int
+    submitted: float
+    started: Optional[float]
+    finished: Optional[float]
+    outputs: List[str]
+    error: Optional[str]
+
+    def to_dict(self) -> Dict:
+        info = self._asdict()
+        if self.started:
+            info["queued_sec"] = self.started - self.submitted
+        if self.started and self.finished:
+            info["run_sec"] = self.finished - self.started
+        return info
+
+
+def resource_class(operation: str, options: Dict) -> str:
+    if operation == "compress" or options.get("profile") == "compact":
+        return "cpu"
+    return "io"
+
+
+def default_queue_path() -> str:
+    return os.environ.get(QUEUE_ENV_VAR) or os.path.join(
+        os.path.expanduser("~"), QUEUE_DEFAULT_FOLDER, QUEUE_DEFAULT_FILE
+    )
+
+
+class JobQueue:
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or default_queue_path()
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+        self.limits = {"cpu": QUEUE_CPU_SLOTS, "io": QUEUE_IO_SLOTS}
+        self._local = threading.local()
+        self._held: set = set()
+        self._held_lock = threading.Lock()
+        self._connection().executescript(SCHEMA)
+        self._heartbeat = threading.Thread(
+            target=self._renew_leases, name="job-queue-lease", daemon=True
+        )
+        self._heartbeat.start()
+        self.recover()
+
+    def _connection(self) -> sqlite3.Connection:
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(
+                self.path, timeout=QUEUE_BUSY_TIMEOUT_SEC, isolation_level=None
+            )
+            db.row_factory = sqlite3.Row
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            self._local.db = db
+        return db
+
+    @contextmanager
+    def _transaction(self):
+        db = self._connection()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            yield db
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        db.execute("COMMIT")
+
+    @staticmethod
+    def _job(row: sqlite3.Row) -> QueuedJob:
+        return QueuedJob(
+            row["id"],
+            row["operation"],
+            json.loads(row["inputs"]),
+            row["output_dir"],
+            json.loads(row["options"]),
+            row["priority"],
+            row["resource"],
+            row["runner"],
+            row["source"],
+            row["status"],
+            row["attempts"],
+            row["submitted"],
+            row["started"],
+            row["finished"],
+            json.loads(row["outputs"] or "[]"),
+            row["error"],
+        )
+
+    def submit(
+        self,
+        operation: str,
+        inputs: List[str],
+        output_dir: str,
+        options: Optional[Dict] = None,
+        priority: int = QUEUE_PRIORITY_NORMAL,
+        source: str = "",
+        runner: str = "pool",
+    ) -> int:
+        options = options or {}
+        now = time.time()
+        inline = runner == "inline"
+        with self._transaction() as db:
+            cursor = db.execute(
+                "INSERT INTO jobs (operation, inputs, output_dir, options, priority,"
+                " resource, runner, source, owner, lease_until, submitted)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    operation,
+                    json.dumps(inputs),
+                    output_dir,
+                    json.dumps(options),
+                    priority,
+                    resource_class(operation, options),
+                    runner,
+                    source,
+                    self.owner if inline else None,
+                    now + QUEUE_LEASE_SEC if inline else None,
+                    now,
+                ),
+            )
+        if inline:
+            with self._held_lock:
+                self._held.add(cursor.lastrowid)
+        return cursor.lastrowid
+
+    def _free_slots(self, db: sqlite3.Connection) -> Dict[str, int]:
+        running = dict(
+            db.execute(
+                "SELECT resource, COUNT(*) FROM jobs WHERE status = 'running'"
+                " AND lease_until >= ? GROUP BY resource",
+                (time.time(),),
+            ).fetchall()
+        )
+        return {r: limit - running.get(r, 0) for r, limit in self.limits.items()}
+
+    def _start(self, db: sqlite3.Connection, job_id: int) -> None:
+        now = time.time()
+        db.execute(
+            "UPDATE jobs SET status = 'running', owner = ?, lease_until = ?,"
+            " started = ?, attempts = attempts + 1 WHERE id = ?",
+            (self.owner, now + QUEUE_LEASE_SEC, now, job_id),
+        )
+        with self._held_lock:
+            self._held.add(job_id)
+
+    def claim_next(self) -> Optional[QueuedJob]:
+        with self._transaction() as db:
+            free = [r for r, n in self._free_slots(db).items() if n > 0]
+            if not free:
+                return None
+            row = db.execute(
+                "SELECT * FROM jobs AS job WHERE status = 'queued' AND runner = 'pool'"
+                f" AND resource IN ({','.join('?' * len(free))})"
+                " AND NOT EXISTS (SELECT 1 FROM jobs AS gui WHERE gui.status = 'queued'"
+                " AND gui.runner = 'inline' AND gui.resource = job.resource"
+                " AND gui.priority > job.priority)"
+                " ORDER BY priority DESC, id LIMIT 1",
+                free,
+            ).fetchone()
+            if row is None:
+                return None
+            self._start(db, row["id"])
+        return self.get(row["id"])
+
+    def try_start(self, job_id: int) -> bool:
+        with self._transaction() as db:
+            job = db.execute(
+                "SELECT resource, priority FROM jobs WHERE id = ? AND status = 'queued'",
+                (job_id,),
+            ).fetchone()
+            if job is None or self._free_slots(db)[job["resource"]] <= 0:
+                return False
+            ahead = db.execute(
+                "SELECT 1 FROM jobs WHERE status = 'queued' AND resource = ?"
+                " AND priority > ? LIMIT 1",
+                (job["resource"], job["priority"]),
+            ).fetchone()
+            if ahead:
+                return False
+            self._start(db, job_id)
+        return True
+
+    def _finish(self, job_id: int, status: str, outputs=None, error=None) -> None:
+        with self._held_lock:
+            self._held.discard(job_id)
+        with self._transaction() as db:
+            db.execute(
+                "UPDATE jobs SET status = ?, finished = ?, outputs = ?, error = ?,"
+                " lease_until = NULL WHERE id = ?",
+                (status, time.time(), json.dumps(outputs or []), error, job_id),
+            )
+
+    def release(self, job_id: int) -> None:
+        self._finish(job_id, "cancelled")
+
+    def complete(self, job_id: int, outputs: List[str]) -> None:
+        self._finish(job_id, "done", outputs=outputs)
+
+    def fail(self, job_id: int, error: str) -> None:
+        self._finish(job_id, "failed", error=error)
+
+    def cancel(self, job_id: int) -> bool:
+        with self._held_lock:
+            self._held.discard(job_id)
+        with self._transaction() as db:
+            cursor = db.execute(
+                "UPDATE jobs SET status = 'cancelled', finished = ?"
+                " WHERE id = ? AND status = 'queued'",
+                (time.time(), job_id),
+            )
+            return cursor.rowcount > 0
+
+    def delete(self, job_id: int) -> None:
+        with self._transaction() as db:
+            db.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+
+    def get(self, job_id: int) -> Optional[QueuedJob]:
+        row = (
+            self._connection()
+            .execute("SELECT * FROM jobs WHERE id = ?", (job_id,))
+            .fetchone()
+        )
+        return self._job(row) if row else None
+
+    def jobs(
+        self,
+        ids: Optional[List[int]] = None,
+        source: Optional[str] = None,
+        statuses: Optional[List[str]] = None,
+        limit: int = QUEUE_LIST_LIMIT,
+    ) -> List[QueuedJob]:
+        clauses, params = [], []
+        if ids is not None:
+            clauses.append(f"id IN ({','.join('?' * len(ids))})")
+            params += ids
+        if source is not None:
+            clauses.append("source = ?")
+            params.append(source)
+        if statuses:
+            clauses.append(f"status IN ({','.join('?' * len(statuses))})")
+            params += statuses
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = (
+            self._connection()
+            .execute(
+                f"SELECT * FROM jobs{where} ORDER BY id DESC LIMIT ?", params + [limit]
+            )
+            .fetchall()
+        )
+        return [self._job(row) for row in rows]
+
+    def _renew_leases(self) -> None:
+        while True:
+            time.sleep(QUEUE_LEASE_SEC / 3)
+            with self._held_lock:
+                held = list(self._held)
+            if not held:
+                continue
+            try:
+                with self._transaction() as db:
+                    db.execute(
+                        "UPDATE jobs SET lease_until = ?"
+                        f" WHERE id IN ({','.join('?' * len(held))})",
+                        [time.time() + QUEUE_LEASE_SEC] + held,
+                    )
+            except sqlite3.Error as e:
+                logger.warning(f"Could not renew job leases: {e}")
+
+    def recover(self) -> int:
+        now = time.time()
+        with self._transaction() as db:
+            rows = db.execute(
+                "SELECT id, runner, attempts FROM jobs"
+                " WHERE status = 'running' AND lease_until < ?",
+                (now,),
+            ).fetchall()
+            for row in rows:
+                if row["runner"] == "pool" and row["attempts"] < QUEUE_MAX_ATTEMPTS:
+                    db.execute(
+                        "UPDATE jobs SET status = 'queued', owner = NULL,"
+                        " lease_until = NULL WHERE id = ?",
+                        (row["id"],),
+                    )
+                else:
+                    db.execute(
+                        "UPDATE jobs SET status = 'failed', finished = ?,"
+                        " error = 'Interrupted' WHERE id = ?",
+                        (now, row["id"]),
+                    )
+            expired = db.execute(
+                "UPDATE jobs SET status = 'cancelled', finished = ?,"
+                " error = 'Abandoned while waiting' WHERE status = 'queued'"
+                " AND runner = 'inline' AND (lease_until IS NULL OR lease_until < ?)",
+                (now, now),
+            ).rowcount
+        if rows:
+            logger.info(f"Recovered {len(rows)} interrupted jobs")
+        if expired:
+            logger.info(f"Expired {expired} abandoned interactive jobs")
+        return len(rows) + expired
+
+
+class JobScheduler:
+    def __init__(
+        self,
+        queue: JobQueue,
+        workers: int = QUEUE_CPU_SLOTS + QUEUE_IO_SLOTS,
+        on_finished: Optional[Callable[[int], None]] = None,
+    ):
+        self.queue = queue
+        self.workers = workers
+        self.on_finished = on_finished
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._running: Dict[Future, int] = {}
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._thread: Optional[threading.Thread] = None
+        self._last_recover = 0.0
+
+    def wake(self) -> None:
+        self._wake.set()
+
+    def _finished(self, future: Future, job_id: int) -> None:
+        error = future.exception()
+        if error is None:
+            self.queue.complete(job_id, future.result())
+        else:
+            self.queue.fail(job_id, f"{type(error).__name__}: {error}")
+        if self.on_finished:
+            try:
+                self.on_finished(job_id)
+            except Exception:
+                logger.exception(f"Job {job_id}: finish callback failed")
+
+    def _dispatch(self) -> None:
+        for future in [f for f in self._running if f.done()]:
+            self._finished(future, self._running[future])
+            del self._running[future]
+        if time.monotonic() - self._last_recover > QUEUE_LEASE_SEC:
+            self.queue.recover()
+            self._last_recover = time.monotonic()
+        while len(self._running) < self.workers:
+            job = self.queue.claim_next()
+            if job is None:
+                break
+            logger.info(f"Job {job.id}: {job.operation} ({job.resource})")
+            try:
+                future = self._executor.submit(
+                    run_job, job.operation, job.inputs, job.output_dir, job.options
+                )
+            except Exception as e:
+                self.queue.fail(job.id, f"{type(e).__name__}: {e}")
+                raise
+            future.add_done_callback(lambda _: self._wake.set())
+            self._running[future] = job.id
+
+    def _run(self) -> None:
+        self._last_recover = time.monotonic()
+        while not self._stop.is_set():
+            try:
+                self._dispatch()
+            except Exception:
+                logger.exception("Job scheduler pass failed")
+            self._wake.wait(QUEUE_POLL_SEC)
+            self._wake.clear()
+
+    def start(self) -> "JobScheduler":
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context(WORKER_START_METHOD),
+        )
+        self._thread = threading.Thread(
+            target=self._run, name="job-scheduler", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join()
+        self._executor.shutdown(wait=True)
+        for future, job_id in list(self._running.items()):
+            self._finished(future, job_id)
+        self._running.clear()
+
+
+class InlineJob:
+    def __init__(self, job_id: int):
+        self.id = job_id
+        self.outputs: List[str] = []
+
+
+_queue: Optional[JobQueue] = None
+_queue_lock = threading.Lock()
+
+
+def get_job_queue() -> JobQueue:
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = JobQueue()
+        return _queue
+
+
+@contextmanager
+def queued_job(
+    operation: str,
+    inputs: List[str],
+    output_dir: str,
+    options: Optional[Dict] = None,
+    priority: int = QUEUE_PRIORITY_INTERACTIVE,
+    source: str = GUI_SOURCE,
+    wait: Optional[Callable[[], bool]] = None,
+):
+    queue = get_job_queue()
+    job = InlineJob(
+        queue.submit(
+            operation, inputs, output_dir, options, priority, source, runner="inline"
+        )
+    )
+    while not queue.try_start(job.id):
+        if queue.get(job.id).status != "queued":
+            raise InterruptedError("Job was cancelled while waiting")
+        if wait and wait() is False and queue.cancel(job.id):
+            raise InterruptedError("Cancelled while waiting for a free job slot")
+        time.sleep(QUEUE_POLL_SEC)
+    try:
+        yield job
+    except InterruptedError:
+        queue.release(job.id)
+        raise
+    except BaseException as e:
+        queue.fail(job.id, f"{type(e).__name__}: {e}")
+        raise
+    queue.complete(job.id, job.outputs)
@@ -0,0 +1,365 @@
+import os
+import sys
+import json
+import time
+import uuid
+import shutil
+import zipfile
+import argparse
+import logging
+import tempfile
+import threading
+from email import policy
+from email.parser import BytesParser
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+from component.output_naming import OutputNamer
+from component.job_queue import JobQueue, JobScheduler, QueuedJob, get_job_queue
+from component.pdf_jobs import JOB_OPERATIONS, JobError
+from component.temp_reaper import get_reaper
+from component.toolsForPDF import get_pdf_page_count, is_valid_pdf
+from assets.config import *
+
+logger = logging.getLogger(__name__)
+
+
+class ServiceError(Exception):
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def public_job(job: QueuedJob) -> Dict:
+    info = job.to_dict()
+    info["inputs"] = [os.path.basename(p) for p in job.inputs]
+    info["outputs"] = [os.path.basename(p) for p in job.outputs]
+    for key in ("output_dir", "runner", "source"):
+        info.pop(key)
+    return info
+
+
+def parse_multipart(
+    content_type: str, body: bytes
+) -> Tuple[Dict[str, str], List[Tuple[str, bytes]]]:
+    message = BytesParser(policy=policy.HTTP).parsebytes(
+        f"Content-Type: {content_type}\r\n\r\n".encode("latin-1") + body
+    )
+    fields: Dict[str, str] = {}
+    files: List[Tuple[str, bytes]] = []
+    for part in message.iter_parts():
+        payload = part.get_payload(decode=True) or b""
+        filename = part.get_filename()
+        if filename:
+            files.append((filename, payload))
+        else:
+            name = part.get_param("name", header="content-disposition")
+            fields[name] = payload.decode("utf-8")
+    return fields, files
+
+
+class JobService:
+    def __init__(
+        self,
+        work_dir: str,
+        workers: int = SERVICE_DEFAULT_WORKERS,
+        allowed_roots: Optional[List[str]] = None,
+        queue: Optional[JobQueue] = None,
+    ):
+        self.work_dir = work_dir
+        self.allowed_roots = [os.path.realpath(r) for r in allowed_roots or []]
+        self.queue = queue or get_job_queue()
+        self.scheduler = JobScheduler(self.queue, workers).start()
+        self._lock = threading.Lock()
+        os.makedirs(work_dir, exist_ok=True)
+
+    def pending_count(self) -> int:
+        return len(
+            self.queue.jobs(source=SERVICE_SOURCE, statuses=["queued", "running"])
+        )
+
+    def _check_path(self, path: str) -> str:
+        real = os.path.realpath(path)
+        if not any(
+            os.path.commonpath([real, root]) == root for root in self.allowed_roots
+        ):
+            raise ServiceError(
+                HTTPStatus.FORBIDDEN, f"{path} is outside the allowed folders"
+            )
+        if not os.path.isfile(real):
+            raise ServiceError(HTTPStatus.NOT_FOUND, f"{path} does not exist")
+        return real
+
+    def _check_inputs(self, inputs: List[str]) -> None:
+        if not inputs:
+            raise ServiceError(HTTPStatus.BAD_REQUEST, "No input files")
+        if len(inputs) > SERVICE_MAX_FILES_PER_JOB:
+            raise ServiceError(
+                HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                f"At most {SERVICE_MAX_FILES_PER_JOB} files per job",
+            )
+        pages = 0
+        for path in inputs:
+            if not is_valid_pdf(path):
+                raise ServiceError(
+                    HTTPStatus.BAD_REQUEST,
+                    f"{os.path.basename(path)} is not a valid PDF",
+                )
+            pages += get_pdf_page_count(path)
+        if pages > SERVICE_MAX_PAGES_PER_JOB:
+            raise ServiceError(
+                HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                f"Job has {pages} pages; the limit is {SERVICE_MAX_PAGES_PER_JOB}",
+            )
+
+    def submit(
+        self,
+        operation: str,
+        options: Dict,
+        paths: List[str] = (),
+        uploads: List[Tuple[str, bytes]] = (),
+        priority: int = QUEUE_PRIORITY_NORMAL,
+    ) -> QueuedJob:
+        if operation not in JOB_OPERATIONS:
+            raise ServiceError(
+                HTTPStatus.BAD_REQUEST,
+                f"operation must be one of {', '.join(JOB_OPERATIONS)}",
+            )
+        self.purge_expired()
+        job_dir = os.path.join(self.work_dir, uuid.uuid4().hex[:12])
+        input_dir = os.path.join(job_dir, "input")
+        with self._lock:
+            if self.pending_count() >= SERVICE_MAX_PENDING_JOBS:
+                raise ServiceError(
+                    HTTPStatus.SERVICE_UNAVAILABLE, "Job queue is full, retry later"
+                )
+            try:
+                os.makedirs(input_dir)
+                inputs = [self._check_path(p) for p in paths]
+                namer = OutputNamer(input_dir)
+                for filename, data in uploads:
+                    path = namer.reserve(os.path.basename(filename) or "upload.pdf")
+                    with open(path, "wb") as f:
+                        f.write(data)
+                    inputs.append(path)
+                self._check_inputs(inputs)
+                job_id = self.queue.submit(
+                    operation,
+                    inputs,
+                    os.path.join(job_dir, "output"),
+                    options,
+                    priority,
+                    SERVICE_SOURCE,
+                )
+            except Exception:
+                get_reaper().schedule(job_dir)
+                raise
+        self.scheduler.wake()
+        logger.info(f"Job {job_id}: {operation} on {len(inputs)} files")
+        return self.queue.get(job_id)
+
+    def get(self, job_id: str) -> QueuedJob:
+        job = self.queue.get(int(job_id)) if job_id.isdigit() else None
+        if job is None or job.source != SERVICE_SOURCE:
+            raise ServiceError(HTTPStatus.NOT_FOUND, f"Unknown job {job_id}")
+        return job
+
+    def list_jobs(self) -> List[Dict]:
+        return [public_job(job) for job in self.queue.jobs(source=SERVICE_SOURCE)]
+
+    def _discard(self, job: QueuedJob) -> None:
+        self.queue.delete(job.id)
+        get_reaper().schedule(os.path.dirname(job.output_dir))
+
+    def remove(self, job_id: str) -> None:
+        job = self.get(job_id)
+        if job.status == "running" or (
+            job.status == "queued" and not self.queue.cancel(job.id)
+        ):
+            raise ServiceError(HTTPStatus.CONFLICT, "Job is running")
+        self._discard(job)
+
+    def purge_expired(self) -> None:
+        cutoff = time.time() - SERVICE_JOB_RETENTION_SEC
+        for job in self.queue.jobs(
+            source=SERVICE_SOURCE, statuses=["done", "failed", "cancelled"]
+        ):
+            if job.finished and job.finished < cutoff:
+                self._discard(job)
+
+    def shutdown(self) -> None:
+        self.scheduler.stop()
+        get_reaper().wait(CLEANUP_SHUTDOWN_WAIT_SEC)
+
+
+class JobRequestHandler(BaseHTTPRequestHandler):
+    server_version = "PDFToolsService/1.0"
+
+    @property
+    def service(self) -> JobService:
+        return self.server.service
+
+    def log_message(self, format, *args) -> None:
+        logger.debug(f"{self.address_string()} {format % args}")
+
+    def _send_json(self, data, status: HTTPStatus = HTTPStatus.OK) -> None:
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _route(self) -> List[str]:
+        return [p for p in urlparse(self.path).path.split("/") if p]
+
+    def _handle(self, method) -> None:
+        try:
+            method()
+        except ServiceError as e:
+            self._send_json({"error": str(e)}, e.status)
+        except (JobError, ValueError) as e:
+            self._send_json({"error": str(e)}, HTTPStatus.BAD_REQUEST)
+        except Exception as e:
+            logger.exception("Request failed")
+            self._send_json({"error": str(e)}, HTTPStatus.INTERNAL_SERVER_ERROR)
+
+    def do_GET(self) -> None:
+        self._handle(self._get)
+
+    def do_POST(self) -> None:
+        self._handle(self._post)
+
+    def do_DELETE(self) -> None:
+        self._handle(self._delete)
+
+    def _get(self) -> None:
+        route = self._route()
+        if route == ["health"]:
+            self._send_json({"status": "ok", "pending": self.service.pending_count()})
+        elif route == ["jobs"]:
+            self._send_json(self.service.list_jobs())
+        elif len(route) == 2 and route[0] == "jobs":
+            self._send_json(public_job(self.service.get(route[1])))
+        elif len(route) == 3 and route[0] == "jobs" and route[2] == "result":
+            self._send_result(self.service.get(route[1]))
+        else:
+            raise ServiceError(HTTPStatus.NOT_FOUND, "Not found")
+
+    def _read_body(self) -> bytes:
+        length = int(self.headers.get("Content-Length", 0))
+        if length > SERVICE_MAX_UPLOAD_BYTES:
+            raise ServiceError(
+                HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                f"Uploads are limited to {SERVICE_MAX_UPLOAD_BYTES} bytes",
+            )
+        return self.rfile.read(length)
+
+    def _post(self) -> None:
+        if self._route() != ["jobs"]:
+            raise ServiceError(HTTPStatus.NOT_FOUND, "Not found")
+        content_type = self.headers.get("Content-Type", "")
+        body = self._read_body()
+        if content_type.startswith("multipart/form-data"):
+            fields, uploads = parse_multipart(content_type, body)
+            job = self.service.submit(
+                fields.get("operation", ""),
+                json.loads(fields.get("options") or "{}"),
+                uploads=uploads,
+                priority=int(fields.get("priority") or QUEUE_PRIORITY_NORMAL),
+            )
+        else:
+            request = json.loads(body or b"{}")
+            job = self.service.submit(
+                request.get("operation", ""),
+                request.get("options", {}),
+                paths=request.get("inputs", []),
+                priority=int(request.get("priority", QUEUE_PRIORITY_NORMAL)),
+            )
+        self._send_json(public_job(job), HTTPStatus.ACCEPTED)
+
+    def _delete(self) -> None:
+        route = self._route()
+        if len(route) != 2 or route[0] != "jobs":
+            raise ServiceError(HTTPStatus.NOT_FOUND, "Not found")
+        self.service.remove(route[1])
+        self._send_json({"id": route[1], "status": "removed"})
+
+    def _send_result(self, job: QueuedJob) -> None:
+        if job.status != "done":
+            raise ServiceError(HTTPStatus.CONFLICT, f"Job is {job.status}")
+        outputs = job.outputs
+        if len(outputs) == 1:
+            self.send_response(HTTPStatus.OK)
+            self.send_header("Content-Type", "application/pdf")
+            self.send_header("Content-Length", str(os.path.getsize(outputs[0])))
+            self.send_header(
+                "Content-Disposition",
+                f'attachment; filename="{os.path.basename(outputs[0])}"',
+            )
+            self.end_headers()
+            with open(outputs[0], "rb") as f:
+                shutil.copyfileobj(f, self.wfile, SERVICE_STREAM_CHUNK_BYTES)
+            return
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "application/zip")
+        self.send_header(
+            "Content-Disposition", f'attachment; filename="job_{job.id}.zip"'
+        )
+        self.end_headers()
+        with zipfile.ZipFile(self.wfile, "w", zipfile.ZIP_STORED) as archive:
+            for path in outputs:
+                with open(path, "rb") as src, archive.open(
+                    os.path.basename(path), "w"
+                ) as dest:
+                    shutil.copyfileobj(src, dest, SERVICE_STREAM_CHUNK_BYTES)
+        self.close_connection = True
+
+
+class JobServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], service: JobService):
+        super().__init__(address, JobRequestHandler)
+        self.service = service
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="PDF Master Suite job service")
+    parser.add_argument("--serve", action="store_true")
+    parser.add_argument("--host", default=SERVICE_DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=SERVICE_DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=SERVICE_DEFAULT_WORKERS)
+    parser.add_argument(
+        "--work-dir",
+        default=os.path.join(tempfile.gettempdir(), SERVICE_WORK_FOLDER),
+    )
+    parser.add_argument(
+        "--allow-path",
+        action="append",
+        default=[],
+        help="Folder whose files may be referenced by path",
+    )
+    parser.add_argument("--queue-db", help="Job queue database (shared by default)")
+    args = parser.parse_args(argv)
+    service = JobService(
+        args.work_dir,
+        args.workers,
+        args.allow_path,
+        JobQueue(args.queue_db) if args.queue_db else None,
+    )
+    server = JobServer((args.host, args.port), service)
+    logger.info(f"Serving on http://{args.host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,157 @@
+import os
+import sys
+import logging
+import threading
+import tracemalloc
+from functools import wraps
+from typing import List, NamedTuple, Optional
+from component.pdf_output import format_file_size
+from assets.config import *
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryReport(NamedTuple):
+    name: str
+    rss_start: Optional[int]
+    rss_peak: Optional[int]
+    python_peak: Optional[int]
+    top_sites: List[str]
+
+    @property
+    def rss_growth(self) -> Optional[int]:
+        if self.rss_start is None or self.rss_peak is None:
+            return None
+        return max(0, self.rss_peak - self.rss_start)
+
+    def describe(self) -> str:
+        parts = []
+        if self.rss_peak is not None:
+            parts.append(
+                f"peak RSS {format_file_size(self.rss_peak)} "
+                f"(+{format_file_size(self.rss_growth)})"
+            )
+        if self.python_peak is not None:
+            parts.append(f"peak Python heap {format_file_size(self.python_peak)}")
+        return f"{self.name}: " + (", ".join(parts) or "memory stats unavailable")
+
+
+def _windows_rss() -> Optional[int]:
+    import ctypes
+    from ctypes import wintypes
+
+    class ProcessMemoryCounters(ctypes.Structure):
+        _fields_ = [
+            ("cb", wintypes.DWORD),
+            ("PageFaultCount", wintypes.DWORD),
+            ("PeakWorkingSetSize", ctypes.c_size_t),
+            ("WorkingSetSize", ctypes.c_size_t),
+            ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+            ("PagefileUsage", ctypes.c_size_t),
+            ("PeakPagefileUsage", ctypes.c_size_t),
+        ]
+
+    counters = ProcessMemoryCounters()
+    counters.cb = ctypes.sizeof(counters)
+    process = ctypes.windll.kernel32.GetCurrentProcess()
+    if not ctypes.windll.psapi.GetProcessMemoryInfo(
+        process, ctypes.byref(counters), counters.cb
+    ):
+        return None
+    return counters.WorkingSetSize
+
+
+def current_rss() -> Optional[int]:
+    try:
+        if psutil:
+            return psutil.Process().memory_info().rss
+        if sys.platform == "win32":
+            return _windows_rss()
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def python_tracing_requested() -> bool:
+    return os.environ.get(MEMORY_ENV_VAR, "").strip() not in ("", "0")
+
+
+class MemoryTracker:
+    def __init__(self, name: str, trace_python: Optional[bool] = None):
+        self.name = name
+        if trace_python is None:
+            trace_python = python_tracing_requested()
+        self.trace_python = trace_python
+        self.report: Optional[MemoryReport] = None
+        self._rss_start = None
+        self._rss_peak = None
+        self._owns_tracemalloc = False
+        self._start_snapshot = None
+        self._stop = threading.Event()
+        self._sampler = None
+
+    def _sample(self) -> None:
+        while not self._stop.wait(MEMORY_SAMPLE_INTERVAL_SEC):
+            rss = current_rss()
+            if rss is not None:
+                self._rss_peak = max(self._rss_peak or 0, rss)
+
+    def __enter__(self) -> "MemoryTracker":
+        self._rss_start = current_rss()
+        self._rss_peak = self._rss_start
+        if self.trace_python and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracemalloc = True
+            self._start_snapshot = tracemalloc.take_snapshot()
+        if self._rss_start is not None:
+            self._sampler = threading.Thread(target=self._sample, daemon=True)
+            self._sampler.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._stop.set()
+        if self._sampler:
+            self._sampler.join()
+        rss = current_rss()
+        if rss is not None:
+            self._rss_peak = max(self._rss_peak or 0, rss)
+        python_peak = None
+        top_sites: List[str] = []
+        if self._owns_tracemalloc:
+            _, python_peak = tracemalloc.get_traced_memory()
+            snapshot = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+            stats = snapshot.compare_to(self._start_snapshot, "lineno")
+            top_sites = [
+                f"{stat.traceback[0].filename}:{stat.traceback[0].lineno} "
+                f"{format_file_size(max(0, stat.size_diff))}"
+                for stat in stats[:MEMORY_TOP_SITES]
+                if stat.size_diff > 0
+            ]
+        self.report = MemoryReport(
+            self.name, self._rss_start, self._rss_peak, python_peak, top_sites
+        )
+        logger.info(self.report.describe())
+        for site in top_sites:
+            logger.info(f"  {site}")
+
+
+def memory_tracked(name: str):
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with MemoryTracker(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,67 @@
+import os
+import threading
+from typing import Dict, Set, Tuple
+from assets.config import *
+
+
+def placeholder_path(output_path: str) -> str:
+    folder, filename = os.path.split(output_path)
+    return os.path.join(folder, f".{filename}{OUTPUT_TEMP_SUFFIX}")
+
+
+def _claimed_name(entry_name: str) -> str:
+    if entry_name.startswith(".") and entry_name.endswith(OUTPUT_TEMP_SUFFIX):
+        return entry_name[1 : -len(OUTPUT_TEMP_SUFFIX)]
+    return entry_name
+
+
+class OutputNamer:
+    def __init__(self, folder: str):
+        self.folder = folder
+        os.makedirs(folder, exist_ok=True)
+        with os.scandir(folder) as entries:
+            self._taken: Set[str] = {
+                os.path.normcase(_claimed_name(e.name)) for e in entries
+            }
+        self._next_counter: Dict[Tuple[str, str], int] = {}
+        self._lock = threading.Lock()
+
+    def _is_taken(self, filename: str) -> bool:
+        return os.path.normcase(filename) in self._taken
+
+    def _mark_taken(self, filename: str) -> None:
+        self._taken.add(os.path.normcase(filename))
+
+    def reserve(self, filename: str) -> str:
+        with self._lock:
+            if not self._is_taken(filename):
+                self._mark_taken(filename)
+                return os.path.join(self.folder, filename)
+            base, ext = os.path.splitext(filename)
+            counter = self._next_counter.get((base, ext), 1)
+            while self._is_taken(f"{base}({counter}){ext}"):
+                counter += 1
+            self._next_counter[(base, ext)] = counter + 1
+            candidate = f"{base}({counter}){ext}"
+            self._mark_taken(candidate)
+            return os.path.join(self.folder, candidate)
+
+    def claim(self, filename: str) -> str:
+        while True:
+            path = self.reserve(filename)
+            if os.path.exists(path):
+                continue
+            try:
+                fd = os.open(
+                    placeholder_path(path), os.O_CREAT | os.O_EXCL | os.O_WRONLY
+                )
+            except FileExistsError:
+                continue
+            os.close(fd)
+            return path
+
+    def release(self, path: str) -> None:
+        try:
+            os.remove(placeholder_path(path))
+        except OSError:
+            pass
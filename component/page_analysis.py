@@ -0,0 +1,279 @@
+import os
+import json
+import time
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+import fitz
+from component.pdf_output import file_sha256
+from component.document_cache import cached_document
+from component.tracing import traced
+from assets.config import *
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+logger = logging.getLogger(__name__)
+
+_file_digests: Dict[Tuple, str] = {}
+_cached_scores: Dict[str, List["PageScore"]] = {}
+
+
+class PageScore(NamedTuple):
+    page: int
+    ink: float
+    phash: int
+
+
+class PageAnalysis(NamedTuple):
+    path: str
+    scores: List[PageScore]
+    blank_pages: List[int]
+    duplicate_pages: Dict[int, int]
+    seconds: float
+    cached: bool
+
+    @property
+    def suggested_pages(self) -> List[int]:
+        return sorted(set(self.blank_pages) | set(self.duplicate_pages))
+
+    def describe(self) -> str:
+        source = "cached" if self.cached else f"analyzed in {self.seconds:.2f}s"
+        return (
+            f"{len(self.blank_pages)} blank and {len(self.duplicate_pages)} "
+            f"duplicate pages ({source})"
+        )
+
+
+def analysis_available() -> bool:
+    return np is not None
+
+
+def _dct_matrix(size: int):
+    k = np.arange(size)[:, None]
+    i = np.arange(size)[None, :]
+    matrix = np.cos(np.pi * (2 * i + 1) * k / (2 * size)) * np.sqrt(2 / size)
+    matrix[0] /= np.sqrt(2)
+    return matrix
+
+
+def _area_resize(image, size: int):
+    rows = np.linspace(0, image.shape[0], size + 1).astype(int)
+    cols = np.linspace(0, image.shape[1], size + 1).astype(int)
+    summed = np.add.reduceat(
+        np.add.reduceat(image, rows[:-1], axis=0), cols[:-1], axis=1
+    )
+    return summed / np.outer(np.diff(rows), np.diff(cols))
+
+
+def grayscale_page(page: fitz.Page):
+    shortest = max(1.0, min(page.rect.width, page.rect.height))
+    zoom = max(ANALYSIS_RENDER_DPI / 72, ANALYSIS_MIN_RENDER_PX / shortest)
+    pix = page.get_pixmap(
+        matrix=fitz.Matrix(zoom, zoom), colorspace=fitz.csGRAY, alpha=False
+    )
+    image = np.frombuffer(pix.samples, dtype=np.uint8)
+    return image.reshape(pix.height, pix.stride)[:, : pix.width]
+
+
+def score_image(image, dct) -> Tuple[float, int]:
+    height, width = image.shape
+    margin_y = int(height * ANALYSIS_MARGIN_RATIO)
+    margin_x = int(width * ANALYSIS_MARGIN_RATIO)
+    image = image[margin_y : height - margin_y, margin_x : width - margin_x]
+    image = image.astype(np.float32)
+    paper = np.median(image)
+    ink = np.count_nonzero(image < paper - ANALYSIS_INK_CONTRAST) / image.size
+    coeffs = dct @ _area_resize(image, ANALYSIS_HASH_SIZE) @ dct.T
+    low = coeffs[:ANALYSIS_HASH_LOW_FREQ, :ANALYSIS_HASH_LOW_FREQ].ravel()
+    bits = np.packbits(low > np.median(low[1:]))
+    return float(ink), int.from_bytes(bits.tobytes(), "big")
+
+
+def _score_pages(doc: fitz.Document, start: int, end: int) -> List[PageScore]:
+    dct = _dct_matrix(ANALYSIS_HASH_SIZE)
+    scores = []
+    for number in range(start, end):
+        try:
+            ink, phash = score_image(grayscale_page(doc[number]), dct)
+        except Exception as e:
+            logger.warning(f"Skipping page {number + 1} in analysis: {e}")
+            ink, phash = -1.0, 0
+        scores.append(PageScore(number, ink, phash))
+    return scores
+
+
+def score_page_range(task: Tuple[str, int, int]) -> List[PageScore]:
+    path, start, end = task
+    return _score_pages(cached_document(path), start, end)
+
+
+def find_blank_pages(ink) -> List[int]:
+    return np.flatnonzero((ink >= 0) & (ink < ANALYSIS_BLANK_INK_RATIO)).tolist()
+
+
+def _hash_matrix(scores: List[PageScore]):
+    size = ANALYSIS_HASH_LOW_FREQ * ANALYSIS_HASH_LOW_FREQ // 8
+    packed = b"".join(score.phash.to_bytes(size, "big") for score in scores)
+    return np.frombuffer(packed, dtype=np.uint8).reshape(len(scores), size)
+
+
+def find_duplicate_pages(ink, hash_bytes) -> Dict[int, int]:
+    total = len(hash_bytes)
+    candidate = ink >= ANALYSIS_BLANK_INK_RATIO
+    popcount = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+    columns = np.arange(total)
+    duplicates: Dict[int, int] = {}
+    for start in range(0, total, ANALYSIS_COMPARE_BLOCK):
+        rows = columns[start : start + ANALYSIS_COMPARE_BLOCK]
+        distance = popcount[hash_bytes[rows, None, :] ^ hash_bytes[None, :, :]].sum(
+            axis=2, dtype=np.int32
+        )
+        row_ink, col_ink = ink[rows, None], ink[None, :]
+        match = (
+            (distance <= ANALYSIS_DUPLICATE_DISTANCE)
+            & (
+                np.abs(row_ink - col_ink)
+                <= ANALYSIS_DUPLICATE_INK_DELTA * np.maximum(row_ink, col_ink)
+            )
+            & (columns[None, :] < rows[:, None])
+            & candidate[None, :]
+            & candidate[rows, None]
+        )
+        found = match.any(axis=1)
+        for page, original in zip(rows[found], match[found].argmax(axis=1)):
+            duplicates[int(page)] = duplicates.get(int(original), int(original))
+    return duplicates
+
+
+def _cache_params() -> Dict:
+    return {
+        "version": ANALYSIS_CACHE_VERSION,
+        "dpi": ANALYSIS_RENDER_DPI,
+        "margin": ANALYSIS_MARGIN_RATIO,
+        "contrast": ANALYSIS_INK_CONTRAST,
+        "hash_size": ANALYSIS_HASH_SIZE,
+        "low_freq": ANALYSIS_HASH_LOW_FREQ,
+    }
+
+
+def analysis_cache_path(digest: str) -> str:
+    return os.path.join(
+        os.path.expanduser("~"),
+        QUEUE_DEFAULT_FOLDER,
+        ANALYSIS_CACHE_FOLDER,
+        f"{digest}.json",
+    )
+
+
+def _file_digest(path: str) -> str:
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+    digest = _file_digests.get(key)
+    if digest is None:
+        digest = _file_digests[key] = file_sha256(path)
+    return digest
+
+
+def _load_scores(digest: str) -> Optional[List[PageScore]]:
+    scores = _cached_scores.get(digest)
+    if scores is not None:
+        return scores
+    try:
+        with open(analysis_cache_path(digest), "r", encoding="utf-8") as f:
+            raw = json.load(f)
+        if raw.get("params") != _cache_params():
+            return None
+        scores = [PageScore(*entry) for entry in raw["pages"]]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    _cached_scores[digest] = scores
+    return scores
+
+
+def _store_scores(digest: str, scores: List[PageScore]) -> None:
+    _cached_scores[digest] = scores
+    path = analysis_cache_path(digest)
+    temp_path = f"{path}.{os.getpid()}{OUTPUT_TEMP_SUFFIX}"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"params": _cache_params(), "pages": scores}, f)
+        os.replace(temp_path, path)
+    except OSError as e:
+        logger.warning(f"Could not cache page analysis: {e}")
+
+
+def _scored_chunks(
+    doc: fitz.Document, tasks: List[Tuple[str, int, int]], workers: int
+) -> Iterator[List[PageScore]]:
+    if workers <= 1:
+        for _, start, end in tasks:
+            yield _score_pages(doc, start, end)
+        return
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context(WORKER_START_METHOD)
+    ) as pool:
+        futures = [pool.submit(score_page_range, task) for task in tasks]
+        try:
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            for pending in futures:
+                pending.cancel()
+
+
+def _score_document(
+    path: str,
+    max_workers: Optional[int],
+    progress: Optional[Callable[[int, int], bool]],
+) -> List[PageScore]:
+    doc = fitz.open(path)
+    try:
+        total = doc.page_count
+        tasks = [
+            (path, start, min(start + ANALYSIS_CHUNK_PAGES, total))
+            for start in range(0, total, ANALYSIS_CHUNK_PAGES)
+        ]
+        workers = max_workers or min(len(tasks), os.cpu_count() or 1)
+        scores: List[PageScore] = []
+        chunks = _scored_chunks(doc, tasks, workers)
+        for done, chunk in enumerate(chunks, start=1):
+            scores.extend(chunk)
+            if progress and progress(done, len(tasks)) is False:
+                chunks.close()
+                raise InterruptedError("Page analysis cancelled")
+    finally:
+        doc.close()
+    return sorted(scores)
+
+
+@traced("analyze.pages")
+def analyze_pages(
+    path: str,
+    max_workers: Optional[int] = None,
+    progress: Optional[Callable[[int, int], bool]] = None,
+) -> PageAnalysis:
+    if np is None:
+        raise RuntimeError("Page analysis requires numpy")
+    started = time.perf_counter()
+    digest = _file_digest(path)
+    scores = _load_scores(digest)
+    cached = scores is not None
+    if not cached:
+        scores = _score_document(path, max_workers, progress)
+        _store_scores(digest, scores)
+    ink = np.array([score.ink for score in scores], dtype=np.float32)
+    analysis = PageAnalysis(
+        path,
+        scores,
+        find_blank_pages(ink),
+        find_duplicate_pages(ink, _hash_matrix(scores)),
+        time.perf_counter() - started,
+        cached,
+    )
+    logger.info(f"{os.path.basename(path)}: {analysis.describe()}")
+    return analysis
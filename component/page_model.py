@@ -0,0 +1,39 @@
+import itertools
+from typing import List
+
+_record_keys = itertools.count(1)
+
+
+class DocumentSource:
+    __slots__ = ("path", "encrypted")
+
+    def __init__(self, path: str, encrypted: bool = False):
+        self.path = path
+        self.encrypted = encrypted
+
+
+class PageRecord:
+    __slots__ = ("key", "source", "page", "rotation")
+
+    def __init__(self, source: DocumentSource, page: int = 0, rotation: int = 0):
+        self.key = next(_record_keys)
+        self.source = source
+        self.page = page
+        self.rotation = rotation
+
+    @property
+    def path(self) -> str:
+        return self.source.path
+
+    @property
+    def encrypted(self) -> bool:
+        return self.source.encrypted
+
+
+def build_file_record(path: str, encrypted: bool = False) -> PageRecord:
+    return PageRecord(DocumentSource(path, encrypted))
+
+
+def build_document_pages(path: str, total_pages: int) -> List[PageRecord]:
+    source = DocumentSource(path)
+    return [PageRecord(source, page) for page in range(total_pages)]
@@ -0,0 +1,123 @@
+from typing import Iterable, List, Optional, Tuple
+
+Interval = Tuple[int, int]
+
+
+def _split_parts(text: str) -> List[str]:
+    return [p.strip() for p in text.split(",") if p.strip()]
+
+
+def _part_bounds(part: str) -> Optional[Interval]:
+    if "-" not in part:
+        value = int(part)
+        return value, value
+    if part.startswith("-") or part.endswith("-"):
+        return None
+    start_str, end_str = part.split("-", 1)
+    return int(start_str), int(end_str)
+
+
+def merge_intervals(intervals: Iterable[Interval]) -> List[Interval]:
+    merged: List[Interval] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1] + 1:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def parse_page_intervals(text: str, total_pages: int) -> List[Interval]:
+    if not text:
+        return []
+    intervals: List[Interval] = []
+    try:
+        for part in _split_parts(text):
+            if "-" in part:
+                while "--" in part:
+                    part = part.replace("--", "-")
+                if part.count("-") != 1:
+                    continue
+            bounds = _part_bounds(part)
+            if bounds is None:
+                continue
+            start, end = bounds
+            if 1 <= start <= end <= total_pages:
+                intervals.append((start - 1, end - 1))
+    except ValueError:
+        return []
+    return merge_intervals(intervals)
+
+
+def has_invalid_parts(text: str, total_pages: int) -> bool:
+    for part in _split_parts(text):
+        try:
+            bounds = _part_bounds(part)
+        except ValueError:
+            return True
+        if bounds is None:
+            return True
+        start, end = bounds
+        if start < 1 or end < 1 or start > end or end > total_pages:
+            return True
+    return False
+
+
+def format_intervals(intervals: Iterable[Interval]) -> str:
+    parts = [f"{s + 1}-{e + 1}" if s != e else str(s + 1) for s, e in intervals]
+    return ",".join(parts)
+
+
+def intervals_from_pages(pages: Iterable[int]) -> List[Interval]:
+    return merge_intervals((p, p) for p in pages)
+
+
+def expand_intervals(intervals: Iterable[Interval]) -> List[int]:
+    return [p for start, end in intervals for p in range(start, end + 1)]
+
+
+def count_pages(intervals: Iterable[Interval]) -> int:
+    return sum(end - start + 1 for start, end in intervals)
+
+
+def union_intervals(a: Iterable[Interval], b: Iterable[Interval]) -> List[Interval]:
+    return merge_intervals(list(a) + list(b))
+
+
+def intersect_intervals(a: List[Interval], b: List[Interval]) -> List[Interval]:
+    result: List[Interval] = []
+    i = j = 0
+    while i < len(a) and j < len(b):
+        start = max(a[i][0], b[j][0])
+        end = min(a[i][1], b[j][1])
+        if start <= end:
+            result.append((start, end))
+        if a[i][1] < b[j][1]:
+            i += 1
+        else:
+            j += 1
+    return result
+
+
+def complement_intervals(intervals: List[Interval], total_pages: int) -> List[Interval]:
+    result: List[Interval] = []
+    cursor = 0
+    for start, end in intervals:
+        if start > cursor:
+            result.append((cursor, start - 1))
+        cursor = max(cursor, end + 1)
+    if cursor < total_pages:
+        result.append((cursor, total_pages - 1))
+    return result
+
+
+def parity_intervals(intervals: Iterable[Interval], parity: str) -> List[range]:
+    if parity not in ("odd", "even"):
+        return []
+    offset = 0 if parity == "odd" else 1
+    return [
+        range(start + (start - offset) % 2, end + 1, 2)
+        for start, end in intervals
+        if start + (start - offset) % 2 <= end
+    ]
@@ -0,0 +1,81 @@
+from typing import Iterable, Iterator, List, Tuple
+from PyQt6.QtCore import QObject, pyqtSignal
+from component.page_ranges import intersect_intervals, merge_intervals, parity_intervals
+
+
+def _span_mask(start: int, end: int) -> int:
+    return ((1 << (end - start + 1)) - 1) << start
+
+
+def _stride_mask(pages: range) -> int:
+    return ((1 << (2 * len(pages))) - 1) // 3 << pages.start
+
+
+class PageSelection(QObject):
+    changed = pyqtSignal(list)
+
+    def __init__(self, total_pages: int, parent=None):
+        super().__init__(parent)
+        self.total_pages = total_pages
+        self._full_mask = (1 << total_pages) - 1
+        self._bits = 0
+
+    @property
+    def bits(self) -> int:
+        return self._bits
+
+    def is_marked(self, index: int) -> bool:
+        return bool(self._bits >> index & 1)
+
+    def count(self) -> int:
+        return bin(self._bits).count("1")
+
+    def runs(self) -> Iterator[Tuple[int, int]]:
+        bits = self._bits
+        while bits:
+            run = bits & ~(bits + (bits & -bits))
+            start = (run & -run).bit_length() - 1
+            yield start, run.bit_length() - 1
+            bits ^= run
+
+    def indices(self) -> List[int]:
+        return [i for start, end in self.runs() for i in range(start, end + 1)]
+
+    def parity_mask(self, parity: str) -> int:
+        mask = 0
+        for pages in parity_intervals([(0, self.total_pages - 1)], parity):
+            mask |= _stride_mask(pages)
+        return mask
+
+    def mask_from_ranges(self, ranges: Iterable[Tuple[int, int]]) -> int:
+        mask = 0
+        bounds = [(0, self.total_pages - 1)]
+        for start, end in intersect_intervals(merge_intervals(ranges), bounds):
+            mask |= _span_mask(start, end)
+        return mask
+
+    def set_mask(self, mask: int) -> List[int]:
+        mask &= self._full_mask
+        flipped = self._bits ^ mask
+        if not flipped:
+            return []
+        self._bits = mask
+        changed = []
+        while flipped:
+            low = flipped & -flipped
+            changed.append(low.bit_length() - 1)
+            flipped ^= low
+        self.changed.emit(changed)
+        return changed
+
+    def toggle(self, index: int) -> List[int]:
+        return self.set_mask(self._bits ^ (1 << index))
+
+    def toggle_parity(self, parity: str) -> List[int]:
+        mask = self.parity_mask(parity)
+        if self._bits & mask == mask:
+            return self.set_mask(self._bits & ~mask)
+        return self.set_mask(self._bits | mask)
+
+    def clear(self) -> List[int]:
+        return self.set_mask(0)
@@ -0,0 +1,166 @@
+import io
+import os
+import time
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+import fitz
+from PIL import Image
+from component.document_cache import cached_document
+from component.tracing import traced
+from component.pdf_output import atomic_output, mupdf_save_options
+from assets.config import *
+
+logger = logging.getLogger(__name__)
+
+IMAGE_FORMATS = {"jpeg": "JPEG", "jpx": "JPEG2000"}
+
+
+class CompressionSettings(NamedTuple):
+    target_dpi: int = COMPRESS_DEFAULT_DPI
+    quality: int = COMPRESS_DEFAULT_QUALITY
+    image_format: str = "jpeg"
+
+
+class CompressionReport(NamedTuple):
+    path: str
+    images_total: int
+    images_replaced: int
+    bytes_in: int
+    bytes_out: int
+    seconds: float
+
+    def describe(self) -> str:
+        saved = self.bytes_in - self.bytes_out
+        percent = (saved / self.bytes_in * 100) if self.bytes_in else 0
+        return (
+            f"Recompressed {self.images_replaced} of {self.images_total} images, "
+            f"saved {percent:.0f}% in {self.seconds:.2f}s"
+        )
+
+
+class ImageTask(NamedTuple):
+    src_path: str
+    xref: int
+    scale: float
+    quality: int
+    image_format: str
+    original_size: int
+
+
+def recompress_image(task: ImageTask) -> Tuple[int, Optional[bytes]]:
+    try:
+        doc = cached_document(task.src_path)
+        pix = fitz.Pixmap(doc, task.xref)
+        if pix.alpha:
+            return task.xref, None
+        if pix.n > 3:
+            pix = fitz.Pixmap(fitz.csRGB, pix)
+        mode = "L" if pix.n == 1 else "RGB"
+        image = Image.frombytes(mode, (pix.width, pix.height), pix.samples)
+        if task.scale < 1:
+            size = (
+                max(1, int(pix.width * task.scale)),
+                max(1, int(pix.height * task.scale)),
+            )
+            image = image.resize(size, Image.Resampling.LANCZOS)
+        buffer = io.BytesIO()
+        fmt = IMAGE_FORMATS.get(task.image_format, "JPEG")
+        if fmt == "JPEG2000":
+            image.save(
+                buffer, fmt, quality_mode="dB", quality_layers=[task.quality / 2]
+            )
+        else:
+            image.save(buffer, fmt, quality=task.quality, optimize=True)
+        data = buffer.getvalue()
+        if len(data) >= task.original_size:
+            return task.xref, None
+        return task.xref, data
+    except Exception as e:
+        logger.warning(f"Skipping image {task.xref}: {e}")
+        return task.xref, None
+
+
+def plan_image_tasks(
+    doc: fitz.Document, src_path: str, settings: CompressionSettings
+) -> Tuple[int, Dict[int, int], List[ImageTask]]:
+    images: Dict[int, tuple] = {}
+    widest: Dict[int, float] = {}
+    host_pages: Dict[int, int] = {}
+    for page in doc:
+        for item in page.get_images(full=True):
+            xref = item[0]
+            images.setdefault(xref, item)
+            host_pages.setdefault(xref, page.number)
+            for rect in page.get_image_rects(xref):
+                widest[xref] = max(widest.get(xref, 0.0), rect.width / 72)
+    tasks: List[ImageTask] = []
+    for xref, item in images.items():
+        if item[1]:
+            continue
+        original_size = len(doc.xref_stream_raw(xref) or b"")
+        if original_size < COMPRESS_MIN_IMAGE_BYTES:
+            continue
+        scale = 1.0
+        width_in = widest.get(xref, 0.0)
+        if width_in > 0 and item[2] / width_in > settings.target_dpi:
+            scale = settings.target_dpi / (item[2] / width_in)
+        tasks.append(
+            ImageTask(
+                src_path,
+                xref,
+                scale,
+                settings.quality,
+                settings.image_format,
+                original_size,
+            )
+        )
+    return len(images), host_pages, tasks
+
+
+@traced("compress")
+def compress_pdf(
+    src_path: str,
+    output_path: str,
+    settings: CompressionSettings = CompressionSettings(),
+    max_workers: Optional[int] = None,
+    progress: Optional[Callable[[int, int], bool]] = None,
+) -> CompressionReport:
+    started = time.perf_counter()
+    bytes_in = os.path.getsize(src_path)
+    doc = fitz.open(src_path)
+    try:
+        images_total, host_pages, tasks = plan_image_tasks(doc, src_path, settings)
+        results: Dict[int, bytes] = {}
+        if tasks:
+            workers = max_workers or min(len(tasks), os.cpu_count() or 1)
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context(WORKER_START_METHOD),
+            ) as pool:
+                futures = [pool.submit(recompress_image, task) for task in tasks]
+                for done, future in enumerate(as_completed(futures), start=1):
+                    xref, data = future.result()
+                    if data is not None:
+                        results[xref] = data
+                    if progress and progress(done, len(tasks)) is False:
+                        for pending in futures:
+                            pending.cancel()
+                        raise InterruptedError("Compression cancelled")
+        for xref, data in results.items():
+            doc[host_pages[xref]].replace_image(xref, stream=data)
+        with atomic_output(output_path, bytes_in) as temp_path:
+            doc.save(temp_path, **mupdf_save_options("compact"))
+    finally:
+        doc.close()
+    report = CompressionReport(
+        output_path,
+        images_total,
+        len(results),
+        bytes_in,
+        os.path.getsize(output_path),
+        time.perf_counter() - started,
+    )
+    logger.info(f"{os.path.basename(output_path)}: {report.describe()}")
+    return report
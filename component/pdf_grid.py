@@ -1,9 +1,17 @@
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QGridLayout, QScrollArea
-from PyQt6.QtCore import Qt, pyqtSignal
+import time
+import logging
+from bisect import bisect_right
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QGridLayout, QLabel, QScrollArea
+from PyQt6.QtCore import Qt, QPoint, QRect, QTimer, pyqtSignal
 from component.file_card import FileCard
+from component.render_pool import RenderTask, get_render_pool
 from component.toolsForPDF import calculate_rotation
+from component.memory_stats import memory_tracked
+from component.tracing import traced
 from assets.config import *
 
+logger = logging.getLogger(__name__)
+
 
 class PDFGrid(QWidget):
     items_changed = pyqtSignal()
@@ -15,6 +23,10 @@ class PDFGrid(QWidget):
         on_delete_callback=None,
         click_to_toggle: bool = False,
         drag_enabled: bool = True,
+        progressive_thumbnails: bool = False,
+        virtualized: bool = False,
+        group_title=None,
+        on_card_bound=None,
     ):
         super().__init__()
         self.items = initial_items if initial_items else []
@@ -22,9 +34,21 @@ class PDFGrid(QWidget):
         self.dragged_item_data = None
         self.on_delete_callback = on_delete_callback
         self.click_to_toggle = click_to_toggle
-        self.drag_enabled = drag_enabled
+        self.drag_enabled = drag_enabled and not virtualized
+        self.progressive_thumbnails = progressive_thumbnails
+        self.virtualized = virtualized
+        self.group_title = group_title
+        self.on_card_bound = on_card_bound
         self.setAcceptDrops(self.drag_enabled)
         self.active_cards = {}
+        self._spare_cards = []
+        self._rows = []
+        self._row_tops = []
+        self._headers = {}
+        self._scroll_value = 0
+        self._scroll_time = time.monotonic()
+        self._scroll_direction = 0
+        self._scroll_velocity = 0.0
         self._init_ui()
 
     def _init_ui(self):
@@ -44,6 +68,79 @@ class PDFGrid(QWidget):
         )
         self.scroll.setWidget(self.grid_container)
         main_layout.addWidget(self.scroll)
+        self._refine_timer = QTimer(self)
+        self._refine_timer.setSingleShot(True)
+        self._refine_timer.timeout.connect(self._refine_visible_cards)
+        if self.virtualized:
+            self.grid_layout.setEnabled(False)
+            self.scroll.verticalScrollBar().valueChanged.connect(self._sync_visible)
+        if self.progressive_thumbnails:
+            self.scroll.verticalScrollBar().valueChanged.connect(self._schedule_refine)
+            get_render_pool().rendered.connect(self._on_thumbnail_rendered)
+        if self.virtualized and self.progressive_thumbnails:
+            self.scroll.verticalScrollBar().valueChanged.connect(self._track_scroll)
+
+    def _schedule_refine(self, *args):
+        self._refine_timer.start(THUMBNAIL_REFINE_IDLE_MS)
+
+    def _refine_visible_cards(self):
+        viewport = self.scroll.viewport()
+        visible_rect = viewport.rect()
+        pool = get_render_pool()
+        for card in self.active_cards.values():
+            if not card.needs_refine or not card.isVisible():
+                continue
+            card_rect = QRect(card.mapTo(viewport, QPoint(0, 0)), card.size())
+            if visible_rect.intersects(card_rect):
+                pool.request(RenderTask(card.file_path, card.page_num))
+
+    def _track_scroll(self, value):
+        now = time.monotonic()
+        delta = value - self._scroll_value
+        elapsed = max(now - self._scroll_time, 1e-3)
+        self._scroll_value, self._scroll_time = value, now
+        if not delta:
+            return
+        direction = 1 if delta > 0 else -1
+        pool = get_render_pool()
+        if direction != self._scroll_direction:
+            pool.cancel_prefetch()
+            self._scroll_direction = direction
+            self._scroll_velocity = 0.0
+        speed = abs(delta) / elapsed
+        self._scroll_velocity += THUMBNAIL_SCROLL_VELOCITY_SMOOTHING * (
+            speed - self._scroll_velocity
+        )
+        pool.prefetch(self._prefetch_tasks(value))
+
+    def _prefetch_tasks(self, scroll_top):
+        height = self.scroll.viewport().height()
+        distance = min(
+            max(self._scroll_velocity * THUMBNAIL_PREFETCH_LOOKAHEAD_SEC, height),
+            height * THUMBNAIL_PREFETCH_SCREENS,
+        )
+        if self._scroll_direction > 0:
+            start = scroll_top + height + GRID_VIRTUAL_OVERSCAN_PX
+            end = start + distance
+        else:
+            end = scroll_top - GRID_VIRTUAL_OVERSCAN_PX
+            start = end - distance
+        first = max(0, bisect_right(self._row_tops, start) - 1)
+        last = bisect_right(self._row_tops, end)
+        rows = self._rows[first:last]
+        if self._scroll_direction < 0:
+            rows = rows[::-1]
+        return [
+            RenderTask(self.items[i].path, self.items[i].page)
+            for _, _, row_start, row_end, _ in rows
+            for i in range(row_start, row_end)
+            if not self.items[i].encrypted
+        ]
+
+    def _on_thumbnail_rendered(self, task):
+        for card in self.active_cards.values():
+            if card.needs_refine and (card.file_path, card.page_num) == task[:2]:
+                card.refine_thumbnail()
 
     def showEvent(self, event):
         super().showEvent(event)
@@ -56,6 +153,7 @@ class PDFGrid(QWidget):
     def get_items(self):
         return self.items
 
+    @memory_tracked("thumbnails.batch")
     def add_items_batch(self, new_items_list):
         if self.max_items is not None:
             space_left = self.max_items - len(self.items)
@@ -82,13 +180,18 @@ class PDFGrid(QWidget):
     def remove_item_by_data(self, item_data):
         if item_data in self.items:
             self.items.remove(item_data)
-            item_id = id(item_data)
-            if item_id in self.active_cards:
-                card = self.active_cards.pop(item_id)
+            if item_data.key in self.active_cards:
+                card = self.active_cards.pop(item_data.key)
                 card.deleteLater()
             self.refresh_grid_visuals()
             self.items_changed.emit()
 
+    def remove_items_batch(self, items_to_remove):
+        keys = {item.key for item in items_to_remove}
+        self.items[:] = [item for item in self.items if item.key not in keys]
+        self.refresh_grid_visuals()
+        self.items_changed.emit()
+
     def handle_delete_action(self, item_data):
         if self.on_delete_callback:
             self.on_delete_callback(item_data)
@@ -98,33 +201,45 @@ class PDFGrid(QWidget):
     def update_rotation(self, item_data):
         if item_data in self.items:
             try:
-                item_data["rotation"] = calculate_rotation(item_data["rotation"])
-                card = self.active_cards.get(id(item_data))
+                item_data.rotation = calculate_rotation(item_data.rotation)
+                card = self.active_cards.get(item_data.key)
                 if card:
                     card.update_content(item_data)
             except Exception as e:
-                print(f"Error updating rotation: {e}")
+                logger.error(f"Error updating rotation: {e}")
 
-    def refresh_grid_visuals(self, full_reload=False):
+    def _columns(self):
         available_width = self.scroll.viewport().width()
         if available_width < 400:
             available_width = GRID_MIN_FALLBACK_WIDTH
         available_width -= GRID_CONTAINER_PADDING
         card_total_width = FILE_CARD_WIDTH + GRID_CARD_SPACING
-        columns = max(GRID_MIN_COLUMNS, available_width // card_total_width)
+        return max(GRID_MIN_COLUMNS, available_width // card_total_width)
+
+    @traced("grid.relayout")
+    def refresh_grid_visuals(self, full_reload=False):
+        if self.virtualized:
+            self._compute_rows()
+            self._sync_visible()
+            if self.progressive_thumbnails:
+                self._schedule_refine()
+            return
+        columns = self._columns()
         while self.grid_layout.count():
             item = self.grid_layout.takeAt(0)
             widget = item.widget()
             if widget:
                 widget.setParent(None)
-        current_active_ids = set()
+        current_active_keys = set()
         for i, item_data in enumerate(self.items):
-            item_id = id(item_data)
-            current_active_ids.add(item_id)
-            card = self.active_cards.get(item_id)
+            current_active_keys.add(item_data.key)
+            card = self.active_cards.get(item_data.key)
             if not card:
                 card = FileCard(
-                    item_data, index=i + 1, click_to_toggle=self.click_to_toggle
+                    item_data,
+                    index=i + 1,
+                    click_to_toggle=self.click_to_toggle,
+                    progressive=self.progressive_thumbnails,
                 )
                 card.delete_requested.connect(
                     lambda d=item_data: self.handle_delete_action(d)
@@ -132,26 +247,147 @@ class PDFGrid(QWidget):
                 card.rotate_requested.connect(
                     lambda d=item_data: self.update_rotation(d)
                 )
-                self.active_cards[item_id] = card
+                self.active_cards[item_data.key] = card
             else:
                 card.set_number(i + 1)
-                if self.dragged_item_data and item_data == self.dragged_item_data:
+                if item_data is self.dragged_item_data:
                     card.set_placeholder(True)
                 else:
                     card.set_placeholder(False)
             row = i // columns
             col = i % columns
             self.grid_layout.addWidget(card, row, col)
-        ids_to_remove = []
-        for item_id, card in self.active_cards.items():
-            if item_id not in current_active_ids:
+        keys_to_remove = []
+        for key, card in self.active_cards.items():
+            if key not in current_active_keys:
                 card.deleteLater()
-                ids_to_remove.append(item_id)
-        for item_id in ids_to_remove:
-            del self.active_cards[item_id]
+                keys_to_remove.append(key)
+        for key in keys_to_remove:
+            del self.active_cards[key]
+        if self.progressive_thumbnails:
+            self._schedule_refine()
+
+    def _compute_rows(self):
+        columns = self._columns()
+        margin = GRID_CONTAINER_PADDING // 2
+        self._rows = []
+        for label in self._headers.values():
+            label.deleteLater()
+        self._headers = {}
+        y = margin
+        start = 0
+        while start < len(self.items):
+            end = start if self.group_title else len(self.items)
+            while end < len(self.items) and (
+                self.items[end].source is self.items[start].source
+            ):
+                end += 1
+            if self.group_title:
+                self._rows.append((y, GRID_GROUP_HEADER_HEIGHT, start, start, start))
+                y += GRID_GROUP_HEADER_HEIGHT + GRID_CARD_SPACING
+            for row_start in range(start, end, columns):
+                row_end = min(row_start + columns, end)
+                self._rows.append((y, FILE_CARD_HEIGHT, row_start, row_end, start))
+                y += FILE_CARD_HEIGHT + GRID_CARD_SPACING
+            start = end
+        self._row_tops = [row[0] for row in self._rows]
+        self.grid_container.setFixedHeight(y - GRID_CARD_SPACING + margin)
+
+    def _bind_card(self, item_data):
+        if self.progressive_thumbnails and not item_data.encrypted:
+            get_render_pool().record_shown(RenderTask(item_data.path, item_data.page))
+        if self._spare_cards:
+            card = self._spare_cards.pop()
+            card.set_overlay("", visible=False)
+            card.update_content(item_data)
+        else:
+            card = FileCard(
+                item_data,
+                click_to_toggle=self.click_to_toggle,
+                progressive=self.progressive_thumbnails,
+            )
+            card.setParent(self.grid_container)
+            card.delete_requested.connect(self.handle_delete_action)
+            card.rotate_requested.connect(self.update_rotation)
+        if self.on_card_bound:
+            self.on_card_bound(card, item_data)
+        return card
+
+    def _header_label(self, group_start):
+        label = self._headers.get(group_start)
+        if label is None:
+            label = QLabel(self.grid_container)
+            label.setObjectName("GridGroupHeader")
+            self._headers[group_start] = label
+        label.setText(self.group_title(self.items[group_start]))
+        return label
+
+    def _sync_visible(self, *args):
+        if not self.virtualized:
+            return
+        scroll_top = self.scroll.verticalScrollBar().value()
+        top = scroll_top - GRID_VIRTUAL_OVERSCAN_PX
+        bottom = scroll_top + self.scroll.viewport().height() + GRID_VIRTUAL_OVERSCAN_PX
+        margin = GRID_CONTAINER_PADDING // 2
+        wanted = {}
+        headers = {}
+        first = max(0, bisect_right(self._row_tops, top) - 1)
+        for y, height, row_start, row_end, group_start in self._rows[first:]:
+            if y >= bottom:
+                break
+            if y + height <= top:
+                continue
+            if row_start == row_end:
+                headers[group_start] = y
+            for i in range(row_start, row_end):
+                x = margin + (i - row_start) * (FILE_CARD_WIDTH + GRID_CARD_SPACING)
+                wanted[self.items[i].key] = (i, x, y, group_start)
+        for key in [k for k in self.active_cards if k not in wanted]:
+            card = self.active_cards.pop(key)
+            card.hide()
+            self._spare_cards.append(card)
+        for key, (i, x, y, group_start) in wanted.items():
+            card = self.active_cards.get(key)
+            if card is None:
+                card = self._bind_card(self.items[i])
+                self.active_cards[key] = card
+            card.set_number(i - group_start + 1)
+            card.move(x, y)
+            card.show()
+        for group_start, label in self._headers.items():
+            label.setVisible(group_start in headers)
+        for group_start, y in headers.items():
+            label = self._header_label(group_start)
+            label.setGeometry(
+                margin,
+                y,
+                self.grid_container.width() - 2 * margin,
+                GRID_GROUP_HEADER_HEIGHT,
+            )
+            label.show()
+
+    def scroll_to_item(self, item_data):
+        if not self.virtualized:
+            card = self.active_cards.get(item_data.key)
+            if card:
+                self.scroll.ensureWidgetVisible(card)
+            return
+        index = self.items.index(item_data)
+        for y, _, row_start, row_end, _ in self._rows:
+            if row_start <= index < row_end or row_start == row_end == index:
+                self.scroll.verticalScrollBar().setValue(y)
+                return
+
+    def update_group_headers(self):
+        for group_start, label in self._headers.items():
+            if group_start < len(self.items):
+                label.setText(self.group_title(self.items[group_start]))
 
     def get_card_by_data(self, item_data):
-        return self.active_cards.get(id(item_data))
+        return self.active_cards.get(item_data.key)
+
+    def get_card_by_key(self, key):
+        return self.active_cards.get(key)
 
     def dragEnterEvent(self, event):
         if not self.drag_enabled:
@@ -159,9 +395,9 @@ class PDFGrid(QWidget):
             return
         if event.mimeData().hasText():
             event.accept()
-            path = event.mimeData().text()
+            key = event.mimeData().text()
             for item in self.items:
-                if item["path"] == path:
+                if str(item.key) == key:
                     self.dragged_item_data = item
                     break
             self.refresh_grid_visuals()
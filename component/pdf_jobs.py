@@ -0,0 +1,182 @@
+import os
+import time
+import logging
+from typing import Callable, Dict, List
+from component.page_ranges import (
+    complement_intervals,
+    expand_intervals,
+    parse_page_intervals,
+)
+from component.pdf_compress import CompressionSettings, compress_pdf
+from component.pdf_operations import (
+    fixed_ranges,
+    merge_pdfs,
+    split_pdf_by_size,
+    split_pdf_ranges,
+)
+from component.document_cache import release_documents
+from component.output_naming import OutputNamer
+from component.toolsForPDF import apply_page_edits, get_pdf_page_count
+from component.tracing import span
+from assets.config import *
+
+logger = logging.getLogger(__name__)
+
+
+class JobError(ValueError):
+    pass
+
+
+def _base_name(path: str) -> str:
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+def _page_text(options: Dict, key: str) -> str:
+    text = str(options.get(key, "")).strip()
+    if not text:
+        raise JobError(f"Option '{key}' is required")
+    return text
+
+
+def _merge(inputs: List[str], output_dir: str, options: Dict) -> List[str]:
+    namer = OutputNamer(output_dir)
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    output_path = namer.claim(options.get("output_name") or f"merged_{stamp}.pdf")
+    try:
+        merge_pdfs(
+            [(path, 0) for path in inputs],
+            output_path,
+            options.get("profile", OUTPUT_PROFILE_DEFAULT),
+            options.get("linearize", False),
+        )
+    except Exception:
+        namer.release(output_path)
+        raise
+    return [output_path]
+
+
+def _split_pages(src: str, output_dir: str, options: Dict) -> List[str]:
+    ranges = fixed_ranges(
+        get_pdf_page_count(src), int(options.get("pages_per_file", 1))
+    )
+    return [
+        r.path
+        for r in split_pdf_ranges(
+            src,
+            ranges,
+            output_dir,
+            _base_name(src),
+            profile=options.get("profile", OUTPUT_PROFILE_DEFAULT),
+            linearize=options.get("linearize", False),
+        )
+    ]
+
+
+def _split_ranges(src: str, output_dir: str, options: Dict) -> List[str]:
+    ranges = parse_page_intervals(
+        _page_text(options, "ranges"), get_pdf_page_count(src)
+    )
+    if not ranges:
+        raise JobError("No valid page ranges")
+    return [
+        r.path
+        for r in split_pdf_ranges(
+            src,
+            ranges,
+            output_dir,
+            _base_name(src),
+            merge_ranges=options.get("merge_ranges", False),
+            profile=options.get("profile", OUTPUT_PROFILE_DEFAULT),
+            linearize=options.get("linearize", False),
+        )
+    ]
+
+
+def _split_size(src: str, output_dir: str, options: Dict) -> List[str]:
+    max_mb = float(options.get("max_mb", 0))
+    if not SPLIT_SIZE_MIN_KB / 1024 <= max_mb <= SPLIT_SIZE_MAX_MB:
+        raise JobError(
+            f"max_mb must be between {SPLIT_SIZE_MIN_KB} KB and {SPLIT_SIZE_MAX_MB} MB"
+        )
+    return [
+        r.path
+        for r in split_pdf_by_size(
+            src,
+            max_mb * 1024 * 1024 * SPLIT_SIZE_SAFETY_MARGIN,
+            output_dir,
+            _base_name(src),
+            profile=options.get("profile", OUTPUT_PROFILE_DEFAULT),
+            linearize=options.get("linearize", False),
+        )
+    ]
+
+
+def _delete_pages(src: str, output_dir: str, options: Dict) -> List[str]:
+    total_pages = get_pdf_page_count(src)
+    deleted = parse_page_intervals(_page_text(options, "pages"), total_pages)
+    if not deleted:
+        raise JobError("No valid pages to delete")
+    keep = expand_intervals(complement_intervals(deleted, total_pages))
+    if not keep:
+        raise JobError("Cannot delete all pages")
+    report = apply_page_edits(
+        src,
+        keep,
+        {},
+        f"{EDITED_OUTPUT_PREFIX}{os.path.basename(src)}",
+        profile=options.get("profile", OUTPUT_PROFILE_DEFAULT),
+        save_dir=output_dir,
+        linearize=options.get("linearize", False),
+    )
+    return [report.path]
+
+
+def _compress(src: str, output_dir: str, options: Dict) -> List[str]:
+    namer = OutputNamer(output_dir)
+    output_path = namer.claim(f"{COMPRESSED_OUTPUT_PREFIX}{os.path.basename(src)}")
+    settings = CompressionSettings(
+        int(options.get("target_dpi", COMPRESS_DEFAULT_DPI)),
+        int(options.get("quality", COMPRESS_DEFAULT_QUALITY)),
+        options.get("image_format", "jpeg"),
+    )
+    try:
+        compress_pdf(src, output_path, settings, options.get("max_workers"))
+    except Exception:
+        namer.release(output_path)
+        raise
+    return [output_path]
+
+
+PER_FILE_OPERATIONS: Dict[str, Callable[[str, str, Dict], List[str]]] = {
+    "split_pages": _split_pages,
+    "split_ranges": _split_ranges,
+    "split_size": _split_size,
+    "delete_pages": _delete_pages,
+    "compress": _compress,
+}
+JOB_OPERATIONS = ("merge",) + tuple(PER_FILE_OPERATIONS)
+
+
+def run_job(
+    operation: str, inputs: List[str], output_dir: str, options: Dict = None
+) -> List[str]:
+    options = options or {}
+    if operation not in JOB_OPERATIONS:
+        raise JobError(f"Unknown operation '{operation}'")
+    if not inputs:
+        raise JobError("No input files")
+    os.makedirs(output_dir, exist_ok=True)
+    try:
+        with span(f"job.{operation}", files=len(inputs)):
+            if operation == "merge":
+                outputs = _merge(inputs, output_dir, options)
+            else:
+                outputs = [
+                    path
+                    for src in inputs
+                    for path in PER_FILE_OPERATIONS[operation](src, output_dir, options)
+                ]
+    finally:
+        release_documents()
+    logger.info(f"{operation}: {len(inputs)} inputs -> {len(outputs)} outputs")
+    return outputs
@@ -0,0 +1,300 @@
+import io
+import os
+import logging
+from contextlib import contextmanager
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from pypdf import PdfReader, PdfWriter
+from pypdf.generic import StreamObject
+from component.tracing import traced
+from component.pdf_output import (
+    SaveReport,
+    ensure_free_space,
+    file_sha256,
+    format_file_size,
+    write_pdf_output,
+)
+from component.job_journal import JobJournal
+from component.output_naming import OutputNamer
+from component.page_ranges import count_pages
+from component.pdf_resources import add_pruned_page
+from component.toolsForPDF import write_pdf_with_rotation
+from assets.config import *
+
+logger = logging.getLogger(__name__)
+
+
+class SplitLimitError(Exception):
+    pass
+
+
+class PartialSplitError(Exception):
+    def __init__(self, message: str, parts_kept: int):
+        super().__init__(message)
+        self.parts_kept = parts_kept
+
+
+@contextmanager
+def _keep_finished_parts(journal: JobJournal):
+    try:
+        yield
+    except SplitLimitError:
+        raise
+    except Exception as e:
+        if journal.finished_parts():
+            raise PartialSplitError(str(e), journal.finished_parts()) from e
+        raise
+
+
+class MergeDedupReport(NamedTuple):
+    duplicate_files: List[Tuple[str, str]]
+    objects_shared: int
+    bytes_saved: int
+
+    def describe(self) -> str:
+        lines = [
+            (
+                f"{os.path.basename(dup)} was added more than once"
+                if dup == orig
+                else f"{os.path.basename(dup)} is identical to {os.path.basename(orig)}"
+            )
+            for dup, orig in self.duplicate_files
+        ]
+        if self.bytes_saved:
+            lines.append(
+                f"Reused {self.objects_shared} identical objects, "
+                f"saved {format_file_size(self.bytes_saved)}"
+            )
+        return "\n".join(lines)
+
+
+def _stream_bytes(writer: PdfWriter, start: int = 0) -> int:
+    return sum(
+        len(obj._data)
+        for obj in writer._objects[start:]
+        if isinstance(obj, StreamObject)
+    )
+
+
+@traced("merge.build")
+def build_merge_writer(
+    entries: List[Tuple[str, int]],
+) -> Tuple[PdfWriter, MergeDedupReport]:
+    writer = PdfWriter()
+    readers: Dict[str, Tuple[str, PdfReader, int]] = {}
+    duplicate_files: List[Tuple[str, str]] = []
+    reused_bytes = 0
+    for path, rotation in entries:
+        digest = file_sha256(path)
+        first_object = len(writer._objects)
+        if digest in readers:
+            original, reader, original_bytes = readers[digest]
+            duplicate_files.append((path, original))
+        else:
+            reader = PdfReader(path)
+        pages_indices = list(range(len(reader.pages)))
+        rotations = {i: rotation for i in pages_indices}
+        write_pdf_with_rotation(writer, reader, pages_indices, rotations)
+        added_bytes = _stream_bytes(writer, first_object)
+        if digest in readers:
+            reused_bytes += max(0, original_bytes - added_bytes)
+        else:
+            readers[digest] = (path, reader, added_bytes)
+    objects_before = sum(1 for obj in writer._objects if obj is not None)
+    bytes_before = _stream_bytes(writer)
+    writer.compress_identical_objects(remove_unreferenced=False)
+    report = MergeDedupReport(
+        duplicate_files,
+        objects_before - sum(1 for obj in writer._objects if obj is not None),
+        reused_bytes + bytes_before - _stream_bytes(writer),
+    )
+    if duplicate_files or report.bytes_saved:
+        logger.info(report.describe().replace("\n", "; "))
+    return writer, report
+
+
+@traced("merge")
+def merge_pdfs(
+    entries: List[Tuple[str, int]],
+    output_path: str,
+    profile: str = OUTPUT_PROFILE_DEFAULT,
+    linearize: bool = False,
+) -> SaveReport:
+    bytes_in = sum(os.path.getsize(path) for path, _ in entries)
+    writer, _ = build_merge_writer(entries)
+    return write_pdf_output(writer, output_path, profile, bytes_in, linearize=linearize)
+
+
+def _write_part(
+    namer: OutputNamer,
+    writer: PdfWriter,
+    filename: str,
+    profile: str,
+    estimated_bytes: int = 0,
+    linearize: bool = False,
+) -> SaveReport:
+    out_path = namer.claim(filename)
+    try:
+        return write_pdf_output(
+            writer,
+            out_path,
+            profile,
+            estimated_bytes=estimated_bytes,
+            linearize=linearize,
+        )
+    except Exception:
+        namer.release(out_path)
+        raise
+
+
+def add_part_pages(reader: PdfReader, writer: PdfWriter, start: int, end: int) -> None:
+    for idx in range(start, min(end, len(reader.pages) - 1) + 1):
+        add_pruned_page(writer, reader.pages[idx])
+
+
+def split_job(src_path: str, kind: str, **params) -> Dict:
+    return {"kind": kind, "source": file_sha256(src_path), **params}
+
+
+def fixed_ranges(total_pages: int, step: int) -> List[Tuple[int, int]]:
+    step = max(1, step)
+    return [
+        (i, min(i + step - 1, total_pages - 1)) for i in range(0, total_pages, step)
+    ]
+
+
+@traced("split.ranges")
+def split_pdf_ranges(
+    src_path: str,
+    ranges: List[Tuple[int, int]],
+    save_dir: str,
+    base_name: str,
+    merge_ranges: bool = False,
+    profile: str = OUTPUT_PROFILE_DEFAULT,
+    linearize: bool = False,
+) -> List[SaveReport]:
+    reader = PdfReader(src_path)
+    namer = OutputNamer(save_dir)
+    journal = JobJournal(
+        save_dir,
+        base_name,
+        split_job(
+            src_path,
+            "ranges",
+            ranges=ranges,
+            merge_ranges=merge_ranges,
+            profile=profile,
+            linearize=linearize,
+        ),
+    )
+    parts = [list(ranges)] if merge_ranges else [[r] for r in ranges]
+    pending = [p for i, p in enumerate(parts) if not journal.completed(i + 1)]
+    with _keep_finished_parts(journal):
+        bytes_per_page = os.path.getsize(src_path) / max(1, len(reader.pages))
+        ensure_free_space(
+            save_dir, int(bytes_per_page * sum(map(count_pages, pending)))
+        )
+        created_files: List[SaveReport] = []
+        for idx, part_ranges in enumerate(parts):
+            done = journal.completed(idx + 1)
+            if done:
+                created_files.append(done)
+                continue
+            writer = PdfWriter()
+            for start, end in part_ranges:
+                add_part_pages(reader, writer, start, end)
+            filename = (
+                f"{base_name}_merged_split.pdf"
+                if merge_ranges
+                else f"{base_name}_part_{idx + 1}.pdf"
+            )
+            report = _write_part(
+                namer,
+                writer,
+                filename,
+                profile,
+                int(bytes_per_page * count_pages(part_ranges)),
+                linearize,
+            )
+            journal.record(idx + 1, report, (part_ranges[0][0], part_ranges[-1][1]))
+            created_files.append(report)
+    journal.finish()
+    return created_files
+
+
+@traced("split.size")
+def split_pdf_by_size(
+    src_path: str,
+    limit_bytes: float,
+    save_dir: str,
+    base_name: str,
+    profile: str = OUTPUT_PROFILE_DEFAULT,
+    max_output_files: Optional[int] = MAX_SPLIT_OUTPUT_FILES,
+    linearize: bool = False,
+) -> List[SaveReport]:
+    reader = PdfReader(src_path)
+    namer = OutputNamer(save_dir)
+    journal = JobJournal(
+        save_dir,
+        base_name,
+        split_job(
+            src_path,
+            "size",
+            limit_bytes=limit_bytes,
+            profile=profile,
+            linearize=linearize,
+        ),
+    )
+    resumed = journal.completed_prefix()
+    with _keep_finished_parts(journal):
+        created_files: List[SaveReport] = [journal.completed(e.part) for e in resumed]
+        part_start = resumed[-1].pages[1] + 1 if resumed else 0
+        total_pages = len(reader.pages)
+        remaining = (total_pages - part_start) / max(1, total_pages)
+        ensure_free_space(save_dir, int(os.path.getsize(src_path) * remaining))
+        current_writer = PdfWriter()
+        current_page_count = 0
+        file_index = len(resumed) + 1
+        for page_idx in range(part_start, total_pages):
+            page = reader.pages[page_idx]
+            add_pruned_page(current_writer, page)
+            current_page_count += 1
+            temp_buffer = io.BytesIO()
+            current_writer.write(temp_buffer)
+            current_size = temp_buffer.tell()
+            if current_size > limit_bytes and current_page_count > 1:
+                if max_output_files and file_index >= max_output_files:
+                    raise SplitLimitError(
+                        f"Split would create more than {max_output_files} files. "
+                        "Increase the split size."
+                    )
+                save_writer = PdfWriter()
+                for p_idx in range(len(current_writer.pages) - 1):
+                    save_writer.add_page(current_writer.pages[p_idx])
+                report = _write_part(
+                    namer,
+                    save_writer,
+                    f"{base_name}_part_{file_index}.pdf",
+                    profile,
+                    current_size,
+                    linearize,
+                )
+                journal.record(file_index, report, (part_start, page_idx - 1))
+                created_files.append(report)
+                part_start = page_idx
+                file_index += 1
+                current_writer = PdfWriter()
+                add_pruned_page(current_writer, page)
+                current_page_count = 1
+        if len(current_writer.pages) > 0:
+            report = _write_part(
+                namer,
+                current_writer,
+                f"{base_name}_part_{file_index}.pdf",
+                profile,
+                int(limit_bytes),
+                linearize,
+            )
+            journal.record(file_index, report, (part_start, total_pages - 1))
+            created_files.append(report)
+    journal.finish()
+    return created_files
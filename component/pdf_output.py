@@ -0,0 +1,249 @@
+import io
+import os
+import re
+import time
+import errno
+import hashlib
+import shutil
+import logging
+import tempfile
+import subprocess
+from contextlib import contextmanager
+from typing import Dict, List, NamedTuple, Optional
+import fitz
+from pypdf import PdfWriter
+from component.output_naming import placeholder_path
+from component.tracing import traced
+from assets.config import *
+
+try:
+    import pikepdf
+except ImportError:
+    pikepdf = None
+
+logger = logging.getLogger(__name__)
+
+
+class InsufficientSpaceError(OSError):
+    pass
+
+
+class SaveReport(NamedTuple):
+    path: str
+    strategy: str
+    bytes_written: int
+    seconds: float
+    bytes_in: int = 0
+
+    @property
+    def bytes_per_second(self) -> float:
+        return self.bytes_written / self.seconds if self.seconds > 0 else 0.0
+
+    def describe(self) -> str:
+        text = (
+            f"{self.strategy} save: {format_file_size(self.bytes_written)} "
+            f"written in {self.seconds:.2f}s "
+            f"({format_file_size(self.bytes_per_second)}/s)"
+        )
+        if self.bytes_in:
+            text += f" (input {format_file_size(self.bytes_in)})"
+        return text
+
+
+def format_file_size(num_bytes: float) -> str:
+    if num_bytes < 1024:
+        return f"{num_bytes:.0f} B"
+    for unit in ("KB", "MB", "GB"):
+        num_bytes /= 1024
+        if num_bytes < 1024 or unit == "GB":
+            break
+    return f"{num_bytes:.1f} {unit}"
+
+
+def summarize_reports(reports: List[SaveReport], bytes_in: int = 0) -> str:
+    resumed = [r for r in reports if r.strategy == RESUMED_STRATEGY]
+    written = [r for r in reports if r.strategy != RESUMED_STRATEGY]
+    bytes_out = sum(r.bytes_written for r in written)
+    seconds = sum(r.seconds for r in written)
+    text = f"{format_file_size(bytes_out)} written in {seconds:.2f}s"
+    if seconds > 0:
+        text += f" ({format_file_size(bytes_out / seconds)}/s)"
+    if bytes_in:
+        text += f" (input {format_file_size(bytes_in)})"
+    if resumed:
+        text += f"\n{len(resumed)} completed parts reused from an earlier run"
+    return text
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(MERGE_HASH_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def mupdf_save_options(profile: str) -> dict:
+    if profile == "compact":
+        return {
+            "garbage": 4,
+            "deflate": True,
+            "deflate_images": True,
+            "deflate_fonts": True,
+            "use_objstms": 1,
+        }
+    return {"garbage": 1}
+
+
+def ensure_free_space(folder: str, needed_bytes: int) -> None:
+    if needed_bytes <= 0:
+        return
+    free = shutil.disk_usage(folder).free
+    required = int(needed_bytes * OUTPUT_SPACE_MARGIN) + OUTPUT_SPACE_RESERVE_BYTES
+    if free < required:
+        raise InsufficientSpaceError(
+            errno.ENOSPC,
+            f"Not enough disk space in {folder}: about "
+            f"{format_file_size(required)} needed, {format_file_size(free)} free",
+        )
+
+
+def _fsync_path(path: str, directory: bool = False) -> None:
+    if directory and os.name != "posix":
+        return
+    try:
+        fd = os.open(path, os.O_RDONLY if directory else os.O_RDWR)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _publish_exclusive(temp_path: str, output_path: str) -> None:
+    try:
+        os.link(temp_path, output_path)
+    except FileExistsError:
+        raise
+    except OSError:
+        fd = os.open(output_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        os.close(fd)
+        os.replace(temp_path, output_path)
+        return
+    os.remove(temp_path)
+
+
+@contextmanager
+def atomic_output(output_path: str, estimated_bytes: int = 0):
+    folder = os.path.dirname(os.path.abspath(output_path))
+    ensure_free_space(folder, estimated_bytes)
+    temp_path = placeholder_path(output_path)
+    if not os.path.exists(temp_path):
+        fd, temp_path = tempfile.mkstemp(
+            dir=folder,
+            prefix=f".{os.path.basename(output_path)}.",
+            suffix=OUTPUT_TEMP_SUFFIX,
+        )
+        os.close(fd)
+    try:
+        yield temp_path
+        _fsync_path(temp_path)
+        _publish_exclusive(temp_path, output_path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+    _fsync_path(folder, directory=True)
+
+
+def linearization_available() -> bool:
+    return pikepdf is not None or shutil.which("qpdf") is not None
+
+
+@traced("save.linearize")
+def linearize_pdf(src_path: str, dest_path: str) -> None:
+    if pikepdf is not None:
+        with pikepdf.open(src_path) as pdf:
+            pdf.save(dest_path, linearize=True)
+        return
+    qpdf = shutil.which("qpdf")
+    if qpdf is None:
+        raise RuntimeError("Linearization requires pikepdf or the qpdf command")
+    result = subprocess.run(
+        [qpdf, "--linearize", src_path, dest_path], capture_output=True, text=True
+    )
+    if result.returncode not in (0, 3):
+        raise RuntimeError(f"qpdf failed: {result.stderr.strip()}")
+
+
+def linearize_in_place(path: str) -> None:
+    linear_path = f"{path}.linear"
+    try:
+        linearize_pdf(path, linear_path)
+        os.replace(linear_path, path)
+    finally:
+        if os.path.exists(linear_path):
+            os.remove(linear_path)
+
+
+def read_linearization(path: str) -> Optional[Dict[str, int]]:
+    with open(path, "rb") as f:
+        header = f.read(LINEARIZATION_HEADER_BYTES)
+    match = re.search(rb"<<(?:(?!>>).)*/Linearized\s[^>]*>>", header, re.S)
+    if not match:
+        return None
+    return {
+        key.decode(): int(value)
+        for key, value in re.findall(rb"/([LEONT])\s+(\d+)", match.group(0))
+    }
+
+
+def optimize_writer(writer: PdfWriter) -> None:
+    for page in writer.pages:
+        page.compress_content_streams()
+    writer.compress_identical_objects()
+
+
+@traced("save.write")
+def write_pdf_output(
+    writer: PdfWriter,
+    output_path: str,
+    profile: str = OUTPUT_PROFILE_DEFAULT,
+    bytes_in: int = 0,
+    estimated_bytes: Optional[int] = None,
+    linearize: bool = False,
+) -> SaveReport:
+    started = time.perf_counter()
+    if estimated_bytes is None:
+        estimated_bytes = bytes_in
+    if linearize:
+        estimated_bytes *= 2
+    with atomic_output(output_path, estimated_bytes) as temp_path:
+        if profile == "compact":
+            optimize_writer(writer)
+            buffer = io.BytesIO()
+            writer.write(buffer)
+            doc = fitz.open(stream=buffer.getvalue(), filetype="pdf")
+            try:
+                doc.save(temp_path, **mupdf_save_options(profile))
+            finally:
+                doc.close()
+        else:
+            with open(temp_path, "wb", buffering=OUTPUT_WRITE_BUFFER_BYTES) as f:
+                writer.write(f)
+        if linearize:
+            linearize_in_place(temp_path)
+    report = SaveReport(
+        output_path,
+        f"{profile}+linearized" if linearize else profile,
+        os.path.getsize(output_path),
+        time.perf_counter() - started,
+        bytes_in,
+    )
+    logger.info(f"{os.path.basename(output_path)}: {report.describe()}")
+    return report
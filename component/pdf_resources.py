@@ -0,0 +1,60 @@
+import re
+from typing import Optional, Set
+from pypdf import PageObject, PdfWriter
+from pypdf.generic import DictionaryObject, NameObject
+
+PRUNABLE_RESOURCES = (
+    "/XObject",
+    "/Font",
+    "/ExtGState",
+    "/Shading",
+    "/Pattern",
+    "/ColorSpace",
+    "/Properties",
+)
+
+_CONTENT_NAME = re.compile(rb"/([^\s/\[\]()<>{}%]+)")
+_NAME_ESCAPE = re.compile(r"#([0-9A-Fa-f]{2})")
+
+
+def used_resource_names(page: PageObject) -> Set[str]:
+    contents = page.get_contents()
+    if contents is None:
+        return set()
+    return {
+        "/" + _NAME_ESCAPE.sub(lambda m: chr(int(m.group(1), 16)), name)
+        for name in (
+            raw.decode("latin-1") for raw in _CONTENT_NAME.findall(contents.get_data())
+        )
+    }
+
+
+def pruned_resources(page: PageObject) -> Optional[DictionaryObject]:
+    resources = page.get("/Resources")
+    if resources is None:
+        return None
+    resources = resources.get_object()
+    used = used_resource_names(page)
+    pruned = DictionaryObject()
+    for key in resources:
+        value = resources.raw_get(key)
+        category = value.get_object()
+        if key in PRUNABLE_RESOURCES and isinstance(category, DictionaryObject):
+            pruned[NameObject(key)] = DictionaryObject(
+                {NameObject(n): category.raw_get(n) for n in category if n in used}
+            )
+        else:
+            pruned[NameObject(key)] = value
+    return pruned
+
+
+def add_pruned_page(writer: PdfWriter, page: PageObject) -> PageObject:
+    pruned = pruned_resources(page)
+    if pruned is None or "/Resources" not in page:
+        return writer.add_page(page)
+    original = page.raw_get("/Resources")
+    page[NameObject("/Resources")] = pruned
+    try:
+        return writer.add_page(page)
+    finally:
+        page[NameObject("/Resources")] = original
@@ -0,0 +1,190 @@
+import logging
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, Iterable, NamedTuple, Optional, Set, Tuple
+import fitz
+from PyQt6.QtCore import QObject, pyqtSignal
+from PyQt6.QtGui import QImage, QPixmap
+from component.document_cache import cached_document
+from component.thumbnail_cache import has_base_thumbnail, store_base_thumbnail
+from assets.config import *
+
+logger = logging.getLogger(__name__)
+
+
+class RenderTask(NamedTuple):
+    path: str
+    page: int
+    width: int = THUMBNAIL_DEFAULT_WIDTH
+    height: int = THUMBNAIL_DEFAULT_HEIGHT
+
+
+class PrefetchStats(NamedTuple):
+    requested: int
+    cancelled: int
+    hits: int
+    misses: int
+
+    @property
+    def hit_rate(self) -> float:
+        shown = self.hits + self.misses
+        return self.hits / shown if shown else 0.0
+
+    def describe(self) -> str:
+        return (
+            f"prefetch hit rate {self.hit_rate:.0%} ({self.hits} of "
+            f"{self.hits + self.misses} cards ready when shown, "
+            f"{self.requested} requested, {self.cancelled} cancelled)"
+        )
+
+
+def render_page_image(task: RenderTask) -> Optional[Tuple[int, int, int, bytes]]:
+    doc = cached_document(task.path)
+    if doc.is_encrypted or task.page >= len(doc):
+        return None
+    page = doc.load_page(task.page)
+    zoom = min(task.width / page.rect.width, task.height / page.rect.height)
+    pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+    return pix.width, pix.height, pix.stride, pix.samples
+
+
+class ThumbnailRenderPool(QObject):
+    rendered = pyqtSignal(object)
+    _finished = pyqtSignal(object, object)
+
+    def __init__(self, workers: int = THUMBNAIL_RENDER_WORKERS):
+        super().__init__()
+        self.workers = workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pending: Dict[RenderTask, Future] = {}
+        self._prefetch_queue: "OrderedDict[RenderTask, None]" = OrderedDict()
+        self._prefetch_pending: Set[RenderTask] = set()
+        self._prefetched: "OrderedDict[RenderTask, None]" = OrderedDict()
+        self._stats = PrefetchStats(0, 0, 0, 0)
+        self._finished.connect(self._on_finished)
+
+    def _submit(self, task: RenderTask) -> None:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context(WORKER_START_METHOD),
+            )
+        future = self._executor.submit(render_page_image, task)
+        self._pending[task] = future
+        future.add_done_callback(lambda f, t=task: self._notify_finished(t, f))
+
+    def _notify_finished(self, task: RenderTask, future: Future) -> None:
+        try:
+            self._finished.emit(task, future)
+        except RuntimeError:
+            pass
+
+    def request(self, task: RenderTask) -> bool:
+        self._prefetch_queue.pop(task, None)
+        if task in self._pending or has_base_thumbnail(*task):
+            return False
+        self._submit(task)
+        return True
+
+    def prefetch(self, tasks: Iterable[RenderTask]) -> None:
+        self._prefetch_queue.clear()
+        for task in tasks:
+            if len(self._prefetch_queue) >= THUMBNAIL_PREFETCH_QUEUE_SIZE:
+                break
+            if task not in self._pending and not has_base_thumbnail(*task):
+                self._prefetch_queue[task] = None
+        self._drain_prefetch()
+
+    def _drain_prefetch(self) -> None:
+        while (
+            self._prefetch_queue
+            and len(self._prefetch_pending) < THUMBNAIL_PREFETCH_IN_FLIGHT
+        ):
+            task, _ = self._prefetch_queue.popitem(last=False)
+            if task in self._pending or has_base_thumbnail(*task):
+                continue
+            self._prefetch_pending.add(task)
+            self._stats = self._stats._replace(requested=self._stats.requested + 1)
+            self._submit(task)
+
+    def cancel_prefetch(self) -> int:
+        cancelled = len(self._prefetch_queue)
+        self._prefetch_queue.clear()
+        for task in list(self._prefetch_pending):
+            future = self._pending.get(task)
+            if future is not None and future.cancel():
+                cancelled += 1
+        self._stats = self._stats._replace(cancelled=self._stats.cancelled + cancelled)
+        return cancelled
+
+    def record_shown(self, task: RenderTask) -> None:
+        if task in self._prefetched:
+            del self._prefetched[task]
+            if has_base_thumbnail(*task):
+                self._stats = self._stats._replace(hits=self._stats.hits + 1)
+                return
+        elif has_base_thumbnail(*task):
+            return
+        self._stats = self._stats._replace(misses=self._stats.misses + 1)
+
+    def prefetch_stats(self) -> PrefetchStats:
+        return self._stats
+
+    def is_pending(self, task: RenderTask) -> bool:
+        return task in self._pending
+
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    def _on_finished(self, task: RenderTask, future: Future) -> None:
+        if self._pending.get(task) is not future:
+            return
+        del self._pending[task]
+        prefetched = task in self._prefetch_pending
+        self._prefetch_pending.discard(task)
+        self._drain_prefetch()
+        if future.cancelled():
+            return
+        try:
+            result = future.result()
+        except Exception as e:
+            logger.warning(f"Thumbnail render failed for page {task.page + 1}: {e}")
+            return
+        if result is None:
+            return
+        width, height, stride, samples = result
+        image = QImage(samples, width, height, stride, QImage.Format.Format_RGB888)
+        store_base_thumbnail(
+            task.path, task.page, QPixmap.fromImage(image), task.width, task.height
+        )
+        if prefetched:
+            self._prefetched[task] = None
+            if len(self._prefetched) > THUMBNAIL_CACHE_SIZE:
+                self._prefetched.popitem(last=False)
+        self.rendered.emit(task)
+
+    def recycle(self, wait: bool = True) -> None:
+        self._prefetch_queue.clear()
+        self._prefetch_pending.clear()
+        for future in list(self._pending.values()):
+            future.cancel()
+        self._pending.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+
+    def shutdown(self) -> None:
+        if self._stats.requested:
+            logger.info(f"Thumbnails: {self._stats.describe()}")
+        self.recycle()
+
+
+_pool: Optional[ThumbnailRenderPool] = None
+
+
+def get_render_pool() -> ThumbnailRenderPool:
+    global _pool
+    if _pool is None:
+        _pool = ThumbnailRenderPool()
+    return _pool
@@ -0,0 +1,108 @@
+import os
+import time
+import queue
+import shutil
+import uuid
+import logging
+import threading
+from typing import Optional
+from component.tracing import span
+from assets.config import *
+
+logger = logging.getLogger(__name__)
+
+
+def remove_folder_with_retries(folder: str) -> None:
+    if not os.path.exists(folder):
+        return
+    for _ in range(CLEANUP_RETRY_ATTEMPTS):
+        try:
+            shutil.rmtree(folder)
+            return
+        except PermissionError:
+            time.sleep(CLEANUP_RETRY_DELAY_SEC)
+        except FileNotFoundError:
+            return
+    shutil.rmtree(folder, ignore_errors=True)
+
+
+def is_trash_folder(name: str) -> bool:
+    return CLEANUP_TRASH_MARKER in name
+
+
+class TempReaper:
+    def __init__(self):
+        self._queue: "queue.Queue[tuple]" = queue.Queue()
+        self._pending = 0
+        self._idle = threading.Condition()
+        self._thread = threading.Thread(
+            target=self._run, name="temp-reaper", daemon=True
+        )
+        self._thread.start()
+
+    def _submit(self, kind: str, path: str) -> None:
+        with self._idle:
+            self._pending += 1
+        self._queue.put((kind, path))
+
+    def _run(self) -> None:
+        while True:
+            kind, path = self._queue.get()
+            try:
+                if kind == "sweep":
+                    self._sweep(path)
+                else:
+                    with span("cleanup.reap", path=path):
+                        remove_folder_with_retries(path)
+            except Exception as e:
+                logger.warning(f"Background cleanup of {path} failed: {e}")
+            finally:
+                with self._idle:
+                    self._pending -= 1
+                    if not self._pending:
+                        self._idle.notify_all()
+
+    def _sweep(self, parent: str) -> None:
+        try:
+            names = os.listdir(parent)
+        except OSError:
+            return
+        for name in names:
+            path = os.path.join(parent, name)
+            if is_trash_folder(name) and os.path.isdir(path):
+                logger.info(f"Removing leftover temp folder {path}")
+                self._submit("reap", path)
+
+    def schedule(self, folder: str) -> None:
+        if not os.path.exists(folder):
+            return
+        folder = os.path.abspath(folder)
+        trash = f"{folder}{CLEANUP_TRASH_MARKER}{uuid.uuid4().hex[:8]}"
+        try:
+            os.rename(folder, trash)
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            logger.warning(f"Could not move {folder} aside ({e}); removing in place")
+            remove_folder_with_retries(folder)
+            return
+        self._submit("reap", trash)
+
+    def sweep(self, parent: str = ".") -> None:
+        self._submit("sweep", os.path.abspath(parent))
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        with self._idle:
+            return self._idle.wait_for(lambda: not self._pending, timeout)
+
+
+_reaper: Optional[TempReaper] = None
+_reaper_lock = threading.Lock()
+
+
+def get_reaper() -> TempReaper:
+    global _reaper
+    with _reaper_lock:
+        if _reaper is None:
+            _reaper = TempReaper()
+        return _reaper
@@ -0,0 +1,97 @@
+import os
+from collections import OrderedDict
+from typing import Optional, Tuple
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QPixmap, QTransform
+from component.toolsForPDF import get_pdf_thumbnail
+from assets.config import *
+
+_base_thumbnails: "OrderedDict[Tuple, QPixmap]" = OrderedDict()
+
+
+def _cache_key(file_path: str, page_num: int, width: int, height: int) -> Tuple:
+    try:
+        stat = os.stat(file_path)
+        version = (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        version = None
+    return (os.path.abspath(file_path), version, page_num, width, height)
+
+
+def has_base_thumbnail(
+    file_path: str,
+    page_num: int = 0,
+    width: int = THUMBNAIL_DEFAULT_WIDTH,
+    height: int = THUMBNAIL_DEFAULT_HEIGHT,
+) -> bool:
+    return _cache_key(file_path, page_num, width, height) in _base_thumbnails
+
+
+def get_draft_thumbnail(
+    file_path: str,
+    page_num: int = 0,
+    rotation: int = 0,
+    width: int = THUMBNAIL_DEFAULT_WIDTH,
+    height: int = THUMBNAIL_DEFAULT_HEIGHT,
+) -> Optional[QPixmap]:
+    return get_pdf_thumbnail(file_path, page_num, rotation, width, height, draft=True)
+
+
+def get_base_thumbnail(
+    file_path: str,
+    page_num: int = 0,
+    width: int = THUMBNAIL_DEFAULT_WIDTH,
+    height: int = THUMBNAIL_DEFAULT_HEIGHT,
+) -> Optional[QPixmap]:
+    key = _cache_key(file_path, page_num, width, height)
+    pixmap = _base_thumbnails.get(key)
+    if pixmap is not None:
+        _base_thumbnails.move_to_end(key)
+        return pixmap
+    pixmap = get_pdf_thumbnail(file_path, page_num, 0, width, height)
+    if pixmap is None:
+        return None
+    return store_base_thumbnail(file_path, page_num, pixmap, width, height)
+
+
+def store_base_thumbnail(
+    file_path: str,
+    page_num: int,
+    pixmap: QPixmap,
+    width: int = THUMBNAIL_DEFAULT_WIDTH,
+    height: int = THUMBNAIL_DEFAULT_HEIGHT,
+) -> QPixmap:
+    _base_thumbnails[_cache_key(file_path, page_num, width, height)] = pixmap
+    if len(_base_thumbnails) > THUMBNAIL_CACHE_SIZE:
+        _base_thumbnails.popitem(last=False)
+    return pixmap
+
+
+def get_rotated_thumbnail(
+    file_path: str,
+    page_num: int = 0,
+    rotation: int = 0,
+    width: int = THUMBNAIL_DEFAULT_WIDTH,
+    height: int = THUMBNAIL_DEFAULT_HEIGHT,
+) -> Optional[QPixmap]:
+    base = get_base_thumbnail(file_path, page_num, width, height)
+    if base is None or not rotation % 360:
+        return base
+    rotated = base.transformed(
+        QTransform().rotate(rotation), Qt.TransformationMode.SmoothTransformation
+    )
+    fit = min(width / rotated.width(), height / rotated.height())
+    if fit > THUMBNAIL_ROTATE_MAX_UPSCALE:
+        return get_pdf_thumbnail(file_path, page_num, rotation, width, height)
+    if fit < 1:
+        rotated = rotated.scaled(
+            width,
+            height,
+            Qt.AspectRatioMode.KeepAspectRatio,
+            Qt.TransformationMode.SmoothTransformation,
+        )
+    return rotated
+
+
+def clear_thumbnail_cache() -> None:
+    _base_thumbnails.clear()
@@ -4,13 +4,55 @@ import shutil
 import platform
 import subprocess
 import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from contextlib import contextmanager
-from typing import Optional, List
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
 import fitz
 from pypdf import PdfReader, PdfWriter
 from PyQt6.QtGui import QImage, QPixmap
 from PyQt6.QtCore import Qt, pyqtSignal
-from PyQt6.QtWidgets import QFileDialog, QWidget, QPushButton, QLabel
+from PyQt6.QtWidgets import (
+    QApplication,
+    QCheckBox,
+    QComboBox,
+    QFileDialog,
+    QWidget,
+    QPushButton,
+    QLabel,
+)
+from component.page_ranges import (
+    expand_intervals,
+    format_intervals,
+    has_invalid_parts,
+    intervals_from_pages,
+    parity_intervals,
+    parse_page_intervals,
+)
+from component.temp_reaper import get_reaper
+from component.output_naming import OutputNamer
+from component.document_cache import (
+    cached_document,
+    release_document,
+    release_documents,
+)
+from component.tracing import span, traced
+from component.pdf_compress import (
+    CompressionReport,
+    CompressionSettings,
+    compress_pdf,
+)
+from component.page_analysis import PageAnalysis, analyze_pages
+from component.pdf_output import (
+    SaveReport,
+    atomic_output,
+    linearization_available,
+    linearize_in_place,
+    format_file_size,
+    mupdf_save_options,
+    summarize_reports,
+    write_pdf_output,
+)
 from assets.config import *
 
 
@@ -36,6 +78,7 @@ def open_file(path: str) -> None:
         logger.error(f"Failed to open file {path}: {e}")
 
 
+@traced("validate.pdf")
 def is_valid_pdf(path: str) -> bool:
     try:
         if not os.path.exists(path):
@@ -84,6 +127,7 @@ def is_pdf_encrypted(path: str) -> bool:
         return False
 
 
+@traced("ingest.decrypt")
 def attempt_pdf_decryption(
     src_path: str, password: str, temp_folder: str
 ) -> Optional[str]:
@@ -112,23 +156,30 @@ def calculate_rotation(current_angle: int) -> int:
     return (current_angle - 90) % 360
 
 
+@traced("thumbnail.render")
 def get_pdf_thumbnail(
     file_path: str,
     page_num: int = 0,
     rotation: int = 0,
     width: int = THUMBNAIL_DEFAULT_WIDTH,
     height: int = THUMBNAIL_DEFAULT_HEIGHT,
+    draft: bool = False,
 ) -> Optional[QPixmap]:
-    doc = None
     try:
-        doc = fitz.open(file_path)
+        doc = cached_document(file_path)
         if doc.is_encrypted:
             return None
         if page_num >= len(doc):
             return None
         page = doc.load_page(page_num)
-        page.set_rotation(rotation)
-        pix = page.get_pixmap(matrix=fitz.Matrix(1.0, 1.0))
+        zoom = 1.0
+        transform = Qt.TransformationMode.SmoothTransformation
+        if draft:
+            rect = page.rect
+            zoom = min(width / rect.width, height / rect.height)
+            zoom *= THUMBNAIL_DRAFT_SCALE
+            transform = Qt.TransformationMode.FastTransformation
+        pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom).prerotate(rotation))
         fmt = QImage.Format.Format_RGB888
         img = QImage(pix.samples, pix.width, pix.height, pix.stride, fmt)
         pixmap = QPixmap.fromImage(img)
@@ -136,13 +187,10 @@ def get_pdf_thumbnail(
             width,
             height,
             Qt.AspectRatioMode.KeepAspectRatio,
-            Qt.TransformationMode.SmoothTransformation,
+            transform,
         )
     except Exception:
         return None
-    finally:
-        if doc:
-            doc.close()
 
 
 def create_pdf_thumb_label(
@@ -198,15 +246,8 @@ def apply_stylesheet(widget: QWidget, filename: str = STYLESHEET) -> None:
 
 
 def cleanup_temp_folder(folder: str):
-    if not os.path.exists(folder):
-        return
-    for _ in range(CLEANUP_RETRY_ATTEMPTS):
-        try:
-            shutil.rmtree(folder)
-            return
-        except PermissionError:
-            time.sleep(CLEANUP_RETRY_DELAY_SEC)
-    shutil.rmtree(folder, ignore_errors=True)
+    release_documents(folder)
+    get_reaper().schedule(folder)
 
 
 def pick_pdf_files(parent: QWidget) -> List[str]:
@@ -222,6 +263,7 @@ def truncate_filename(filename: str, limit: int = FILENAME_TRUNCATE_LIMIT) -> st
     return filename
 
 
+@traced("ingest.copy")
 def safe_copy_file(src_path: str, target_folder: str) -> str:
     try:
         if not os.path.exists(target_folder):
@@ -260,6 +302,7 @@ def get_unique_filename(folder: str, filename: str) -> str:
         counter += 1
 
 
+@traced("validate.page_count")
 def get_pdf_page_count(path: str) -> int:
     doc = None
     try:
@@ -292,61 +335,17 @@ class BaseToolWindow(QWidget):
 
 
 def get_parity_indices(total_pages: int, parity: str) -> List[int]:
-    if parity == "odd":
-        return list(range(0, total_pages, 2))
-    elif parity == "even":
-        return list(range(1, total_pages, 2))
-    return []
+    return [
+        p for pages in parity_intervals([(0, total_pages - 1)], parity) for p in pages
+    ]
 
 
 def parse_page_ranges(text: str, total_pages: int) -> List[int]:
-    pages = set()
-    if not text:
-        return []
-    parts = text.split(",")
-    try:
-        for part in parts:
-            part = part.strip()
-            if not part:
-                continue
-            if "-" in part:
-                if part.endswith("-") or part.startswith("-"):
-                    continue
-                while "--" in part:
-                    part = part.replace("--", "-")
-                hyphen_parts = part.split("-")
-                if len(hyphen_parts) != 2:
-                    continue
-                start_str, end_str = hyphen_parts
-                if not start_str or not end_str:
-                    continue
-                start, end = int(start_str), int(end_str)
-                if 1 <= start <= end <= total_pages:
-                    pages.update(range(start - 1, end))
-            else:
-                p = int(part)
-                if 1 <= p <= total_pages:
-                    pages.add(p - 1)
-        return sorted(list(pages))
-    except ValueError:
-        return []
+    return expand_intervals(parse_page_intervals(text, total_pages))
 
 
 def format_pages_as_ranges(pages: List[int]) -> str:
-    if not pages:
-        return ""
-    sorted_pages = sorted(pages)
-    ranges = []
-    start = prev = sorted_pages[0]
-    for p in sorted_pages[1:]:
-        if p == prev + 1:
-            prev = p
-            continue
-        ranges.append((start, prev))
-        start = prev = p
-    ranges.append((start, prev))
-    parts = [f"{s}-{e}" if s != e else str(s) for s, e in ranges]
-    return ",".join(parts)
+    return format_intervals(intervals_from_pages(p - 1 for p in pages))
 
 
 def write_pdf_with_rotation(
@@ -356,31 +355,174 @@ def write_pdf_with_rotation(
         if idx < len(reader.pages):
             page = reader.pages[idx]
             rotation = rotations.get(idx, 0) if rotations else 0
+            added = writer.add_page(page)
             if rotation != 0:
-                page.rotate(rotation)
-            writer.add_page(page)
+                added.rotate(rotation)
 
 
-def save_pdf_with_success(
-    writer,
-    output_name: str,
-    parent_widget=None,
-    success_msg: str = "File saved successfully!",
-) -> Optional[str]:
-    from PyQt6.QtWidgets import QMessageBox
+def create_profile_combo() -> QComboBox:
+    combo = QComboBox()
+    for key, label in OUTPUT_PROFILES.items():
+        combo.addItem(label, key)
+    combo.setCurrentIndex(max(0, combo.findData(OUTPUT_PROFILE_DEFAULT)))
+    combo.setToolTip(
+        "Fast writes quickly; Compact removes unused and duplicate objects "
+        "and recompresses streams for a smaller file"
+    )
+    return combo
 
+
+def create_linearize_checkbox() -> QCheckBox:
+    checkbox = QCheckBox("Fast web view (linearize)")
+    if linearization_available():
+        checkbox.setChecked(LINEARIZE_DEFAULT)
+        checkbox.setToolTip(
+            "Reorders the file so browsers can show the first page "
+            "before the whole file has downloaded"
+        )
+    else:
+        checkbox.setEnabled(False)
+        checkbox.setToolTip("Install pikepdf or qpdf to enable fast web view")
+    return checkbox
+
+
+@traced("save.page_edits")
+def apply_page_edits(
+    src_path: str,
+    keep_indices: List[int],
+    rotations: Dict[int, int],
+    output_name: str,
+    incremental: bool = False,
+    profile: str = OUTPUT_PROFILE_DEFAULT,
+    save_dir: Optional[str] = None,
+    linearize: bool = False,
+    output_path: Optional[str] = None,
+) -> SaveReport:
+    namer = None
+    if output_path is None:
+        namer = OutputNamer(save_dir or get_downloads_folder())
+        output_path = namer.claim(output_name)
     try:
-        output_path = get_unique_filename(get_downloads_folder(), output_name)
-        with open(output_path, "wb") as f:
-            writer.write(f)
-        if parent_widget:
-            QMessageBox.information(parent_widget, "Success", success_msg)
-        open_file(output_path)
-        return output_path
-    except Exception as e:
-        if parent_widget:
-            QMessageBox.critical(parent_widget, "Error", f"Save failed: {str(e)}")
-        return None
+        return _write_page_edits(
+            src_path,
+            keep_indices,
+            rotations,
+            output_path,
+            incremental,
+            profile,
+            linearize,
+        )
+    except Exception:
+        if namer:
+            namer.release(output_path)
+        raise
+
+
+def _write_page_edits(
+    src_path: str,
+    keep_indices: List[int],
+    rotations: Dict[int, int],
+    output_path: str,
+    incremental: bool,
+    profile: str,
+    linearize: bool,
+) -> SaveReport:
+    started = time.perf_counter()
+    bytes_in = os.path.getsize(src_path)
+    release_document(src_path)
+    doc = fitz.open(src_path)
+    try:
+        for idx, rotation in rotations.items():
+            if rotation and idx < len(doc):
+                page = doc.load_page(idx)
+                page.set_rotation((page.rotation + rotation) % 360)
+        doc.select(keep_indices)
+        if incremental and not linearize and doc.can_save_incrementally():
+            strategy = "incremental"
+            doc.saveIncr()
+            bytes_written = os.path.getsize(src_path) - bytes_in
+        else:
+            strategy = f"mupdf/{profile}"
+            with atomic_output(output_path, bytes_in) as temp_path:
+                doc.save(temp_path, **mupdf_save_options(profile))
+                if linearize:
+                    strategy += "+linearized"
+                    linearize_in_place(temp_path)
+            bytes_written = os.path.getsize(output_path)
+    finally:
+        doc.close()
+    if strategy == "incremental":
+        with atomic_output(output_path, bytes_in) as temp_path:
+            shutil.move(src_path, temp_path)
+    report = SaveReport(
+        output_path, strategy, bytes_written, time.perf_counter() - started, bytes_in
+    )
+    logger.info(f"{os.path.basename(output_path)}: {report.describe()}")
+    return report
+
+
+class PageEdit(NamedTuple):
+    src_path: str
+    keep_indices: List[int]
+    rotations: Dict[int, int]
+    output_name: str
+
+
+@traced("save.page_edits_batch")
+def apply_page_edits_batch(
+    edits: List[PageEdit],
+    incremental: bool = False,
+    profile: str = OUTPUT_PROFILE_DEFAULT,
+    save_dir: Optional[str] = None,
+    linearize: bool = False,
+    max_workers: Optional[int] = None,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> Tuple[List[SaveReport], Dict[str, str]]:
+    options = {
+        "incremental": incremental,
+        "profile": profile,
+        "linearize": linearize,
+    }
+    namer = OutputNamer(save_dir or get_downloads_folder())
+    outputs = {edit.src_path: namer.claim(edit.output_name) for edit in edits}
+    reports: Dict[str, SaveReport] = {}
+    errors: Dict[str, str] = {}
+    workers = max_workers or min(len(edits), os.cpu_count() or 1)
+    if workers <= 1:
+        for done, edit in enumerate(edits, start=1):
+            try:
+                reports[edit.src_path] = apply_page_edits(
+                    *edit, output_path=outputs[edit.src_path], **options
+                )
+            except Exception as e:
+                namer.release(outputs[edit.src_path])
+                errors[edit.src_path] = str(e)
+            if progress:
+                progress(done, len(edits))
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context(WORKER_START_METHOD),
+        ) as pool:
+            futures = {
+                pool.submit(
+                    apply_page_edits,
+                    *edit,
+                    output_path=outputs[edit.src_path],
+                    **options,
+                ): edit
+                for edit in edits
+            }
+            for done, future in enumerate(as_completed(futures), start=1):
+                src_path = futures[future].src_path
+                try:
+                    reports[src_path] = future.result()
+                except Exception as e:
+                    namer.release(outputs[src_path])
+                    errors[src_path] = str(e)
+                if progress:
+                    progress(done, len(edits))
+    return [reports[e.src_path] for e in edits if e.src_path in reports], errors
 
 
 def create_progress_dialog(parent, title: str, label: str, maximum: int):
@@ -396,6 +538,87 @@ def create_progress_dialog(parent, title: str, label: str, maximum: int):
     return progress
 
 
+def compress_with_progress(
+    parent, src_path: str, output_path: str, settings: CompressionSettings
+) -> CompressionReport:
+    progress = create_progress_dialog(
+        parent, "Please Wait", "Recompressing images...", 1
+    )
+
+    def on_progress(done: int, total: int) -> bool:
+        progress.setMaximum(total)
+        progress.setValue(done)
+        QApplication.processEvents()
+        return not progress.wasCanceled()
+
+    try:
+        return compress_pdf(src_path, output_path, settings, progress=on_progress)
+    finally:
+        progress.close()
+
+
+def analyze_with_progress(parent, src_path: str) -> PageAnalysis:
+    progress = create_progress_dialog(
+        parent, "Please Wait", "Looking for blank and duplicate pages...", 1
+    )
+
+    def on_progress(done: int, total: int) -> bool:
+        progress.setMaximum(total)
+        progress.setValue(done)
+        QApplication.processEvents()
+        return not progress.wasCanceled()
+
+    try:
+        return analyze_pages(src_path, progress=on_progress)
+    finally:
+        progress.close()
+
+
+@contextmanager
+def queued_gui_job(parent, operation: str, inputs: List[str], options: Dict):
+    from component.job_queue import queued_job
+
+    progress = None
+
+    def wait() -> bool:
+        nonlocal progress
+        if progress is None:
+            progress = create_progress_dialog(
+                parent, "Please Wait", "Waiting for other jobs to finish...", 0
+            )
+        QApplication.processEvents()
+        return not progress.wasCanceled()
+
+    try:
+        with queued_job(
+            operation, inputs, get_downloads_folder(), options, wait=wait
+        ) as job:
+            if progress is not None:
+                progress.close()
+            yield job
+    finally:
+        if progress is not None:
+            progress.close()
+
+
+def save_edits_with_progress(
+    parent, edits: List[PageEdit], **options
+) -> Tuple[List[SaveReport], Dict[str, str]]:
+    progress = create_progress_dialog(
+        parent, "Please Wait", "Saving edited documents...", len(edits)
+    )
+    progress.setCancelButton(None)
+
+    def on_progress(done: int, total: int) -> None:
+        progress.setValue(done)
+        QApplication.processEvents()
+
+    try:
+        return apply_page_edits_batch(edits, progress=on_progress, **options)
+    finally:
+        progress.close()
+
+
 def sanitize_page_input(text: str) -> str:
     import re
 
@@ -405,35 +628,13 @@ def sanitize_page_input(text: str) -> str:
 def validate_page_input(text: str, total_pages: int) -> bool:
     if not text:
         return False
-    parts = [p.strip() for p in text.split(",") if p.strip()]
-    for part in parts:
-        if "-" in part:
-            if part.startswith("-") or part.endswith("-"):
-                return True
-            start_str, end_str = part.split("-", 1)
-            try:
-                start, end = int(start_str), int(end_str)
-            except ValueError:
-                return True
-            if start < 1 or end < 1 or start > end or end > total_pages:
-                return True
-        else:
-            try:
-                val = int(part)
-            except ValueError:
-                return True
-            if val < 1 or val > total_pages:
-                return True
-    return False
+    return has_invalid_parts(text, total_pages)
 
 
 def prune_page_input(text: str, total_pages: int) -> str:
-    import re
-
-    cleaned_text = re.sub(r"[^0-9,\-]", "", text)
-    valid_zero_based = parse_page_ranges(cleaned_text, total_pages)
-    valid_one_based = [p + 1 for p in valid_zero_based]
-    return format_pages_as_ranges(valid_one_based)
+    return format_intervals(
+        parse_page_intervals(sanitize_page_input(text), total_pages)
+    )
 
 
 def get_pdf_basename_without_ext(file_path: str) -> str:
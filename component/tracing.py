@@ -0,0 +1,127 @@
+import os
+import re
+import json
+import time
+import atexit
+import itertools
+import cProfile
+import logging
+import threading
+from contextlib import contextmanager
+from functools import wraps
+from typing import Dict, List, Optional
+from assets.config import *
+
+logger = logging.getLogger(__name__)
+
+_events: List[Dict] = []
+_events_lock = threading.Lock()
+_local = threading.local()
+_epoch = time.perf_counter()
+_profile_ids = itertools.count(1)
+
+
+def _env_target(var: str, default: str) -> Optional[str]:
+    value = os.environ.get(var, "").strip()
+    if not value or value == "0":
+        return None
+    return default if value == "1" else value
+
+
+def trace_file() -> Optional[str]:
+    return _env_target(TRACE_ENV_VAR, TRACE_DEFAULT_FILE)
+
+
+def profile_folder() -> Optional[str]:
+    return _env_target(PROFILE_ENV_VAR, PROFILE_DEFAULT_FOLDER)
+
+
+def _record(name: str, start: float, end: float, args: Dict) -> None:
+    event = {
+        "name": name,
+        "cat": name.split(".", 1)[0],
+        "ph": "X",
+        "ts": (start - _epoch) * 1e6,
+        "dur": (end - start) * 1e6,
+        "pid": os.getpid(),
+        "tid": threading.get_ident(),
+    }
+    if args:
+        event["args"] = {k: str(v) for k, v in args.items()}
+    with _events_lock:
+        _events.append(event)
+
+
+def _dump_profile(profiler: cProfile.Profile, name: str, folder: str) -> None:
+    try:
+        os.makedirs(folder, exist_ok=True)
+        safe_name = re.sub(r"[^\w.-]", "_", name)
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        path = os.path.join(
+            folder, f"{safe_name}-{stamp}-{os.getpid()}-{next(_profile_ids)}.prof"
+        )
+        profiler.dump_stats(path)
+        logger.info(f"Profile for {name} written to {path}")
+    except OSError as e:
+        logger.warning(f"Could not write profile for {name}: {e}")
+
+
+@contextmanager
+def span(name: str, **args):
+    folder = profile_folder()
+    profiler = None
+    if (
+        folder
+        and name.split(".", 1)[0] in PROFILE_CATEGORIES
+        and not getattr(_local, "profiling", False)
+    ):
+        profiler = cProfile.Profile()
+        _local.profiling = True
+        profiler.enable()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        end = time.perf_counter()
+        if profiler:
+            profiler.disable()
+            _local.profiling = False
+            _dump_profile(profiler, name, folder)
+        if trace_file():
+            _record(name, start, end, args)
+        logger.debug(f"{name} took {(end - start) * 1000:.1f} ms")
+
+
+def traced(name: str):
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def trace_events() -> List[Dict]:
+    with _events_lock:
+        return list(_events)
+
+
+def export_chrome_trace(path: Optional[str] = None) -> Optional[str]:
+    path = path or trace_file()
+    events = trace_events()
+    if not path or not events:
+        return None
+    try:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        logger.info(f"Trace with {len(events)} spans written to {path}")
+        return path
+    except OSError as e:
+        logger.warning(f"Could not write trace file {path}: {e}")
+        return None
+
+
+atexit.register(export_chrome_trace)
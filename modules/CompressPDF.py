@@ -0,0 +1,155 @@
+import os
+from PyQt6.QtWidgets import (
+    QApplication,
+    QComboBox,
+    QHBoxLayout,
+    QLabel,
+    QMessageBox,
+    QPushButton,
+    QSizePolicy,
+    QSpinBox,
+    QVBoxLayout,
+    QWidget,
+)
+from PyQt6.QtCore import Qt
+from component.header_bar import HeaderBar
+from component.output_naming import OutputNamer
+from component.pdf_compress import CompressionSettings
+from component.toolsForPDF import *
+from assets.config import *
+
+
+class CompressPDFWindow(BaseToolWindow):
+    def __init__(self, file_path: str, temp_folder: str):
+        super().__init__(temp_folder, COMPRESS_HEADER_TITLE)
+        self.file_path = file_path
+        self.total_pages = get_pdf_page_count(file_path)
+        self._init_ui()
+
+    def _init_ui(self) -> None:
+        main_layout = QVBoxLayout(self)
+        main_layout.setSpacing(15)
+        main_layout.setContentsMargins(0, 0, 0, 20)
+        self.header = HeaderBar(self.header_title)
+        self.header.back_clicked.connect(self.go_back)
+        main_layout.addWidget(self.header)
+        content_layout = QHBoxLayout()
+        content_layout.setContentsMargins(0, 0, 0, 0)
+        content_layout.setSpacing(0)
+        center_container = QWidget()
+        center_layout = QVBoxLayout(center_container)
+        center_layout.setContentsMargins(20, 0, 20, 0)
+        center_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        preview = create_pdf_thumb_label(
+            self.file_path,
+            width=FILE_CARD_WIDTH,
+            height=FILE_CARD_HEIGHT,
+            object_name="SplitPreviewThumb",
+        )
+        center_layout.addWidget(preview, alignment=Qt.AlignmentFlag.AlignCenter)
+        name_label = QLabel(get_pdf_filename(self.file_path))
+        name_label.setObjectName("FileNameLabel")
+        name_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        center_layout.addWidget(name_label)
+        content_layout.addWidget(center_container, stretch=1)
+        self.sidebar = QWidget()
+        self.sidebar.setObjectName("ToolSidebar")
+        self.sidebar.setFixedWidth(SIDEBAR_WIDTH)
+        self.sidebar.setSizePolicy(
+            QSizePolicy.Policy.Fixed, QSizePolicy.Policy.Expanding
+        )
+        sidebar_layout = QVBoxLayout(self.sidebar)
+        sidebar_layout.setSpacing(14)
+        sidebar_layout.setContentsMargins(22, 18, 22, 18)
+        sidebar_layout.addWidget(QLabel("Compress PDF", objectName="SidebarTitle"))
+        size_mb = os.path.getsize(self.file_path) / (1024 * 1024)
+        info_label = QLabel(
+            f"File Size: {size_mb:.2f} MB\nTotal Pages: {self.total_pages}"
+        )
+        info_label.setObjectName("SidebarStatText")
+        sidebar_layout.addWidget(info_label)
+        self.dpi_spin = QSpinBox()
+        self.dpi_spin.setRange(COMPRESS_MIN_DPI, COMPRESS_MAX_DPI)
+        self.dpi_spin.setValue(COMPRESS_DEFAULT_DPI)
+        self.dpi_spin.setSuffix(" DPI")
+        sidebar_layout.addLayout(
+            self._create_setting_row("Image resolution", self.dpi_spin)
+        )
+        self.quality_spin = QSpinBox()
+        self.quality_spin.setRange(10, 95)
+        self.quality_spin.setValue(COMPRESS_DEFAULT_QUALITY)
+        sidebar_layout.addLayout(
+            self._create_setting_row("Image quality", self.quality_spin)
+        )
+        self.format_combo = QComboBox()
+        self.format_combo.addItem("JPEG", "jpeg")
+        self.format_combo.addItem("JPEG 2000", "jpx")
+        sidebar_layout.addLayout(
+            self._create_setting_row("Image format", self.format_combo)
+        )
+        hint_label = QLabel(
+            "Tip: Images are downsampled to the chosen resolution and re-encoded "
+            "in parallel. Text and vector content are left untouched."
+        )
+        hint_label.setObjectName("SidebarHintText")
+        hint_label.setWordWrap(True)
+        sidebar_layout.addWidget(hint_label)
+        sidebar_layout.addStretch()
+        self.compress_btn = QPushButton("Compress PDF Now")
+        self.compress_btn.setObjectName("PrimaryActionButton")
+        self.compress_btn.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.compress_btn.setMinimumHeight(PRIMARY_BUTTON_HEIGHT)
+        self.compress_btn.clicked.connect(self.perform_compress)
+        sidebar_layout.addWidget(self.compress_btn)
+        content_layout.addWidget(self.sidebar, stretch=0)
+        main_layout.addLayout(content_layout)
+
+    def _create_setting_row(self, label_text: str, widget) -> QHBoxLayout:
+        row = QHBoxLayout()
+        row.addWidget(QLabel(label_text))
+        row.addWidget(widget, stretch=1)
+        return row
+
+    def settings(self) -> CompressionSettings:
+        return CompressionSettings(
+            self.dpi_spin.value(),
+            self.quality_spin.value(),
+            self.format_combo.currentData(),
+        )
+
+    def perform_compress(self) -> None:
+        with button_operation(self.compress_btn, "Compressing...", "Compress PDF Now"):
+            QApplication.processEvents()
+            try:
+                settings = self.settings()
+                with queued_gui_job(
+                    self,
+                    "compress",
+                    [self.file_path],
+                    settings._asdict(),
+                ) as job:
+                    namer = OutputNamer(get_downloads_folder())
+                    output_path = namer.claim(
+                        f"{COMPRESSED_OUTPUT_PREFIX}{get_pdf_filename(self.file_path)}"
+                    )
+                    try:
+                        report = compress_with_progress(
+                            self, self.file_path, output_path, settings
+                        )
+                    except Exception:
+                        namer.release(output_path)
+                        raise
+                    job.outputs = [output_path]
+                QMessageBox.information(
+                    self,
+                    "Success",
+                    f"Saved at Downloads folder\n{report.describe()}\n"
+                    f"{format_file_size(report.bytes_in)} -> "
+                    f"{format_file_size(report.bytes_out)}",
+                )
+                open_file(output_path)
+                self.go_back()
+            except InterruptedError:
+                return
+            except Exception as e:
+                QMessageBox.critical(self, "Error", f"Compression failed: {str(e)}")
@@ -6,33 +6,83 @@ from PyQt6.QtWidgets import (
     QLabel,
     QMessageBox,
     QLineEdit,
+    QCheckBox,
     QApplication,
+    QComboBox,
     QWidget,
     QSizePolicy,
 )
 from PyQt6.QtCore import Qt, QTimer
-from pypdf import PdfWriter, PdfReader
 from component.pdf_grid import PDFGrid
 from component.header_bar import HeaderBar
+from component.document_cache import release_documents
+from component.memory_stats import MemoryTracker
+from component.page_model import build_document_pages
+from component.page_analysis import analysis_available
+from component.page_ranges import (
+    format_intervals,
+    intervals_from_pages,
+    parse_page_intervals,
+    union_intervals,
+)
+from component.page_selection import PageSelection
+from component.render_pool import get_render_pool
 from component.toolsForPDF import *
 from assets.config import *
 
 
+class EditedDocument:
+    def __init__(self, path: str, parent=None):
+        self.path = path
+        self.name = os.path.basename(path)
+        self.total_pages = get_pdf_page_count(path)
+        self.pages = build_document_pages(path, self.total_pages)
+        self.selection = PageSelection(self.total_pages, parent)
+
+    def is_edited(self) -> bool:
+        return bool(self.selection.bits) or any(p.rotation % 360 for p in self.pages)
+
+
 class DeletePagesWindow(BaseToolWindow):
-    def __init__(self, file_path, temp_folder):
-        super().__init__(temp_folder, f"Editing: {os.path.basename(file_path)}")
-        self.file_path = file_path
-        self.total_pages = get_pdf_page_count(file_path)
-        self.pages_data = [
-            {"path": file_path, "page": i, "rotation": 0, "marked": False}
-            for i in range(self.total_pages)
-        ]
+    def __init__(self, file_paths, temp_folder):
+        if len(file_paths) == 1:
+            title = f"Editing: {os.path.basename(file_paths[0])}"
+        else:
+            title = f"Editing {len(file_paths)} documents"
+        super().__init__(temp_folder, title)
+        self.documents = [EditedDocument(path, self) for path in file_paths]
+        self._documents_by_source = {}
+        self.pages_data = []
+        for doc in self.documents:
+            self._documents_by_source.update(
+                (item.source, doc) for item in doc.pages[:1]
+            )
+            self.pages_data.extend(doc.pages)
+            doc.selection.changed.connect(
+                lambda flipped, d=doc: self._on_marks_changed(d, flipped)
+            )
+        self.current = self.documents[0]
         self._suppress_text_update = False
         self._invalid_input_timer = QTimer(self)
         self._invalid_input_timer.setSingleShot(True)
         self._invalid_input_timer.timeout.connect(self._prune_invalid_pages)
         self._init_ui()
 
+    @property
+    def file_path(self):
+        return self.current.path
+
+    @property
+    def total_pages(self):
+        return self.current.total_pages
+
+    @property
+    def selection(self):
+        return self.current.selection
+
+    def _document_for(self, item_data):
+        return self._documents_by_source[item_data.source]
+
     def _init_ui(self):
         layout = QVBoxLayout(self)
         layout.setSpacing(15)
@@ -49,10 +99,13 @@ class DeletePagesWindow(BaseToolWindow):
         center_layout.setSpacing(12)
         self.pdf_grid = PDFGrid(
             self.pages_data,
-            max_items=MAX_DELETE_FILES,
             on_delete_callback=self.toggle_mark,
             click_to_toggle=True,
             drag_enabled=False,
+            progressive_thumbnails=True,
+            virtualized=True,
+            group_title=self._group_title if len(self.documents) > 1 else None,
+            on_card_bound=self._on_card_bound,
         )
         center_layout.addWidget(self.pdf_grid)
         content_layout.addWidget(center_container, stretch=1)
@@ -66,6 +119,12 @@ class DeletePagesWindow(BaseToolWindow):
         sidebar_layout.setSpacing(14)
         sidebar_layout.setContentsMargins(22, 18, 22, 18)
         sidebar_layout.addWidget(QLabel("Delete Pages", objectName="SidebarTitle"))
+        self.document_combo = QComboBox()
+        for doc in self.documents:
+            self.document_combo.addItem(truncate_filename(doc.name, 32), doc.path)
+        self.document_combo.setVisible(len(self.documents) > 1)
+        self.document_combo.currentIndexChanged.connect(self._on_document_selected)
+        sidebar_layout.addWidget(self.document_combo)
         self.total_pages_label = QLabel(f"Total pages: {self.total_pages}")
         self.total_pages_label.setObjectName("SidebarStatText")
         sidebar_layout.addWidget(self.total_pages_label)
@@ -97,13 +156,56 @@ class DeletePagesWindow(BaseToolWindow):
         self.btn_even.setMinimumWidth(PARITY_BUTTON_WIDTH)
         self.btn_even.clicked.connect(lambda: self.toggle_parity("even"))
         parity_row.addWidget(self.btn_even)
+        self.btn_rotate = QPushButton("⟲")
+        self.btn_rotate.setObjectName("ParityToggleButton")
+        self.btn_rotate.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.btn_rotate.setToolTip("Rotate every page of this document 90° left")
+        self.btn_rotate.setMinimumHeight(PARITY_BUTTON_HEIGHT)
+        self.btn_rotate.clicked.connect(self.rotate_document)
+        parity_row.addWidget(self.btn_rotate)
         parity_row.addStretch()
         sidebar_layout.addLayout(parity_row)
+        self.analyze_btn = QPushButton("Find Blank && Duplicate Pages")
+        self.analyze_btn.setObjectName("ParityToggleButton")
+        self.analyze_btn.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.analyze_btn.setMinimumHeight(PARITY_BUTTON_HEIGHT)
+        if analysis_available():
+            self.analyze_btn.setToolTip(
+                "Mark pages that are blank or repeat an earlier page"
+            )
+        else:
+            self.analyze_btn.setEnabled(False)
+            self.analyze_btn.setToolTip("Install numpy to enable page analysis")
+        self.analyze_btn.clicked.connect(self.suggest_marks)
+        sidebar_layout.addWidget(self.analyze_btn)
+        self.analysis_label = QLabel()
+        self.analysis_label.setObjectName("SidebarHintText")
+        self.analysis_label.setWordWrap(True)
+        self.analysis_label.hide()
+        sidebar_layout.addWidget(self.analysis_label)
         hint_label = QLabel("Tip: Click cards to mark them, or type ranges like 1-4,7")
         hint_label.setObjectName("SidebarHintText")
         hint_label.setWordWrap(True)
         sidebar_layout.addWidget(hint_label)
         sidebar_layout.addStretch()
+        profile_row = QHBoxLayout()
+        profile_row.addWidget(QLabel("Output:"))
+        self.profile_combo = create_profile_combo()
+        profile_row.addWidget(self.profile_combo, stretch=1)
+        sidebar_layout.addLayout(profile_row)
+        self.incremental_chk = QCheckBox("Quick save (append changes to the original)")
+        self.incremental_chk.setToolTip(
+            "Faster for large files, but removed pages stay inside the saved file"
+        )
+        self.incremental_chk.setChecked(DELETE_INCREMENTAL_SAVE_DEFAULT)
+        sidebar_layout.addWidget(self.incremental_chk)
+        self.linearize_chk = create_linearize_checkbox()
+        sidebar_layout.addWidget(self.linearize_chk)
+        self.marked_summary_label = QLabel()
+        self.marked_summary_label.setObjectName("SidebarHintText")
+        self.marked_summary_label.setVisible(len(self.documents) > 1)
+        sidebar_layout.addWidget(self.marked_summary_label)
+        self._update_marked_summary()
         self.save_btn = QPushButton("Save Changes (Remove Marked Pages)")
         self.save_btn.setObjectName("PrimaryActionButton")
         self.save_btn.setMinimumHeight(PRIMARY_BUTTON_HEIGHT)
@@ -112,23 +214,89 @@ class DeletePagesWindow(BaseToolWindow):
         content_layout.addWidget(self.sidebar, stretch=0)
         layout.addLayout(content_layout)
 
+    def _group_title(self, item_data):
+        doc = self._document_for(item_data)
+        title = f"{doc.name} — {doc.total_pages} pages"
+        if doc.selection.bits:
+            title += f", {doc.selection.count()} marked"
+        return title
+
+    def _on_card_bound(self, card, item_data):
+        doc = self._document_for(item_data)
+        card.set_overlay("X", visible=doc.selection.is_marked(item_data.page))
+
+    def _on_document_selected(self, index):
+        if index < 0 or self.documents[index] is self.current:
+            return
+        self.current = self.documents[index]
+        self._invalid_input_timer.stop()
+        self.total_pages_label.setText(f"Total pages: {self.total_pages}")
+        self.analysis_label.hide()
+        self._update_input_from_marks()
+        self.pdf_grid.scroll_to_item(self.current.pages[0])
+
+    def _select_document(self, doc):
+        if doc is not self.current:
+            self.document_combo.setCurrentIndex(self.documents.index(doc))
+
+    def _update_marked_summary(self):
+        marked = [doc for doc in self.documents if doc.selection.bits]
+        pages = sum(doc.selection.count() for doc in marked)
+        self.marked_summary_label.setText(
+            f"Marked {pages} pages in {len(marked)} of {len(self.documents)} documents"
+        )
+
     def toggle_parity(self, parity):
-        indices = get_parity_indices(self.total_pages, parity)
-        all_marked = True
-        for i in indices:
-            if not self.pages_data[i]["marked"]:
-                all_marked = False
-                break
-        new_state = not all_marked
-        for i in indices:
-            item = self.pages_data[i]
-            if item["marked"] != new_state:
-                item["marked"] = new_state
-                card = self.pdf_grid.get_card_by_data(item)
-                if card:
-                    card.set_overlay("X", visible=new_state)
+        self.selection.toggle_parity(parity)
         self._update_input_from_marks()
 
+    def rotate_document(self):
+        for item_data in self.current.pages:
+            self.pdf_grid.update_rotation(item_data)
+
+    def suggest_marks(self):
+        with button_operation(
+            self.analyze_btn, "Analyzing...", "Find Blank && Duplicate Pages"
+        ):
+            QApplication.processEvents()
+            try:
+                analysis = analyze_with_progress(self, self.file_path)
+            except InterruptedError:
+                return
+            except Exception as e:
+                QMessageBox.critical(self, "Error", f"Analysis failed: {str(e)}")
+                return
+        marks = union_intervals(
+            self.selection.runs(), intervals_from_pages(analysis.suggested_pages)
+        )
+        self.selection.set_mask(self.selection.mask_from_ranges(marks))
+        self._update_input_from_marks()
+        lines = [analysis.describe()]
+        if analysis.blank_pages:
+            blank = format_intervals(intervals_from_pages(analysis.blank_pages))
+            lines.append(f"Blank: {blank}")
+        if analysis.duplicate_pages:
+            duplicates = format_intervals(
+                intervals_from_pages(sorted(analysis.duplicate_pages))
+            )
+            lines.append(f"Duplicates: {duplicates}")
+        self.analysis_label.setText("\n".join(lines))
+        self.analysis_label.setToolTip(
+            "\n".join(
+                f"Page {page + 1} repeats page {original + 1}"
+                for page, original in sorted(analysis.duplicate_pages.items())
+            )
+        )
+        self.analysis_label.show()
+
+    def _on_marks_changed(self, doc, flipped):
+        for idx in flipped:
+            card = self.pdf_grid.get_card_by_data(doc.pages[idx])
+            if card:
+                card.set_overlay("X", visible=doc.selection.is_marked(idx))
+        self.pdf_grid.update_group_headers()
+        self._update_marked_summary()
+
     def clean_and_update(self):
         if self._suppress_text_update:
             return
@@ -162,62 +330,135 @@ class DeletePagesWindow(BaseToolWindow):
         if not text:
             self.clear_all_marks()
             return
-        pages_to_mark = set(parse_page_ranges(text, self.total_pages))
-        for item in self.pages_data:
-            should_be_marked = item["page"] in pages_to_mark
-            if item["marked"] != should_be_marked:
-                item["marked"] = should_be_marked
-                card = self.pdf_grid.get_card_by_data(item)
-                if card:
-                    card.set_overlay("X", visible=should_be_marked)
+        intervals = parse_page_intervals(text, self.total_pages)
+        self.selection.set_mask(self.selection.mask_from_ranges(intervals))
 
     def clear_all_marks(self):
-        for item in self.pages_data:
-            if item["marked"]:
-                item["marked"] = False
-                card = self.pdf_grid.get_card_by_data(item)
-                if card:
-                    card.set_overlay("", visible=False)
+        self.selection.clear()
         self._update_input_from_marks()
 
     def toggle_mark(self, item_data):
-        item_data["marked"] = not item_data.get("marked", False)
-        card = self.pdf_grid.get_card_by_data(item_data)
-        if card:
-            card.set_overlay("X", visible=item_data["marked"])
+        self._select_document(self._document_for(item_data))
+        self.selection.toggle(item_data.page)
         self._update_input_from_marks()
 
     def _update_input_from_marks(self):
-        marked_pages = sorted(
-            [idx + 1 for idx, item in enumerate(self.pages_data) if item.get("marked")]
-        )
-        text = format_pages_as_ranges(marked_pages)
+        text = format_intervals(self.selection.runs())
         self._suppress_text_update = True
         self.pages_input.setText(text)
         self._suppress_text_update = False
 
     def perform_save(self):
-        items = self.pdf_grid.get_items()
-        pages_to_keep = [item for item in items if not item.get("marked", False)]
-        if not pages_to_keep:
-            QMessageBox.warning(self, "Error", "Cannot delete all pages!")
+        edited = [doc for doc in self.documents if doc.is_edited()]
+        if not edited and len(self.documents) == 1:
+            edited = self.documents
+        if not edited:
+            QMessageBox.warning(self, "Nothing to Save", "No pages are marked.")
+            return
+        emptied = [
+            doc.name for doc in edited if doc.selection.count() == doc.total_pages
+        ]
+        if emptied:
+            QMessageBox.warning(
+                self, "Error", f"Cannot delete all pages of {', '.join(emptied)}!"
+            )
             return
-        with button_operation(self.save_btn, "Saving...", "Save Changes"):
+        edits = [
+            PageEdit(
+                doc.path,
+                [
+                    item.page
+                    for item in doc.pages
+                    if not doc.selection.is_marked(item.page)
+                ],
+                {item.page: item.rotation for item in doc.pages},
+                f"{EDITED_OUTPUT_PREFIX}{doc.name}",
+            )
+            for doc in edited
+        ]
+        with button_operation(
+            self.save_btn, "Saving...", "Save Changes"
+        ), MemoryTracker("delete.save"):
             QApplication.processEvents()
             try:
-                writer = PdfWriter()
-                reader = PdfReader(self.file_path)
-                pages_indices = [
-                    item["page"] for item in items if not item.get("marked")
-                ]
-                rotations = {item["page"]: item["rotation"] for item in items}
-                write_pdf_with_rotation(writer, reader, pages_indices, rotations)
-                output_name = (
-                    f"{EDITED_OUTPUT_PREFIX}{os.path.basename(self.file_path)}"
-                )
-                if save_pdf_with_success(writer, output_name, self):
-                    self.go_back()
+                with queued_gui_job(
+                    self,
+                    "delete_pages",
+                    [doc.path for doc in edited],
+                    {
+                        "pages": {
+                            doc.name: format_intervals(doc.selection.runs())
+                            for doc in edited
+                        },
+                        "profile": self.profile_combo.currentData(),
+                        "linearize": self.linearize_chk.isChecked(),
+                    },
+                ) as job:
+                    self._release_documents()
+                    reports, errors = save_edits_with_progress(
+                        self,
+                        edits,
+                        incremental=self.incremental_chk.isChecked(),
+                        profile=self.profile_combo.currentData(),
+                        linearize=self.linearize_chk.isChecked(),
+                    )
+                    if not reports:
+                        raise RuntimeError("\n".join(errors.values()))
+                    job.outputs = [report.path for report in reports]
+                self._report_saved(edited, reports, errors)
+            except InterruptedError:
+                return
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Save failed: {str(e)}")
-            finally:
-                cleanup_temp_folder(self.temp_folder)
+
+    def _release_documents(self):
+        get_render_pool().recycle()
+        release_documents(self.temp_folder)
+
+    def go_back(self):
+        self._release_documents()
+        super().go_back()
+
+    def closeEvent(self, event):
+        self._release_documents()
+        super().closeEvent(event)
+
+    def _drop_documents(self, dropped):
+        self.pdf_grid.remove_items_batch(
+            [item for doc in dropped for item in doc.pages]
+        )
+        current = self.current
+        self.document_combo.blockSignals(True)
+        for doc in dropped:
+            self.document_combo.removeItem(self.documents.index(doc))
+            self.documents.remove(doc)
+            self._documents_by_source.pop(doc.pages[0].source, None)
+        if current not in self.documents:
+            current = self.documents[0]
+        self.document_combo.setCurrentIndex(self.documents.index(current))
+        self.document_combo.blockSignals(False)
+        self.document_combo.setVisible(len(self.documents) > 1)
+        self._on_document_selected(self.documents.index(current))
+        self._update_marked_summary()
+
+    def _report_saved(self, edited, reports, errors):
+        if len(reports) == 1:
+            message = f"File saved successfully!\n{reports[0].describe()}"
+        else:
+            message = (
+                f"Saved {len(reports)} files in Downloads folder.\n"
+                f"{summarize_reports(reports, sum(r.bytes_in for r in reports))}"
+            )
+        if errors:
+            failed = "\n".join(
+                f"{os.path.basename(path)}: {error}" for path, error in errors.items()
+            )
+            self._drop_documents([doc for doc in edited if doc.path not in errors])
+            QMessageBox.warning(
+                self, "Partially Saved", f"{message}\n\nFailed:\n{failed}"
+            )
+            return
+        QMessageBox.information(self, "Success", message)
+        if len(reports) == 1:
+            open_file(reports[0].path)
+        self.go_back()
@@ -1,4 +1,5 @@
 import os
+import logging
 from PyQt6.QtWidgets import (
     QPushButton,
     QVBoxLayout,
@@ -13,12 +14,17 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QIcon
-from pypdf import PdfWriter, PdfReader
 from component.pdf_grid import PDFGrid
 from component.header_bar import HeaderBar
+from component.memory_stats import MemoryTracker
+from component.output_naming import OutputNamer
+from component.pdf_operations import build_merge_writer
+from component.page_model import DocumentSource, PageRecord, build_file_record
 from component.toolsForPDF import *
 from assets.config import *
 
+logger = logging.getLogger(__name__)
+
 
 class PasswordInputDialog(QDialog):
     def __init__(self, filename, parent=None):
@@ -80,12 +86,9 @@ class PasswordInputDialog(QDialog):
 class MergePreviewWindow(BaseToolWindow):
     def __init__(self, file_list_paths, temp_folder, max_files=MAX_MERGE_FILES):
         super().__init__(temp_folder, MERGE_HEADER_TITLE)
-        initial_items = []
-        for f in file_list_paths:
-            encrypted = is_pdf_encrypted(f)
-            initial_items.append(
-                {"path": f, "rotation": 0, "page": 0, "encrypted": encrypted}
-            )
+        initial_items = [
+            build_file_record(f, is_pdf_encrypted(f)) for f in file_list_paths
+        ]
         self.max_files = max_files
         self._init_ui(initial_items)
 
@@ -142,6 +145,13 @@ class MergePreviewWindow(BaseToolWindow):
         hint_label.setWordWrap(True)
         sidebar_layout.addWidget(hint_label)
         sidebar_layout.addStretch()
+        profile_row = QHBoxLayout()
+        profile_row.addWidget(QLabel("Output:"))
+        self.profile_combo = create_profile_combo()
+        profile_row.addWidget(self.profile_combo, stretch=1)
+        sidebar_layout.addLayout(profile_row)
+        self.linearize_chk = create_linearize_checkbox()
+        sidebar_layout.addWidget(self.linearize_chk)
         self.merge_btn = QPushButton("Merge PDF Now")
         self.merge_btn.setObjectName("PrimaryActionButton")
         self.merge_btn.setCursor(Qt.CursorShape.PointingHandCursor)
@@ -187,16 +197,9 @@ class MergePreviewWindow(BaseToolWindow):
                     continue
                 dest_path = safe_copy_file(f, self.temp_folder)
                 encrypted = is_pdf_encrypted(dest_path)
-                items_to_add.append(
-                    {
-                        "path": dest_path,
-                        "rotation": 0,
-                        "page": 0,
-                        "encrypted": encrypted,
-                    }
-                )
+                items_to_add.append(build_file_record(dest_path, encrypted))
             except Exception as e:
-                print(f"Error preparing file {f}: {e}")
+                logger.error(f"Error preparing file {f}: {e}")
         progress.setValue(len(files_to_process))
         if skipped_files:
             msg = "The following files were skipped because they are empty or invalid:\n\n"
@@ -214,8 +217,8 @@ class MergePreviewWindow(BaseToolWindow):
             return
         files_to_merge = []
         for item in items:
-            final_path = item["path"]
-            if item.get("encrypted"):
+            final_path = item.path
+            if item.encrypted:
                 decryption_success = False
                 while True:
                     dialog = PasswordInputDialog(os.path.basename(final_path), self)
@@ -243,7 +246,7 @@ class MergePreviewWindow(BaseToolWindow):
                         break
                 if decryption_success:
                     files_to_merge.append(
-                        {"path": final_path, "rotation": item["rotation"]}
+                        PageRecord(DocumentSource(final_path), rotation=item.rotation)
                     )
                 else:
                     QMessageBox.warning(
@@ -253,25 +256,54 @@ class MergePreviewWindow(BaseToolWindow):
                     )
             else:
                 files_to_merge.append(
-                    {"path": final_path, "rotation": item["rotation"]}
+                    PageRecord(DocumentSource(final_path), rotation=item.rotation)
                 )
         if not files_to_merge:
             QMessageBox.warning(self, "Aborted", "No valid files left to merge.")
             return
-        with button_operation(self.merge_btn, "Merging...", "Merge PDF Now"):
+        with button_operation(
+            self.merge_btn, "Merging...", "Merge PDF Now"
+        ), MemoryTracker("merge"):
             QApplication.processEvents()
             try:
-                writer = PdfWriter()
-                for item in files_to_merge:
-                    reader = PdfReader(item["path"])
-                    pages_indices = list(range(len(reader.pages)))
-                    rotations = {i: item["rotation"] for i in pages_indices}
-                    write_pdf_with_rotation(writer, reader, pages_indices, rotations)
-                if save_pdf_with_success(
-                    writer, MERGED_OUTPUT_NAME, self, f"Saved at Downloads folder"
-                ):
-                    self.go_back()
+                with queued_gui_job(
+                    self,
+                    "merge",
+                    [item.path for item in files_to_merge],
+                    {
+                        "profile": self.profile_combo.currentData(),
+                        "linearize": self.linearize_chk.isChecked(),
+                    },
+                ) as job:
+                    writer, dedup = build_merge_writer(
+                        [(item.path, item.rotation) for item in files_to_merge]
+                    )
+                    bytes_in = sum(
+                        os.path.getsize(item.path) for item in files_to_merge
+                    )
+                    namer = OutputNamer(get_downloads_folder())
+                    output_path = namer.claim(MERGED_OUTPUT_NAME)
+                    try:
+                        report = write_pdf_output(
+                            writer,
+                            output_path,
+                            self.profile_combo.currentData(),
+                            bytes_in,
+                            linearize=self.linearize_chk.isChecked(),
+                        )
+                    except Exception:
+                        namer.release(output_path)
+                        raise
+                    job.outputs = [output_path]
+                success_msg = "Saved at Downloads folder"
+                if dedup.duplicate_files or dedup.bytes_saved:
+                    success_msg += f"\n{dedup.describe()}"
+                QMessageBox.information(
+                    self, "Success", f"{success_msg}\n{report.describe()}"
+                )
+                open_file(output_path)
+                self.go_back()
+            except InterruptedError:
+                pass
             except Exception as e:
-                QMessageBox.critical(self, "Error", str(e))
-            finally:
-                cleanup_temp_folder(self.temp_folder)
+                QMessageBox.critical(self, "Error", f"Save failed: {str(e)}")
@@ -1,7 +1,5 @@
-import io
 import os
-from typing import List, Tuple
-from pypdf import PdfWriter, PdfReader
+from typing import Dict, List, Tuple
 from PyQt6.QtWidgets import (
     QApplication,
     QButtonGroup,
@@ -27,6 +25,16 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtCore import Qt, QSize, QTimer
 from PyQt6.QtGui import QIcon
 from component.header_bar import HeaderBar
+from component.pdf_operations import (
+    PartialSplitError,
+    SplitLimitError,
+    fixed_ranges,
+    split_pdf_by_size,
+    split_pdf_ranges,
+)
+from component.page_ranges import expand_intervals, parse_page_intervals
+from component.memory_stats import MemoryTracker, memory_tracked
+from component.tracing import traced
 from component.toolsForPDF import *
 from assets.config import *
 
@@ -46,10 +54,10 @@ class RangeGroupWidget(QFrame):
         layout.setContentsMargins(12, 10, 12, 10)
         layout.setSpacing(5)
 
-        title_label = QLabel(f"Range {group_index}")
-        title_label.setObjectName("SplitPreviewTitle")
-        title_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        layout.addWidget(title_label)
+        self.title_label = QLabel(f"Range {group_index}")
+        self.title_label.setObjectName("SplitPreviewTitle")
+        self.title_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        layout.addWidget(self.title_label)
 
         thumbs_layout = QHBoxLayout()
         thumbs_layout.setSpacing(10)
@@ -81,6 +89,9 @@ class RangeGroupWidget(QFrame):
         pages_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         layout.addWidget(pages_label)
 
+    def set_group_index(self, group_index: int) -> None:
+        self.title_label.setText(f"Range {group_index}")
+
 
 class SplitPDFWindow(BaseToolWindow):
     def __init__(self, file_path: str, temp_folder: str):
@@ -91,6 +102,12 @@ class SplitPDFWindow(BaseToolWindow):
 
         self.ranges_to_split: List[Tuple[int, int]] = []
         self.custom_rows: List[Tuple[QComboBox, QComboBox]] = []
+        self._range_widgets: Dict[Tuple[int, int, int], RangeGroupWidget] = {}
+        self._rendered_ranges: List[Tuple[int, int]] = []
+        self._grid_columns = 0
+        self._preview_timer = QTimer(self)
+        self._preview_timer.setSingleShot(True)
+        self._preview_timer.timeout.connect(self._apply_preview)
         self._invalid_input_timer = QTimer(self)
         self._invalid_input_timer.setSingleShot(True)
         self._invalid_input_timer.timeout.connect(self._prune_invalid_pages_split)
@@ -186,6 +203,11 @@ class SplitPDFWindow(BaseToolWindow):
 
         sidebar_layout.addStretch()
 
+        self.profile_combo = create_profile_combo()
+        sidebar_layout.addWidget(self._create_input_group("Output", self.profile_combo))
+        self.linearize_chk = create_linearize_checkbox()
+        sidebar_layout.addWidget(self.linearize_chk)
+
         self.split_btn = QPushButton("Split PDF")
         self.split_btn.setObjectName("PrimaryActionButton")
         self.split_btn.setCursor(Qt.CursorShape.PointingHandCursor)
@@ -312,27 +334,63 @@ class SplitPDFWindow(BaseToolWindow):
 
     def resizeEvent(self, event) -> None:
         super().resizeEvent(event)
-        if hasattr(self, "ranges_to_split") and self.ranges_to_split:
-            self.reflow_grid()
+        self._apply_preview()
         self._adjust_scroll_height()
 
-    def reflow_grid(self):
+    def _range_widget_keys(self) -> List[Tuple[int, int, int]]:
+        seen: Dict[Tuple[int, int], int] = {}
+        keys = []
+        for start, end in self.ranges_to_split:
+            occurrence = seen.get((start, end), 0)
+            seen[(start, end)] = occurrence + 1
+            keys.append((start, end, occurrence))
+        return keys
+
+    @memory_tracked("thumbnails.preview")
+    def _sync_range_widgets(self) -> None:
+        stale = dict(self._range_widgets)
+        widgets: Dict[Tuple[int, int, int], RangeGroupWidget] = {}
+        for idx, key in enumerate(self._range_widget_keys()):
+            widget = stale.pop(key, None)
+            if widget is None:
+                start, end, _ = key
+                widget = RangeGroupWidget(self.file_path, start, end, idx + 1)
+            else:
+                widget.set_group_index(idx + 1)
+            widgets[key] = widget
+        for widget in stale.values():
+            self.grid_layout.removeWidget(widget)
+            widget.setParent(None)
+            widget.deleteLater()
+        self._range_widgets = widgets
+        self._rendered_ranges = list(self.ranges_to_split)
+
+    def _grid_column_count(self) -> int:
         if not self.scroll_area.viewport():
-            return
+            return 0
         available_width = self.scroll_area.viewport().width() - 40
         if available_width <= 0:
-            return
-
+            return 0
         card_width = RANGE_GROUP_SIZE + 15
-        cols = max(1, available_width // card_width)
+        return max(1, available_width // card_width)
+
+    @traced("grid.preview")
+    def _apply_preview(self) -> None:
+        cols = self._grid_column_count()
+        if not cols:
+            return
+        if self.ranges_to_split != self._rendered_ranges:
+            self._sync_range_widgets()
+        elif cols == self._grid_columns:
+            return
+        self.reflow_grid(cols)
 
+    def reflow_grid(self, cols: int) -> None:
+        self._grid_columns = cols
         while self.grid_layout.count():
-            item = self.grid_layout.takeAt(0)
-            if item.widget():
-                item.widget().setParent(None)
+            self.grid_layout.takeAt(0)
 
-        for idx, (start, end) in enumerate(self.ranges_to_split):
-            widget = RangeGroupWidget(self.file_path, start, end, idx + 1)
+        for idx, widget in enumerate(self._range_widgets.values()):
             row = idx // cols
             col = idx % cols
             self.grid_layout.addWidget(widget, row, col)
@@ -551,6 +609,12 @@ class SplitPDFWindow(BaseToolWindow):
         size_input_layout.addWidget(self.size_spin)
         size_input_layout.addWidget(self.unit_combo)
         layout.addWidget(self._create_input_group("Max size per file", size_input_row))
+        self.compress_images_chk = QCheckBox("Compress images before splitting")
+        self.compress_images_chk.setToolTip(
+            "Downsample and re-encode images first so image-heavy pages fit the "
+            "size limit"
+        )
+        layout.addWidget(self.compress_images_chk)
         layout.addStretch()
         return widget
 
@@ -560,11 +624,7 @@ class SplitPDFWindow(BaseToolWindow):
 
     def _collect_ranges_range_mode(self) -> List[Tuple[int, int]]:
         if self.btn_fixed_range.isChecked():
-            step = max(1, self.fixed_spin.value())
-            return [
-                (i, min(i + step - 1, self.total_pages - 1))
-                for i in range(0, self.total_pages, step)
-            ]
+            return fixed_ranges(self.total_pages, self.fixed_spin.value())
         ranges: List[Tuple[int, int]] = []
         for start_spin, end_spin in self.custom_rows:
             s, e = self._combo_value(start_spin), self._combo_value(end_spin)
@@ -575,8 +635,8 @@ class SplitPDFWindow(BaseToolWindow):
     def _collect_ranges_pages_mode(self) -> List[Tuple[int, int]]:
         if self.rb_extract_all.isChecked():
             return [(i, i) for i in range(self.total_pages)]
-        pages = parse_page_ranges(self.pages_input.text(), self.total_pages)
-        return [(p, p) for p in pages]
+        intervals = parse_page_intervals(self.pages_input.text(), self.total_pages)
+        return [(p, p) for p in expand_intervals(intervals)]
 
     def _collect_ranges_size_mode(self) -> List[Tuple[int, int]]:
         target_mb = self.size_spin.value()
@@ -600,7 +660,7 @@ class SplitPDFWindow(BaseToolWindow):
         else:
             self.ranges_to_split = []
 
-        self.reflow_grid()
+        self._preview_timer.start(PREVIEW_DEBOUNCE_MS)
 
         enabled = len(self.ranges_to_split) > 0
         self.split_btn.setEnabled(enabled)
@@ -617,43 +677,46 @@ class SplitPDFWindow(BaseToolWindow):
             self._split_by_size_greedy()
             return
 
-        with button_operation(self.split_btn, "Splitting...", "Split PDF"):
+        with button_operation(
+            self.split_btn, "Splitting...", "Split PDF"
+        ), MemoryTracker("split"):
             QApplication.processEvents()
             try:
-                reader = PdfReader(self.file_path)
                 base_name = get_pdf_basename_without_ext(self.file_path)
-                save_dir = get_downloads_folder()
-                created_files: List[str] = []
-
                 is_custom_mode = mode == 0 and self.btn_custom_range.isChecked()
-
-                if is_custom_mode and self.merge_ranges_chk.isChecked():
-                    writer = PdfWriter()
-                    for start, end in self.ranges_to_split:
-                        write_pdf_pages(reader, writer, list(range(start, end + 1)))
-                    out_path = get_unique_filename(
-                        save_dir, f"{base_name}_merged_split.pdf"
+                options = {
+                    "merge_ranges": is_custom_mode
+                    and self.merge_ranges_chk.isChecked(),
+                    "profile": self.profile_combo.currentData(),
+                    "linearize": self.linearize_chk.isChecked(),
+                }
+                with queued_gui_job(
+                    self,
+                    "split_ranges",
+                    [self.file_path],
+                    options,
+                ) as job:
+                    created_files = split_pdf_ranges(
+                        self.file_path,
+                        self.ranges_to_split,
+                        get_downloads_folder(),
+                        base_name,
+                        **options,
                     )
-                    with open(out_path, "wb") as f:
-                        writer.write(f)
-                    created_files.append(out_path)
-                else:
-                    for idx, (start, end) in enumerate(self.ranges_to_split):
-                        writer = PdfWriter()
-                        write_pdf_pages(reader, writer, list(range(start, end + 1)))
-                        out_path = get_unique_filename(
-                            save_dir, f"{base_name}_part_{idx + 1}.pdf"
-                        )
-                        with open(out_path, "wb") as f:
-                            writer.write(f)
-                        created_files.append(out_path)
+                    job.outputs = [report.path for report in created_files]
+                bytes_in = os.path.getsize(self.file_path)
 
                 QMessageBox.information(
                     self,
                     "Success",
-                    f"Created {len(created_files)} files in Downloads folder.",
+                    f"Created {len(created_files)} files in Downloads folder.\n"
+                    f"{summarize_reports(created_files, bytes_in)}",
                 )
                 self.go_back()
+            except InterruptedError:
+                return
+            except PartialSplitError as e:
+                QMessageBox.critical(self, "Error", f"{e}\n{SPLIT_RESUME_HINT}")
             except Exception as e:
                 QMessageBox.critical(self, "Error", str(e))
 
@@ -675,57 +738,56 @@ class SplitPDFWindow(BaseToolWindow):
             return
 
         limit_bytes = target_mb * 1024 * 1024 * SPLIT_SIZE_SAFETY_MARGIN
-        with button_operation(self.split_btn, "Calculating...", "Split PDF"):
+        with button_operation(
+            self.split_btn, "Calculating...", "Split PDF"
+        ), MemoryTracker("split.size"):
             QApplication.processEvents()
             try:
-                reader = PdfReader(self.file_path)
-                base_name = get_pdf_basename_without_ext(self.file_path)
-                save_dir = get_downloads_folder()
-                current_writer = PdfWriter()
-                current_page_count = 0
-                file_index = 1
-                created_files: List[str] = []
-                max_output_files = MAX_SPLIT_OUTPUT_FILES
-
-                for page in reader.pages:
-                    current_writer.add_page(page)
-                    current_page_count += 1
-                    temp_buffer = io.BytesIO()
-                    current_writer.write(temp_buffer)
-                    current_size = temp_buffer.tell()
-                    if current_size > limit_bytes and current_page_count > 1:
-                        if file_index >= max_output_files:
-                            QMessageBox.warning(
-                                self,
-                                "Too Many Files",
-                                f"Split would create more than {max_output_files} files. Increase the split size.",
-                            )
-                            return
-                        save_writer = PdfWriter()
-                        for p_idx in range(len(current_writer.pages) - 1):
-                            save_writer.add_page(current_writer.pages[p_idx])
-                        out_path = get_unique_filename(
-                            save_dir, f"{base_name}_part_{file_index}.pdf"
+                options = {
+                    "max_mb": target_mb,
+                    "profile": self.profile_combo.currentData(),
+                    "linearize": self.linearize_chk.isChecked(),
+                }
+                with queued_gui_job(
+                    self,
+                    "split_size",
+                    [self.file_path],
+                    options,
+                ) as job:
+                    source_path = self.file_path
+                    if self.compress_images_chk.isChecked():
+                        source_path = os.path.join(
+                            self.temp_folder,
+                            f"{COMPRESSED_OUTPUT_PREFIX}"
+                            f"{get_pdf_filename(self.file_path)}",
                         )
-                        with open(out_path, "wb") as f:
-                            save_writer.write(f)
-                        created_files.append(out_path)
-                        file_index += 1
-                        current_writer = PdfWriter()
-                        current_writer.add_page(page)
-                        current_page_count = 1
-                if len(current_writer.pages) > 0:
-                    out_path = get_unique_filename(
-                        save_dir, f"{base_name}_part_{file_index}.pdf"
+                        compress_with_progress(
+                            self, self.file_path, source_path, CompressionSettings()
+                        )
+                    created_files = split_pdf_by_size(
+                        source_path,
+                        limit_bytes,
+                        get_downloads_folder(),
+                        get_pdf_basename_without_ext(self.file_path),
+                        profile=options["profile"],
+                        linearize=options["linearize"],
                     )
-                    with open(out_path, "wb") as f:
-                        current_writer.write(f)
-                    created_files.append(out_path)
+                    job.outputs = [report.path for report in created_files]
+                bytes_in = os.path.getsize(self.file_path)
                 QMessageBox.information(
                     self,
                     "Success",
-                    f"Created {len(created_files)} files by size.",
+                    f"Created {len(created_files)} files by size.\n"
+                    f"{summarize_reports(created_files, bytes_in)}",
                 )
                 self.go_back()
+            except InterruptedError:
+                return
+            except SplitLimitError as e:
+                QMessageBox.warning(self, "Too Many Files", str(e))
+            except PartialSplitError as e:
+                QMessageBox.critical(
+                    self, "Error", f"Size Split Error: {str(e)}\n{SPLIT_RESUME_HINT}"
+                )
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Size Split Error: {str(e)}")